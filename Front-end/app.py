@@ -1,9 +1,17 @@
 import streamlit as st
-import FinanceDataReader as fdr
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime
+import os
+import sys
+import threading
+
+# 상위 폴더의 공용 데이터 모듈 사용 (data_loader, providers)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_loader import CacheStats, create_data_loader
+from indicators import compute_indicators
+from providers import get_provider
 
 # ==========================================
 # 1. 페이지 및 레이아웃 설정
@@ -57,17 +65,42 @@ END_DATE = "2025-12-31"
 # ==========================================
 # 3. 함수 정의
 # ==========================================
+@st.cache_resource
+def get_data_loader():
+    """구간 캐시 + 로컬 저장소 로더 (서버 프로세스당 1개)"""
+    return create_data_loader(get_provider(), ttl=3600)
+
+@st.cache_resource
+def warm_up_cache(tickers):
+    """서버 시작 시 1회, 전체 종목 데이터를 백그라운드에서 병렬로 미리 불러오기"""
+    thread = threading.Thread(
+        target=get_data_loader().load_many,
+        args=(list(tickers), START_DATE, END_DATE),
+        kwargs={"background": True},
+        name="cache-warm-up",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_cache_stats():
+    """load_data 캐시 적중률 집계"""
+    return CacheStats()
+
 @st.cache_data
 def load_data(ticker, start, end):
+    get_cache_stats().record_miss()  # 캐시 미스일 때만 실행됨
     try:
-        df = fdr.DataReader(ticker, start, end)
+        df = get_data_loader().load(ticker, start, end)
         if df.empty:
             return None
         
-        # 이동평균선 계산
-        df['MA5'] = df['Close'].rolling(window=5).mean()
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA60'] = df['Close'].rolling(window=60).mean()
+        # 이동평균선 계산 (공용 지표 엔진 - 새 일봉만 증분 계산)
+        # join 결과에는 attrs 가 없으므로 stale_as_of 등 로더가 남긴 정보를 다시 붙임
+        attrs = dict(df.attrs)
+        df = df.join(compute_indicators(df, ("MA5", "MA20", "MA60")))
+        df.attrs = attrs
         
         return df
     except Exception as e:
@@ -144,6 +177,9 @@ def create_dashboard(df, company_name):
 # ==========================================
 # 4. 사이드바 및 메인 로직
 # ==========================================
+# 전체 종목 캐시 워밍업 (서버 프로세스당 1회)
+warm_up_cache(tuple(COMPANIES.values()))
+
 st.sidebar.title("📈 주가 대시보드")
 st.sidebar.markdown("팀 프로젝트 종목 분석")
 st.sidebar.markdown("---")
@@ -160,9 +196,17 @@ st.markdown(f"<div class='main-header'>{selected_company} 대시보드</div>", u
 
 ticker = COMPANIES[selected_company]
 
-# 데이터 로드
+# 데이터 로드 (거래일 경계로 정규화한 구간을 캐시 키로 사용)
+start, end = (d.strftime("%Y-%m-%d") for d in get_data_loader().normalize(START_DATE, END_DATE))
+get_cache_stats().record_lookup()
 with st.spinner(f'{selected_company} ({ticker}) 데이터를 불러오는 중...'):
-    df = load_data(ticker, START_DATE, END_DATE)
+    df = load_data(ticker, start, end)
+
+# 제공처 응답 지연 시 마지막 정상 데이터 표시 (캐시에 남기지 않고 다음 실행 때 재시도)
+if df is not None and df.attrs.get("stale_as_of") is not None:
+    st.warning(f"⏱️ 데이터 제공처 응답 지연 - {df.attrs['stale_as_of']:%Y-%m-%d %H:%M} 기준 데이터를 표시합니다. (stale)")
+    load_data.clear(ticker, start, end)
+st.sidebar.caption(f"📦 데이터 캐시 {get_cache_stats()}")
 
 if df is not None:
     create_dashboard(df, selected_company)
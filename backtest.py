@@ -0,0 +1,241 @@
+"""
+벡터화 백테스트 엔진 (Vectorized Backtester)
+대시보드의 시그널(Signal_Buy/Signal_Sell, LargeUp/LargeDown)과 이동평균 크로스를
+보유 상태 → 일별 전략 수익률 → 자산 곡선/거래 목록/요약 지표로 변환합니다.
+
+- 모든 계산은 마지막 축(날짜) 기준 배열 연산이라 (종목 × 날짜), (파라미터 × 종목 × 날짜) 도 그대로 처리
+- 시그널은 당일 종가에 체결, 수익은 다음 거래일부터 반영 (미래 참조 없음)
+- 매수/매도 시 수수료 + 슬리피지, 매도 시 거래세 차감
+- 시그널 임계값(분위수)은 대시보드와 같이 조회 구간 전체로 계산 (in-sample)
+
+실행 예) python backtest.py 005930 --strategy ma_cross --fast 20 --slow 60
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from comparison import TRADING_DAYS, rolling_sum
+from data_store import STORE_DIR, OHLCVStore
+from signals import detect_large_moves, detect_supply_signals, pct_change
+
+FEE = 0.00015       # 증권사 수수료 (매수/매도 각각)
+SLIPPAGE = 0.0005   # 체결 슬리피지 (매수/매도 각각)
+TAX = 0.0018        # 증권거래세 (매도 시)
+RISK_FREE = 3.0     # 무위험 수익률 (%, 종합 분석 리포트의 샤프 지수와 동일)
+
+STRATEGIES = {
+    "ma_cross": "이동평균 크로스 (단기 MA > 장기 MA 동안 보유)",
+    "supply": "수급 시그널 (Signal_Buy 매수 → Signal_Sell 매도)",
+    "large_move": "급등/급락 (LargeUp 매수 → LargeDown 매도)",
+}
+
+
+# -----------------------------------------------------------------------------
+# 시그널 (Signals) - 입력/출력 모두 마지막 축이 날짜
+# -----------------------------------------------------------------------------
+def returns(close):
+    """
+    일간 수익률 (소수) - 직전 일봉 종가 대비 (signals.pct_change)
+    거래정지 등 빈 날 다음 일봉은 빈 날 동안의 가격 변화를 모두 반영, 첫 일봉/값이 없는 날은 0
+    """
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ret = pct_change(close)
+    return np.where(np.isfinite(ret), ret, 0.0)
+
+
+def moving_average(close, window):
+    """단순 이동평균 (윈도우 안에 빈 날이 있으면 NaN)"""
+    close = np.asarray(close, dtype=np.float64)
+    valid = ~np.isnan(close)
+    total = rolling_sum(np.where(valid, close, 0.0), window)
+    count = rolling_sum(valid.astype(np.float64), window)
+    return np.where(count == window, total / window, np.nan)
+
+
+def positions(entries, exits=None):
+    """
+    진입/청산 시그널 → 보유 상태 (True = 보유, 롱 온리)
+    exits 가 None 이면 entries 를 그대로 보유 상태로 사용 (예: MA 단기 > 장기)
+    같은 날 진입/청산이 겹치면 청산 우선
+    """
+    entries = np.asarray(entries, dtype=bool)
+    if exits is None:
+        return entries
+    exits = np.asarray(exits, dtype=bool)
+    event = np.where(exits, 0, np.where(entries, 1, -1))
+    # 마지막 이벤트를 앞으로 채움 (forward fill)
+    idx = np.where(event >= 0, np.arange(event.shape[-1]), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return np.take_along_axis(event, idx, axis=-1) == 1
+
+
+def strategy_state(close, volume, strategy="ma_cross", fast=20, slow=60, q=0.9):
+    """
+    전략 이름 → 보유 상태 배열 (종목 × 날짜)
+    ma_cross   : fast/slow 이동평균 (fast < slow, 아니면 ValueError)
+    supply     : plot_mind_dashboard 수급 시그널 (분위수 q)
+    large_move : plot_kakao_dashboard 급등/급락 (분위수 q)
+    """
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    volume = np.atleast_2d(np.asarray(volume, dtype=np.float64))
+    if strategy == "ma_cross":
+        if fast >= slow:
+            raise ValueError(f"단기 MA({fast})는 장기 MA({slow})보다 짧아야 합니다")
+        with np.errstate(invalid="ignore"):
+            return moving_average(close, fast) > moving_average(close, slow)
+
+    ret = pct_change(close)
+    if strategy == "supply":
+        buy, sell, _ = detect_supply_signals(ret, volume, q)
+    elif strategy == "large_move":
+        buy, sell = detect_large_moves(ret, volume, q)
+    else:
+        raise ValueError(f"알 수 없는 전략: {strategy} (지원: {', '.join(STRATEGIES)})")
+    return positions(buy, sell)
+
+
+# -----------------------------------------------------------------------------
+# 시뮬레이션 / 지표 (Simulation / Metrics)
+# -----------------------------------------------------------------------------
+def simulate(close, state, fee=FEE, slippage=SLIPPAGE, tax=TAX):
+    """
+    보유 상태 → 일별 전략 수익률 (비용 차감)
+    state[t] 는 t 일 종가 기준 보유 여부, 수익은 t+1 일부터 반영
+    """
+    state = np.asarray(state, dtype=bool)
+    held = np.zeros_like(state)
+    held[..., 1:] = state[..., :-1]
+    trade = state.astype(np.int8) - held.astype(np.int8)  # +1 매수, -1 매도 (당일 종가)
+    cost = np.where(trade > 0, fee + slippage, 0.0) + np.where(trade < 0, fee + slippage + tax, 0.0)
+    return (1 + held * returns(close)) * (1 - cost) - 1
+
+
+def _trade_returns(strategy_ret, state):
+    """
+    거래별 수익률 (비용 포함, 미청산 포지션은 마지막 종가로 평가)
+    반환: (거래 수익률 (행 × 최대 거래 수 + 1), 유효 마스크) - 앞쪽 축은 (행,) 으로 평탄화
+    """
+    T = state.shape[-1]
+    state = state.reshape(-1, T)
+    log_ret = np.log1p(strategy_ret.reshape(-1, T))
+    prev = np.zeros_like(state)
+    prev[:, 1:] = state[:, :-1]
+    entry = state & ~prev
+    in_trade = state | prev             # 매수일 ~ 매도일 (양 끝 비용 포함)
+    trade_id = np.cumsum(entry, axis=1)  # 1부터
+
+    width = int(trade_id[:, -1].max(initial=0)) + 1
+    group = np.arange(len(state))[:, None] * width + trade_id
+    sums = np.bincount(group[in_trade], weights=log_ret[in_trade], minlength=len(state) * width)
+    valid = (np.arange(width)[None, :] >= 1) & (np.arange(width)[None, :] <= trade_id[:, -1:])
+    return np.expm1(sums.reshape(len(state), width)), valid
+
+
+def summarize(strategy_ret, state):
+    """
+    요약 지표 (앞쪽 축별 배열, % 단위) - 종합 분석 리포트와 같은 항목 이름
+    Total Return / Ann Return / Ann Volatility / Sharpe Ratio / Max Drawdown /
+    Trades / Win Rate / P/L Ratio / Exposure
+    """
+    shape = strategy_ret.shape[:-1]
+    T = strategy_ret.shape[-1]
+    equity = np.cumprod(1 + strategy_ret, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+    total = equity[..., -1] - 1
+    ann_return = (np.power(np.maximum(equity[..., -1], 0), TRADING_DAYS / T) - 1) * 100
+    ann_vol = strategy_ret.std(axis=-1, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+    trades, valid = _trade_returns(strategy_ret, np.asarray(state, dtype=bool))
+    n_trades = valid.sum(axis=1)
+    wins = (trades > 0) & valid
+    losses = (trades < 0) & valid
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_gain = np.where(wins, trades, 0).sum(axis=1) / wins.sum(axis=1)
+        avg_loss = -np.where(losses, trades, 0).sum(axis=1) / losses.sum(axis=1)
+        stats = {
+            "Total Return": total * 100,
+            "Ann Return": ann_return,
+            "Ann Volatility": ann_vol,
+            "Sharpe Ratio": np.where(ann_vol > 0, (ann_return - RISK_FREE) / ann_vol, 0.0),
+            "Max Drawdown": drawdown.min(axis=-1) * 100,
+            "Trades": n_trades.reshape(shape),
+            "Win Rate": np.where(n_trades > 0, wins.sum(axis=1) / n_trades * 100, 0.0).reshape(shape),
+            "P/L Ratio": np.where(avg_loss > 0, avg_gain / avg_loss, 0.0).reshape(shape),
+            "Exposure": np.asarray(state, dtype=bool).mean(axis=-1) * 100,
+        }
+    return stats
+
+
+def trade_list(df, state, strategy_ret):
+    """거래 목록 DataFrame (진입/청산일, 가격, 보유일, 수익률 %)"""
+    state = np.asarray(state, dtype=bool)
+    prev = np.r_[False, state[:-1]]
+    entries = np.flatnonzero(state & ~prev)
+    exits = np.flatnonzero(~state & prev)
+    is_open = len(exits) < len(entries)
+    if is_open:
+        exits = np.r_[exits, len(state) - 1]
+
+    trades, valid = _trade_returns(strategy_ret, state)
+    close = df["Close"].to_numpy()
+    return pd.DataFrame({
+        "Entry_Date": df.index[entries],
+        "Exit_Date": df.index[exits],
+        "Entry_Price": close[entries],
+        "Exit_Price": close[exits],
+        "Bars": exits - entries,
+        "Return": trades[0][valid[0]] * 100,
+        "Open": np.arange(len(entries)) == len(entries) - 1 if is_open else False,
+    })
+
+
+def backtest(df, strategy="ma_cross", fee=FEE, slippage=SLIPPAGE, tax=TAX, **params):
+    """
+    종목 1개 백테스트
+    반환: dict(position, returns, equity, benchmark(보유 전략), trades, stats)
+    params 는 strategy_state 로 전달 (fast, slow, q)
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    state = strategy_state(close, df["Volume"].to_numpy(dtype=np.float64), strategy, **params)[0]
+    strategy_ret = simulate(close, state, fee, slippage, tax)
+    stats = {k: v.item() for k, v in summarize(strategy_ret, state).items()}
+    return {
+        "position": pd.Series(state, index=df.index, name="Position"),
+        "returns": pd.Series(strategy_ret, index=df.index, name="Strategy_Return"),
+        "equity": pd.Series(np.cumprod(1 + strategy_ret), index=df.index, name="Equity"),
+        "benchmark": pd.Series(close / close[0], index=df.index, name="Buy_Hold"),
+        "trades": trade_list(df, state, strategy_ret),
+        "stats": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 저장소 종목 백테스트")
+    parser.add_argument("ticker")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="ma_cross")
+    parser.add_argument("--fast", type=int, default=20)
+    parser.add_argument("--slow", type=int, default=60)
+    parser.add_argument("--q", type=float, default=0.9, help="시그널 분위수 (supply/large_move)")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+    if args.strategy == "ma_cross" and args.fast >= args.slow:
+        parser.error(f"--fast({args.fast})는 --slow({args.slow})보다 작아야 합니다")
+
+    df, _ = OHLCVStore(args.store).read(args.ticker)
+    df = df.loc[args.start:args.end]
+    if df.empty:
+        print(f"{args.ticker}: 저장소에 데이터 없음")
+        return
+    result = backtest(df, args.strategy, fast=args.fast, slow=args.slow, q=args.q)
+    for key, value in result["stats"].items():
+        print(f"{key:>15}: {value:,.2f}")
+    if not result["trades"].empty:
+        print(result["trades"].tail(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+시장 지수 대비 분석 (Benchmark Analytics)
+KOSPI/KOSDAQ 지수 대비 이동 베타, 알파, 상관계수, 상대강도(RS)를 계산합니다.
+
+- 지수와 종목을 하나의 패널(공통 날짜)에 넣고, (지수 × 종목 × 날짜) 브로드캐스팅으로
+  모든 지수·모든 종목의 이동 회귀를 누적합 기반 닫힌 식으로 한 번에 계산
+- 지수는 한 번만 받아 모든 종목이 공유하므로 종목/지수를 늘려도 종목별 추가 조회가 없음
+"""
+import numpy as np
+import pandas as pd
+
+from comparison import TRADING_DAYS, rolling_sum
+from signals import pct_change
+
+BENCHMARKS = {"KS11": "KOSPI", "KQ11": "KOSDAQ"}
+WINDOW = 60  # 이동 회귀 기간 (거래일)
+
+
+def rolling_regression(ret, bench, window=WINDOW):
+    """
+    종목 수익률 ret (종목 × 날짜) 를 지수 수익률 bench (지수 × 날짜) 에 이동 회귀
+    반환: (beta, alpha, corr) - 각각 (지수 × 종목 × 날짜), alpha 는 연율화 %
+    윈도우 안에 어느 한쪽이라도 값이 없는 날이 있으면 NaN
+    """
+    x = ret[None, :, :]
+    y = bench[:, None, :]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    full = rolling_sum(valid.astype(np.float64), window) == window
+    sx, sy = rolling_sum(x, window), rolling_sum(y, window)
+    sxx, syy = rolling_sum(x * x, window), rolling_sum(y * y, window)
+    sxy = rolling_sum(x * y, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / window
+        var_x = sxx - sx * sx / window
+        var_y = syy - sy * sy / window
+        beta = cov / var_y
+        alpha = (sx - beta * sy) / window * TRADING_DAYS * 100
+        corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    return tuple(np.where(full, v, np.nan) for v in (beta, alpha, corr))
+
+
+def relative_strength(close, bench):
+    """
+    상대강도 (지수 × 종목 × 날짜) - 종목 첫 거래일을 100 으로 맞춘 (종목 / 지수) 비율
+    100 보다 크면 같은 기간 지수보다 많이 오른 것
+    """
+    first = np.argmax(~np.isnan(close), axis=1)
+    rows = np.arange(len(close))
+    stock = close / close[rows, first][:, None]
+    market = bench[:, None, :] / bench[:, first][:, :, None]
+    return stock[None, :, :] / market * 100
+
+
+def analyze(panel, benchmarks=BENCHMARKS, window=WINDOW):
+    """
+    지수가 함께 들어 있는 패널에서 지수 외 모든 종목의 시장 대비 지표 계산
+    반환: dict(tickers, benchmarks, dates, beta, alpha, corr, rs)
+    """
+    bench_codes = [b for b in benchmarks if b in panel]
+    tickers = [t for t in panel.tickers if t not in benchmarks]
+    close = np.asarray(panel["Close"], dtype=np.float64)
+    stock_close = close[[panel.row(t) for t in tickers]]
+    bench_close = close[[panel.row(b) for b in bench_codes]]
+
+    beta, alpha, corr = rolling_regression(pct_change(stock_close), pct_change(bench_close), window)
+    return {
+        "tickers": tickers,
+        "benchmarks": bench_codes,
+        "dates": panel.dates,
+        "beta": beta,
+        "alpha": alpha,
+        "corr": corr,
+        "rs": relative_strength(stock_close, bench_close),
+    }
+
+
+def _last_valid(values):
+    """마지막 축 기준 마지막 유효값 (없으면 NaN)"""
+    has_value = ~np.isnan(values)
+    last = values.shape[-1] - 1 - np.argmax(has_value[..., ::-1], axis=-1)
+    picked = np.take_along_axis(values, last[..., None], axis=-1)[..., 0]
+    return np.where(has_value.any(axis=-1), picked, np.nan)
+
+
+def watchlist_table(result, labels=None, benchmarks=BENCHMARKS):
+    """종목별 최신 베타/알파/상관계수/RS 표 (지수별 열)"""
+    labels = labels or {}
+    table = pd.DataFrame(
+        {"Name": [labels.get(t, t) for t in result["tickers"]]},
+        index=pd.Index(result["tickers"], name="Ticker")
+    )
+    latest = {key: _last_valid(result[key]) for key in ("beta", "alpha", "corr", "rs")}
+    for b, code in enumerate(result["benchmarks"]):
+        market = benchmarks.get(code, code)
+        table[f"Beta ({market})"] = latest["beta"][b]
+        table[f"Alpha ({market})"] = latest["alpha"][b]
+        table[f"Corr ({market})"] = latest["corr"][b]
+        table[f"RS ({market})"] = latest["rs"][b]
+    return table
@@ -0,0 +1,228 @@
+"""
+핫패스 벤치마크 (Hot-Path Benchmarks)
+데이터 로딩, 지표 계산, 차트 빌더(figure 생성 / to_json 직렬화) 시간을 단계별로 측정합니다.
+
+- 입력은 시드를 고정한 합성 OHLCV (250 / 2,500 / 25,000 거래일) - 네트워크 없음
+- 데이터 단계는 app.get_stock_data 가 감싸는 StockDataLoader.load / OHLCVStore.get 을 임시 저장소로 측정
+- 빌더별로 indicators(메모 비운 상태의 지표 계산) / build(지표 메모가 찬 상태의 figure 생성) / to_json 을 따로 측정
+- 결과는 JSON 으로 저장하고 --compare 로 이전 커밋의 결과와 비교
+
+실행 예)
+    python benchmarks/bench_hotpaths.py --out before.json
+    python benchmarks/bench_hotpaths.py --out after.json --compare before.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from charts import (calculate_stats, plot_kakao_dashboard, plot_mind_dashboard,  # noqa: E402
+                    plot_saltlux_report, plot_standard_dashboard)
+from data_loader import StockDataLoader  # noqa: E402
+from data_store import OHLCVStore  # noqa: E402
+from indicators import clear_memo, compute_indicators  # noqa: E402
+from providers import DataProvider  # noqa: E402
+
+SIZES = [250, 2500, 25000]
+REPEAT = 5
+END_DATE = "2025-12-31"
+
+# 빌더 이름 → (함수, 빌더가 호출하는 지표 spec 목록 - calculate_stats 의 DD 포함, 추가 인자)
+SALTLUX_SPEC = ("MA5", "MA20", "MA60", "BB20", "RET", "VOL20", "DD", "CUMRET")
+BUILDERS = {
+    "plot_standard_dashboard": (plot_standard_dashboard, [("MA5", "MA20", "MA60"), ("DD",)],
+                                {"name": "Bench", "ticker": "BENCH", "template": "plotly_dark"}),
+    "plot_kakao_dashboard": (plot_kakao_dashboard, [("BB20", "RET"), ("DD",)], {"name": "Bench"}),
+    "plot_saltlux_report": (plot_saltlux_report, [SALTLUX_SPEC], {"name": "Bench"}),
+    "plot_saltlux_report[full]": (plot_saltlux_report, [SALTLUX_SPEC], {"name": "Bench", "max_points": None}),
+    "plot_mind_dashboard": (plot_mind_dashboard, [("MA20", "MA60", "MA120", "BB20", "RET"), ("DD",)],
+                            {"name": "Bench"}),
+}
+
+
+def synthetic_ohlcv(bars, seed=None):
+    """시드 고정 합성 일봉 (기하 랜덤워크) - 같은 bars 면 항상 같은 데이터"""
+    rng = np.random.default_rng(bars if seed is None else seed)
+    dates = pd.bdate_range(end=END_DATE, periods=bars, name="Date")
+    close = 10000 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, bars)))
+    open_ = close * np.exp(rng.normal(0, 0.01, bars))
+    spread = np.abs(rng.normal(0, 0.01, bars))
+    df = pd.DataFrame({
+        "Open": open_.round(),
+        "High": (np.maximum(open_, close) * (1 + spread)).round(),
+        "Low": (np.minimum(open_, close) * (1 - spread)).round(),
+        "Close": close.round(),
+        "Volume": rng.integers(100_000, 5_000_000, bars),
+    }, index=dates)
+    df.attrs["ticker"] = f"BENCH{bars}"
+    return df
+
+
+class SyntheticProvider(DataProvider):
+    """합성 일봉을 돌려주는 오프라인 제공처"""
+    name = "synthetic"
+    offline = True
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def fetch(self, ticker, start, end):
+        return self.frames[ticker].loc[start:end]
+
+
+def measure(fn, repeat=REPEAT, setup=None):
+    """
+    repeat 회 실행 시간 (ms) - setup 은 매 회 측정 전에 실행 (측정 제외)
+    첫 호출의 import/캐시 준비 비용이 섞이지 않도록 측정 전에 한 번 실행해 둡니다.
+    """
+    if setup is not None:
+        setup()
+    result = fn()
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return times, result
+
+
+def _record(results, case, phase, bars, times, **extra):
+    row = {
+        "case": case, "phase": phase, "bars": bars,
+        "median_ms": round(statistics.median(times), 3), "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3), "repeat": len(times),
+    }
+    row.update(extra)
+    results.append(row)
+    print(f"{case:<28} {phase:<18} {bars:>7,} bars  {row['median_ms']:>10.2f} ms (min {row['min_ms']:.2f})")
+
+
+def bench_data(results, df, repeat):
+    """저장소 수집/읽기, 로더 캐시 적중"""
+    bars = len(df)
+    ticker = df.attrs["ticker"]
+    start, end = df.index[0], df.index[-1]
+    provider = SyntheticProvider({ticker: df})
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root)
+
+        def clean():
+            for ext in (".parquet", ".json"):
+                path = os.path.join(root, ticker + ext)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        times, _ = measure(lambda: store.get(ticker, start, end, provider), repeat, setup=clean)
+        _record(results, "OHLCVStore.get", "fetch+write", bars, times)
+        times, _ = measure(lambda: store.get(ticker, start, end, provider), repeat)
+        _record(results, "OHLCVStore.get", "read", bars, times)
+
+    loader = StockDataLoader(None, provider)
+    loader.load(ticker, start, end)
+    times, _ = measure(lambda: loader.load(ticker, start, end), repeat)
+    _record(results, "StockDataLoader.load", "cache_hit", bars, times)
+
+
+def bench_builders(results, df, repeat, only=None):
+    """calculate_stats + 빌더별 지표 / figure 생성 / 직렬화"""
+    bars = len(df)
+    times, _ = measure(lambda: calculate_stats(df), repeat, setup=clear_memo)
+    _record(results, "calculate_stats", "cold", bars, times)
+
+    for name, (builder, specs, kwargs) in BUILDERS.items():
+        if only and not any(key in name for key in only):
+            continue
+        times, _ = measure(lambda: [compute_indicators(df, spec) for spec in specs], repeat, setup=clear_memo)
+        _record(results, name, "indicators", bars, times)
+
+        # build 는 지표 메모가 찬 상태에서 figure 생성만 측정
+        for spec in specs:
+            compute_indicators(df, spec)
+        times, fig = measure(lambda: builder(df, **kwargs), repeat)
+        _record(results, name, "build", bars, times, traces=len(fig.data))
+
+        times, payload = measure(fig.to_json, repeat)
+        _record(results, name, "to_json", bars, times, json_bytes=len(payload))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """이전 결과 대비 변화율 출력 - 잡음이 적은 min_ms 기준 (10% 이상 차이만 표시)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["case"], r["phase"], r["bars"]): r for r in json.load(f)["results"]}
+    print(f"\n비교 기준: {baseline_path}")
+    for row in results:
+        old = baseline.get((row["case"], row["phase"], row["bars"]))
+        if old is None or old["min_ms"] == 0:
+            continue
+        change = (row["min_ms"] / old["min_ms"] - 1) * 100
+        flag = "  ▲ 느려짐" if change > 10 else "  ▼ 빨라짐" if change < -10 else ""
+        print(f"{row['case']:<28} {row['phase']:<18} {row['bars']:>7,} bars  "
+              f"{old['min_ms']:>10.2f} → {row['min_ms']:>10.2f} ms ({change:+6.1f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터/지표/차트 빌더 핫패스 벤치마크 (합성 데이터, 네트워크 없음)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--only", nargs="*", default=None, help="빌더 이름 일부 (예: saltlux mind)")
+    parser.add_argument("--out", default="bench_hotpaths.json")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    # 원본 해상도 빌더는 점 예산을 넘는 것이 정상이므로 webgl 경고는 끔
+    logging.getLogger("webgl").setLevel(logging.ERROR)
+
+    results = []
+    for bars in args.sizes:
+        df = synthetic_ohlcv(bars)
+        bench_data(results, df, args.repeat)
+        bench_builders(results, df, args.repeat, args.only)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "plotly": plotly.__version__,
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n결과 저장: {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1027 @@
+"""
+차트 생성 함수들 (Chart Generators)
+Streamlit 에 의존하지 않으므로 대시보드 외에 배치 리포트/벤치마크에서도 그대로 사용합니다.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from downsample import (MAX_POINTS, RULE_LABELS, choose_rule, downsample_frame,
+                        downsample_series, resample_ohlcv)
+from indicators import compute_indicators
+from rollups import rollup, seasonality
+from themes import theme_colors
+from webgl import apply_render_mode
+
+def calculate_stats(df):
+    """통계 지표 계산 헬퍼 함수"""
+    start_price = df['Close'].iloc[0]
+    end_price = df['Close'].iloc[-1]
+    ret = ((end_price - start_price) / start_price) * 100
+    
+    ind = compute_indicators(df, ("DD",))
+    drawdown = ind['Drawdown']
+    mdd = ind.attrs['MDD']  # 지표 엔진이 고점/MDD 상태로 유지 (새 일봉마다 전체 재탐색 없음)
+    
+    return start_price, end_price, ret, drawdown, mdd
+
+def plot_standard_dashboard(df, name, ticker, template):
+    """
+    기본형 대시보드 (Standard Dashboard)
+    캔들스틱, 이동평균선, 거래량, Drawdown 분석 제공
+    """
+    # -------------------------------------------------------------------------
+    # 1. 지표 계산 (Indicator Calculation)
+    # -------------------------------------------------------------------------
+    # 이동평균선 (Moving Averages: 단기 5일 / 중기 20일 / 장기 60일)
+    ind = compute_indicators(df, ("MA5", "MA20", "MA60"))
+    
+    # 거래량 색상 (양봉: 빨강, 음봉: 파랑)
+    colors = ['#ff5252' if c >= o else '#448aff' for c, o in zip(df['Close'], df['Open'])]
+
+    # -------------------------------------------------------------------------
+    # 2. 통계 지표 계산 (Statistical Metrics)
+    # -------------------------------------------------------------------------
+    start_price, end_price, ret, drawdown, mdd = calculate_stats(df)
+
+    # -------------------------------------------------------------------------
+    # 3. 차트 레이아웃 구성 (Chart Layout)
+    # -------------------------------------------------------------------------
+    fig = make_subplots(
+        rows=4, cols=1, 
+        shared_xaxes=True, 
+        vertical_spacing=0.05,
+        subplot_titles=(
+            f'{name} ({ticker}) Price', 
+            'Volume', 
+            'Drawdown (Risk Analysis)', 
+            'Summary Statistics'
+        ),
+        row_heights=[0.5, 0.15, 0.15, 0.2],
+        specs=[[{"type": "xy"}], [{"type": "xy"}], [{"type": "xy"}], [{"type": "table"}]]
+    )
+
+    # -------------------------------------------------------------------------
+    # 4. Row 1: 가격 차트 (Price Chart)
+    # -------------------------------------------------------------------------
+    # 캔들스틱 차트
+    fig.add_trace(go.Candlestick(
+        x=df.index, 
+        open=df['Open'], 
+        high=df['High'], 
+        low=df['Low'], 
+        close=df['Close'],
+        name='Price', 
+        increasing_line_color='#ff5252',  # 양봉: 빨강
+        decreasing_line_color='#448aff'   # 음봉: 파랑
+    ), row=1, col=1)
+
+    # 이동평균선 추가
+    fig.add_trace(go.Scatter(
+        x=df.index, y=ind['MA5'], 
+        line=dict(color='#ffeb3b', width=1), 
+        name='MA 5'
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=df.index, y=ind['MA20'], 
+        line=dict(color='#00e676', width=1), 
+        name='MA 20'
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=df.index, y=ind['MA60'], 
+        line=dict(color='#e040fb', width=1), 
+        name='MA 60'
+    ), row=1, col=1)
+
+    # -------------------------------------------------------------------------
+    # 5. Row 2: 거래량 (Volume)
+    # -------------------------------------------------------------------------
+    fig.add_trace(go.Bar(
+        x=df.index, 
+        y=df['Volume'], 
+        marker_color=colors, 
+        name='Volume'
+    ), row=2, col=1)
+
+    # -------------------------------------------------------------------------
+    # 6. Row 3: Drawdown (낙폭 분석)
+    # -------------------------------------------------------------------------
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=drawdown, 
+        fill='tozeroy', 
+        line=dict(color='#ef5350'), 
+        name='Drawdown'
+    ), row=3, col=1)
+
+    # -------------------------------------------------------------------------
+    # 7. Row 4: 통계 테이블 (Summary Table)
+    # -------------------------------------------------------------------------
+    # 테마별 색상 설정
+    theme = theme_colors(template)
+    header_color = theme['header_color']
+    cell_color = theme['cell_color']
+    font_color = theme['font_color']
+    
+    fig.add_trace(go.Table(
+        header=dict(
+            values=["Metric", "Value"], 
+            fill_color=header_color, 
+            font=dict(color='white', size=12)
+        ),
+        cells=dict(
+            values=[
+                ['Start Price', 'End Price', 'Return', 'MDD (Max Loss)', 'Total Days'],
+                [f"{start_price:,.0f}", f"{end_price:,.0f}", f"{ret:+.2f}%", f"{mdd:.2f}%", len(df)]
+            ],
+            fill_color=cell_color, 
+            font=dict(color=font_color), 
+            align='left'
+        )
+    ), row=4, col=1)
+
+    # -------------------------------------------------------------------------
+    # 8. 레이아웃 최종 설정 (Final Layout Configuration)
+    # -------------------------------------------------------------------------
+    fig.update_layout(
+        title=dict(text=f'<b>{name} Dashboard</b>', x=0.5, font=dict(size=24)),
+        template=template,
+        height=1000, 
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    # 그리드 색상 설정
+    grid_color = theme['grid_color']
+    fig.update_xaxes(gridcolor=grid_color)
+    fig.update_yaxes(gridcolor=grid_color, tickformat=',')
+    
+    return apply_render_mode(fig)
+
+def plot_kakao_dashboard(df, name="Kakao", template="plotly_dark"):
+    """
+    카카오 스타일 대시보드 (Kakao Advanced Dashboard)
+    볼린저밴드, 거래량 급증 시그널, Drawdown 분석 제공
+    """
+    # -------------------------------------------------------------------------
+    # 1. 지표 계산 (Indicator Calculation)
+    # -------------------------------------------------------------------------
+    # 볼린저밴드 (20일, ±2 표준편차 - 중심선은 MA20), 일간 수익률
+    ind = compute_indicators(df, ("BB20", "RET"))
+    
+    # -------------------------------------------------------------------------
+    # 2. 시그널 감지 (Signal Detection)
+    # -------------------------------------------------------------------------
+    # 거래량 및 수익률 임계값 계산
+    large_up = large_down = pd.Series(False, index=df.index)
+    try:
+        valid = pd.DataFrame({"Return": ind["Return"], "Volume": df["Volume"]}).dropna()
+        if not valid.empty:
+            ret_up = np.percentile(valid["Return"], 90)      # 상위 10% 수익률
+            ret_down = np.percentile(valid["Return"], 10)    # 하위 10% 수익률
+            vol_th = np.percentile(valid["Volume"], 90)      # 상위 10% 거래량
+            
+            # 급등/급락 시그널 (거래량 급증 + 가격 변동)
+            large_up = (ind["Return"] >= ret_up) & (df["Volume"] >= vol_th)
+            large_down = (ind["Return"] <= ret_down) & (df["Volume"] >= vol_th)
+    except:
+        pass
+
+    # -------------------------------------------------------------------------
+    # 3. 통계 지표 계산 (Statistical Metrics)
+    # -------------------------------------------------------------------------
+    start_price, end_price, ret, drawdown, mdd = calculate_stats(df)
+
+    # -------------------------------------------------------------------------
+    # 4. 차트 레이아웃 구성 (Chart Layout)
+    # -------------------------------------------------------------------------
+    fig = make_subplots(
+        rows=4, cols=1, 
+        shared_xaxes=True, 
+        vertical_spacing=0.05, 
+        row_heights=[0.5, 0.15, 0.15, 0.2],
+        subplot_titles=(
+            f'{name} Price & BB', 
+            'Volume', 
+            'Drawdown (Risk Analysis)', 
+            'Summary Statistics'
+        ),
+        specs=[[{"type": "xy"}], [{"type": "xy"}], [{"type": "xy"}], [{"type": "table"}]]
+    )
+
+    # -------------------------------------------------------------------------
+    # 5. Row 1: 가격 차트 + 볼린저밴드 (Price Chart + Bollinger Bands)
+    # -------------------------------------------------------------------------
+    # 캔들스틱 차트
+    fig.add_trace(go.Candlestick(
+        x=df.index, 
+        open=df["Open"], 
+        high=df["High"], 
+        low=df["Low"], 
+        close=df["Close"],
+        name="Price", 
+        increasing_line_color="#00B0F6",  # 양봉: 하늘색
+        decreasing_line_color="#F63538"   # 음봉: 빨강
+    ), row=1, col=1)
+    
+    # 볼린저밴드 상단
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind["BB20_Upper"], 
+        line=dict(color="rgba(135, 206, 250, 0.5)", width=1), 
+        name="BB Upper"
+    ), row=1, col=1)
+    
+    # 볼린저밴드 하단 (채우기 효과)
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind["BB20_Lower"], 
+        line=dict(color="rgba(135, 206, 250, 0.5)", width=1), 
+        fill='tonexty', 
+        fillcolor="rgba(135, 206, 250, 0.1)", 
+        name="BB Lower"
+    ), row=1, col=1)
+
+    # -------------------------------------------------------------------------
+    # 6. 시그널 마커 (Signal Markers)
+    # -------------------------------------------------------------------------
+    # 급등 시그널 (Large Up)
+    if large_up.any():
+        fig.add_trace(go.Scatter(
+            x=df.index[large_up], 
+            y=df["Close"][large_up], 
+            mode="markers", 
+            marker=dict(symbol="triangle-up", size=10, color="#00FF7F"), 
+            name="Large Up"
+        ), row=1, col=1)
+    
+    # 급락 시그널 (Large Down)
+    if large_down.any():
+        fig.add_trace(go.Scatter(
+            x=df.index[large_down], 
+            y=df["Close"][large_down], 
+            mode="markers", 
+            marker=dict(symbol="triangle-down", size=10, color="#FF4500"), 
+            name="Large Down"
+        ), row=1, col=1)
+
+    # -------------------------------------------------------------------------
+    # 7. Row 2: 거래량 (Volume)
+    # -------------------------------------------------------------------------
+    # 거래량 색상 (양봉: 하늘색, 음봉: 빨강)
+    colors = np.where(df["Close"] >= df["Open"], '#00B0F6', '#F63538')
+    fig.add_trace(go.Bar(
+        x=df.index, 
+        y=df["Volume"], 
+        marker_color=colors, 
+        name="Volume"
+    ), row=2, col=1)
+
+    # -------------------------------------------------------------------------
+    # 8. Row 3: Drawdown (낙폭 분석)
+    # -------------------------------------------------------------------------
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=drawdown, 
+        fill='tozeroy', 
+        line=dict(color='#ef5350'), 
+        name='Drawdown'
+    ), row=3, col=1)
+
+    # -------------------------------------------------------------------------
+    # 9. Row 4: 통계 테이블 (Summary Table)
+    # -------------------------------------------------------------------------
+    # 테마별 색상 설정
+    theme = theme_colors(template)
+    header_color = theme['header_color']
+    cell_color = theme['cell_color']
+    font_color = theme['font_color']
+
+    fig.add_trace(go.Table(
+        header=dict(
+            values=["Metric", "Value"], 
+            fill_color=header_color, 
+            font=dict(color='white')
+        ),
+        cells=dict(
+            values=[
+                ['Start Price', 'End Price', 'Return', 'MDD', 'Total Days'],
+                [f"{start_price:,.0f}", f"{end_price:,.0f}", f"{ret:+.2f}%", f"{mdd:.2f}%", len(df)]
+            ],
+            fill_color=cell_color, 
+            font=dict(color=font_color), 
+            align='left'
+        )
+    ), row=4, col=1)
+
+    # -------------------------------------------------------------------------
+    # 10. 레이아웃 최종 설정 (Final Layout Configuration)
+    # -------------------------------------------------------------------------
+    fig.update_layout(
+        title=f"<b>{name} Advanced Dashboard</b>", 
+        template=template, 
+        height=1000, 
+        xaxis_rangeslider_visible=False
+    )
+    
+    # 그리드 색상 설정
+    grid_color = theme['grid_color']
+    fig.update_xaxes(gridcolor=grid_color)
+    fig.update_yaxes(gridcolor=grid_color)
+    
+    return apply_render_mode(fig)
+
+
+def plot_saltlux_report(df, name="Stock", template="plotly_white", max_points=MAX_POINTS):
+    """
+    종합 분석 리포트 대시보드 (Comprehensive Analysis Report)
+    모든 종목에 적용 가능한 상세 분석 리포트
+    - KPI 지표, 주가 흐름, 월별 분석, 거래 패턴, 리스크 분석, 통계 요약
+    - 시계열 트레이스는 max_points 개 이하로 다운샘플링 (None 이면 원본 해상도)
+    """
+    # 전처리 및 지표 계산
+    start_price = df['Close'].iloc[0]
+    end_price = df['Close'].iloc[-1]
+    year_return = ((end_price - start_price) / start_price) * 100
+    high_price = df['High'].max()
+    low_price = df['Low'].min()
+
+    # 지표 계산 (이동평균, 볼린저밴드 - MA20 재사용, 수익률, 20일 변동성, 낙폭, 누적 수익률)
+    ind = compute_indicators(df, ("MA5", "MA20", "MA60", "BB20", "RET", "VOL20", "DD", "CUMRET"))
+
+    # 파생 변수 생성
+    daily_return = ind['Return'] * 100
+    trade_value = df['Volume'] * df['Close']
+
+    # 변동성 및 리스크 지표
+    daily_volatility = daily_return.std()
+    annual_volatility = daily_volatility * (252 ** 0.5)
+
+    # MDD 계산
+    mdd = ind['Drawdown'].min()
+
+    # 월별 데이터 집계 (연-월 단위 - 여러 해 구간에서도 같은 달끼리 섞이지 않음)
+    monthly_data = rollup(df, "month")
+
+    # 거래 패턴 분석
+    is_up = (df['Close'] - df['Open']) > 0
+
+    # 통계 요약
+    total_days = len(df)
+    up_days = is_up.sum()
+    down_days = total_days - up_days
+    win_rate = (up_days / total_days) * 100 if total_days > 0 else 0
+    avg_gain = daily_return[daily_return > 0].mean()
+    avg_loss = daily_return[daily_return < 0].abs().mean()
+    profit_loss_ratio = avg_gain / avg_loss if avg_loss > 0 else 0
+    sharpe_ratio = (year_return - 3) / annual_volatility if annual_volatility > 0 else 0
+
+    # 차트용 다운샘플링 (통계는 위에서 원본 일봉으로 계산)
+    # 캔들/거래대금은 주봉·월봉으로 집계, 선은 LTTB 로 점 선택
+    rule = choose_rule(len(df), max_points)
+    bars = resample_ohlcv(df, rule)
+    if rule is None:
+        bar_trade_value = trade_value
+    else:
+        bar_trade_value = trade_value.resample(rule).sum().reindex(bars.index)
+    bar_is_up = (bars['Close'] - bars['Open']) > 0
+    bb = downsample_frame(ind[['MA20', 'BB20_Upper', 'BB20_Lower']], 'MA20', max_points)
+
+    # 레이아웃 구성
+    fig = make_subplots(
+        rows=7, cols=6,
+        specs=[
+            [{'type': 'indicator'}, {'type': 'indicator'}, {'type': 'indicator'},
+             {'type': 'indicator'}, {'type': 'indicator'}, {'type': 'indicator'}],
+            [{'colspan': 6, 'type': 'xy'}, None, None, None, None, None],
+            [None, None, None, None, None, None],
+            [{'colspan': 3, 'type': 'xy'}, None, None,
+             {'colspan': 3, 'type': 'xy'}, None, None],
+            [{'colspan': 2, 'type': 'xy'}, None, {'colspan': 2, 'type': 'xy'},
+             None, {'colspan': 2, 'type': 'xy'}, None],
+            [{'colspan': 3, 'type': 'xy'}, None, None,
+             {'colspan': 3, 'type': 'xy'}, None, None],
+            [{'colspan': 6, 'type': 'table'}, None, None, None, None, None]
+        ],
+        vertical_spacing=0.02,
+        horizontal_spacing=0.03,
+        subplot_titles=(
+            None, None, None, None, None, None,
+            "Price Flow & Trend (주가 흐름)",
+            "Monthly Returns (월별 수익률)", "Monthly Trade Value (월별 거래대금)",
+            "Trade Patterns (거래 패턴)", "Rolling Volatility (20일 변동성)",
+            "Return Distribution (수익률 분포)",
+            "Drawdown Risk (최대 낙폭)", "Cumulative Return (누적 수익률)",
+            "Statistical Summary (통계 요약)"
+        ),
+        row_heights=[0.05, 0.21, 0.03, 0.175, 0.175, 0.175, 0.185]
+    )
+
+    # Row 1: KPI Indicators
+    indicators = [
+        ("연초가", start_price, "number", ""),
+        ("연말가", end_price, "number", ""),
+        ("수익률", year_return, "number+delta", "%"),
+        ("최고가", high_price, "number", ""),
+        ("최저가", low_price, "number", ""),
+        ("MDD", mdd, "number", "%"),
+    ]
+
+    for i, (title, val, mode, suffix) in enumerate(indicators):
+        fig.add_trace(go.Indicator(
+            mode=mode, value=val,
+            title={'text': title, 'font': {'size': 14, 'color': 'gray'}},
+            number={'suffix': suffix, 'font': {'size': 24}},
+            delta={'reference': 0} if "delta" in mode else None
+        ), row=1, col=i+1)
+
+    # Row 2: Main Chart
+    fig.add_trace(go.Candlestick(
+        x=bars.index, open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'],
+        name='Price', increasing_line_color='#26A69A', decreasing_line_color='#EF5350'
+    ), row=2, col=1)
+
+    close_line = downsample_series(df['Close'], max_points)
+    fig.add_trace(go.Scatter(
+        x=close_line.index, y=close_line,
+        mode='lines', line=dict(color='#26A69A', width=2),
+        name='Close Line', visible=False
+    ), row=2, col=1)
+
+    fig.add_trace(go.Scatter(
+        x=bb.index, y=bb['BB20_Upper'],
+        line=dict(color='gray', width=1, dash='dot'),
+        name='BB Upper', showlegend=True
+    ), row=2, col=1)
+    fig.add_trace(go.Scatter(
+        x=bb.index, y=bb['BB20_Lower'],
+        line=dict(color='gray', width=1, dash='dot'),
+        name='BB Lower', fill='tonexty', fillcolor='rgba(200,200,200,0.1)', showlegend=True
+    ), row=2, col=1)
+
+    ma60 = downsample_series(ind['MA60'], max_points)
+    fig.add_trace(go.Scatter(
+        x=bb.index, y=bb['MA20'],
+        line=dict(color='#2962FF', width=1.5), name='MA20'
+    ), row=2, col=1)
+    fig.add_trace(go.Scatter(
+        x=ma60.index, y=ma60,
+        line=dict(color='#FF6D00', width=1.5), name='MA60'
+    ), row=2, col=1)
+
+    # Row 4: Monthly Analysis
+    months = monthly_data.index.strftime('%Y-%m')
+    mon_ret = monthly_data['Return']
+    mon_trade = monthly_data['Trade_Value']
+
+    colors_ret = np.where(mon_ret > 0, '#26A69A', '#EF5350')
+    fig.add_trace(go.Bar(
+        x=months, y=mon_ret, marker_color=colors_ret,
+        name='Monthly Ret', showlegend=False
+    ), row=4, col=1)
+
+    fig.add_trace(go.Bar(
+        x=months, y=mon_trade, marker_color='#5C6BC0',
+        name='Avg Trade', showlegend=False
+    ), row=4, col=4)
+
+    # Row 5: Pattern & Volatility
+    colors_vol = np.where(bar_is_up, '#26A69A', '#EF5350')
+    fig.add_trace(go.Bar(
+        x=bars.index, y=bar_trade_value, marker_color=colors_vol,
+        name='Trade Val', showlegend=False
+    ), row=5, col=1)
+
+    vol20 = downsample_series(ind['VOL20'], max_points)
+    fig.add_trace(go.Scatter(
+        x=vol20.index, y=vol20,
+        line=dict(color='#AB47BC', width=1.5),
+        name='Vol(20d)', showlegend=False
+    ), row=5, col=3)
+
+    # 수익률 분포 - 긴 구간은 서버에서 미리 40개 구간으로 집계해 전송
+    if max_points and len(daily_return) > max_points:
+        counts, edges = np.histogram(daily_return.dropna(), bins=40)
+        dist = dict(x=(edges[:-1] + edges[1:]) / 2, y=counts, histfunc='sum',
+                    xbins=dict(start=edges[0], end=edges[-1], size=edges[1] - edges[0]))
+    else:
+        dist = dict(x=daily_return, nbinsx=40)
+    fig.add_trace(go.Histogram(
+        **dist, marker_color='#7E57C2',
+        name='Dist', showlegend=False
+    ), row=5, col=5)
+
+    # Row 6: Risk & Cumulative
+    drawdown = downsample_series(ind['Drawdown'], max_points)
+    fig.add_trace(go.Scatter(
+        x=drawdown.index, y=drawdown, fill='tozeroy',
+        line=dict(color='#C62828', width=1),
+        name='DD', showlegend=False
+    ), row=6, col=1)
+
+    cum_return = downsample_series(ind['Cum_Return'], max_points)
+    fig.add_trace(go.Scatter(
+        x=cum_return.index, y=cum_return, fill='tozeroy',
+        line=dict(color='#1565C0', width=2),
+        name='Cum Ret', showlegend=False
+    ), row=6, col=4)
+
+    # Row 7: Table
+    stats_data = [
+        ['Total Days', 'Up Days (Win Rate)', 'Down Days', 'Avg Gain', 'Avg Loss',
+         'P/L Ratio', 'Ann Volatility', 'Sharpe Ratio', 'Ann Return', 'Max Drawdown'],
+        [f"{total_days}", f"{up_days} ({win_rate:.1f}%)", f"{down_days}",
+         f"+{avg_gain:.2f}%", f"-{avg_loss:.2f}%", f"{profit_loss_ratio:.2f}",
+         f"{annual_volatility:.1f}%", f"{sharpe_ratio:.2f}",
+         f"{year_return:.1f}%", f"{mdd:.1f}%"]
+    ]
+
+    fig.add_trace(go.Table(
+        header=dict(values=["Metric", "Value"], fill_color='#455A64',
+                    font=dict(color='white', size=12), align='left'),
+        cells=dict(values=stats_data, fill_color='#F5F5F5', align='left', height=30)
+    ), row=7, col=1)
+
+    # 최종 레이아웃
+    fig.update_layout(
+        title_text=f"<b>{name} 2025 Annual Analysis Report</b>"
+                   + (f" <sup>({RULE_LABELS[rule]} 표시)</sup>" if rule else ""),
+        title_x=0.5,
+        height=2200,
+        template=template,
+        margin=dict(l=40, r=40, t=120, b=40),
+        hovermode="x unified",
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=0.90,
+            xanchor="right",
+            x=0.98,
+            bgcolor="rgba(255, 255, 255, 0.5)"
+        ),
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="left",
+                active=0,
+                x=0.01, y=0.92,
+                buttons=list([
+                    dict(label="Candle",
+                         method="update",
+                         args=[{"visible": [True]*6 + [True, False] + [True]*30}]),
+                    dict(label="Line",
+                         method="update",
+                         args=[{"visible": [True]*6 + [False, True] + [True]*30}])
+                ]),
+            ),
+            dict(
+                type="buttons",
+                direction="left",
+                showactive=True,
+                x=0.12, y=0.92,
+                buttons=list([
+                    dict(label="BB On",
+                         method="restyle",
+                         args=["visible", True, [8, 9]]),
+                    dict(label="BB Off",
+                         method="restyle",
+                         args=["visible", False, [8, 9]])
+                ]),
+            )
+        ]
+    )
+
+    fig.update_xaxes(rangeslider_visible=False)
+    fig.update_xaxes(
+        rangeslider=dict(visible=True, thickness=0.03),
+        row=2, col=1
+    )
+
+    fig.update_yaxes(
+        showgrid=True, gridwidth=1, gridcolor='#ECEFF1',
+        showspikes=True, spikemode='across', spikesnap='cursor', showline=True, spikedash='dash'
+    )
+    fig.update_xaxes(
+        showgrid=True, gridwidth=1, gridcolor='#ECEFF1',
+        showspikes=True, spikemode='across', spikesnap='cursor', showline=True, spikedash='dash'
+    )
+
+    return apply_render_mode(fig)
+
+
+def plot_mind_dashboard(df, name="Mind AI", template="plotly_dark"):
+    """
+    마음AI (구 마인즈랩) 트레이딩 차트 (Mind AI Trading Dashboard)
+    수급 포착 중심 - 거래량 급증 + 급등/급락 시그널 감지
+    """
+    # -------------------------------------------------------------------------
+    # 1. 지표 계산 (Indicator Calculation)
+    # -------------------------------------------------------------------------
+    # 이동평균선 (생명선 20일 / 수급선 60일 / 경기선 120일)
+    # 볼린저밴드 (20일, ±2 표준편차 - 중심선은 MA20), 일간 수익률
+    ind = compute_indicators(df, ("MA20", "MA60", "MA120", "BB20", "RET"))
+    
+    # 등락률 (Price Change Percentage)
+    pct_chg = ind['Return'] * 100  # 일간 등락률 (%)
+    
+    # -------------------------------------------------------------------------
+    # 2. 수급 포착 로직 (Supply-Demand Signal Detection)
+    # -------------------------------------------------------------------------
+    # 임계값 설정 (상위/하위 10% 기준)
+    vol_cond = df['Volume'].quantile(0.9)      # 거래량 상위 10%
+    up_cond = pct_chg.quantile(0.9)      # 상승폭 상위 10%
+    down_cond = pct_chg.quantile(0.1)    # 하락폭 하위 10%
+    
+    # 시그널 생성 (거래량 터지면서 급등/급락한 날)
+    signal_buy = (df['Volume'] >= vol_cond) & (pct_chg >= up_cond)    # 매수 시그널
+    signal_sell = (df['Volume'] >= vol_cond) & (pct_chg <= down_cond)  # 매도 시그널
+    
+    # -------------------------------------------------------------------------
+    # 3. 통계 지표 계산 (Statistical Metrics)
+    # -------------------------------------------------------------------------
+    start_price, end_price, ret, drawdown, mdd = calculate_stats(df)
+    
+    # -------------------------------------------------------------------------
+    # 4. 차트 레이아웃 구성 (Chart Layout)
+    # -------------------------------------------------------------------------
+    fig = make_subplots(
+        rows=4, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        row_heights=[0.5, 0.15, 0.15, 0.2],
+        subplot_titles=(
+            f'{name} Price & Signals', 
+            'Volume (Signal Detection)', 
+            'Drawdown (Risk Analysis)', 
+            'Summary Statistics'
+        ),
+        specs=[[{"type": "xy"}], [{"type": "xy"}], [{"type": "xy"}], [{"type": "table"}]]
+    )
+    
+    # -------------------------------------------------------------------------
+    # 5. Row 1: 가격 차트 + 이평선 + 볼린저밴드 (Price Chart)
+    # -------------------------------------------------------------------------
+    # 캔들스틱 차트 (한국식: 빨강/파랑)
+    fig.add_trace(go.Candlestick(
+        x=df.index,
+        open=df['Open'], 
+        high=df['High'], 
+        low=df['Low'], 
+        close=df['Close'],
+        name='Price',
+        increasing_line_color='#ef5350',  # 양봉: 빨강
+        decreasing_line_color='#42a5f5'   # 음봉: 파랑
+    ), row=1, col=1)
+    
+    # 이동평균선 추가
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind['MA20'], 
+        line=dict(color='gold', width=1.5), 
+        name='MA20 (생명선)'
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind['MA60'], 
+        line=dict(color='lime', width=1.5), 
+        name='MA60 (수급선)'
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind['MA120'], 
+        line=dict(color='magenta', width=1.5), 
+        name='MA120 (경기선)'
+    ), row=1, col=1)
+    
+    # 볼린저밴드 상단
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind['BB20_Upper'],
+        line=dict(color='rgba(200,200,200,0.5)', width=1),
+        name='BB 상단'
+    ), row=1, col=1)
+    
+    # 볼린저밴드 하단 (채우기 효과)
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=ind['BB20_Lower'],
+        line=dict(color='rgba(200,200,200,0.5)', width=1),
+        fill='tonexty', 
+        fillcolor='rgba(200,200,200,0.05)',
+        name='BB 하단'
+    ), row=1, col=1)
+    
+    # -------------------------------------------------------------------------
+    # 6. 시그널 마커 (Signal Markers)
+    # -------------------------------------------------------------------------
+    # 급등 포착 (Buy Signal)
+    buy_days = df[signal_buy]
+    if not buy_days.empty:
+        fig.add_trace(go.Scatter(
+            x=buy_days.index, 
+            y=buy_days['Close'],
+            mode='markers',
+            marker=dict(
+                symbol='triangle-up', 
+                size=12, 
+                color='red', 
+                line=dict(width=1, color='white')
+            ),
+            name='급등 포착'
+        ), row=1, col=1)
+    
+    # 급락 포착 (Sell Signal)
+    sell_days = df[signal_sell]
+    if not sell_days.empty:
+        fig.add_trace(go.Scatter(
+            x=sell_days.index, 
+            y=sell_days['Close'],
+            mode='markers',
+            marker=dict(
+                symbol='triangle-down', 
+                size=12, 
+                color='blue', 
+                line=dict(width=1, color='white')
+            ),
+            name='급락 포착'
+        ), row=1, col=1)
+    
+    # -------------------------------------------------------------------------
+    # 7. Row 2: 거래량 (Volume with Signal Highlighting)
+    # -------------------------------------------------------------------------
+    # 기본 색상: 양봉(빨강), 음봉(파랑)
+    colors = np.where(
+        df['Close'] >= df['Open'], 
+        'rgba(239, 83, 80, 0.5)',   # 양봉: 빨강 (반투명)
+        'rgba(66, 165, 245, 0.5)'   # 음봉: 파랑 (반투명)
+    )
+    # 시그널 발생일은 노란색으로 강조
+    colors = np.where(
+        signal_buy | signal_sell, 
+        'rgba(255, 215, 0, 0.9)',  # 시그널: 금색
+        colors
+    )
+    
+    fig.add_trace(go.Bar(
+        x=df.index, 
+        y=df['Volume'],
+        marker_color=colors,
+        name='Volume'
+    ), row=2, col=1)
+    
+    # -------------------------------------------------------------------------
+    # 8. Row 3: Drawdown (낙폭 분석)
+    # -------------------------------------------------------------------------
+    fig.add_trace(go.Scatter(
+        x=df.index, 
+        y=drawdown,
+        fill='tozeroy',
+        line=dict(color='#ef5350'),
+        name='Drawdown'
+    ), row=3, col=1)
+    
+    # -------------------------------------------------------------------------
+    # 9. Row 4: 통계 테이블 (Summary Table with Signal Counts)
+    # -------------------------------------------------------------------------
+    # 테마별 색상 설정
+    theme = theme_colors(template)
+    header_color = theme['header_color']
+    cell_color = theme['cell_color']
+    font_color = theme['font_color']
+    
+    fig.add_trace(go.Table(
+        header=dict(
+            values=["Metric", "Value"], 
+            fill_color=header_color, 
+            font=dict(color='white', size=12)
+        ),
+        cells=dict(
+            values=[
+                ['Start Price', 'End Price', 'Return', 'MDD (Max Loss)', 'Total Days', 'Buy Signals', 'Sell Signals'],
+                [
+                    f"{start_price:,.0f}", 
+                    f"{end_price:,.0f}", 
+                    f"{ret:+.2f}%", 
+                    f"{mdd:.2f}%", 
+                    len(df), 
+                    signal_buy.sum(),   # 매수 시그널 횟수
+                    signal_sell.sum()   # 매도 시그널 횟수
+                ]
+            ],
+            fill_color=cell_color, 
+            font=dict(color=font_color), 
+            align='left'
+        )
+    ), row=4, col=1)
+    
+    # -------------------------------------------------------------------------
+    # 10. 레이아웃 최종 설정 (Final Layout Configuration)
+    # -------------------------------------------------------------------------
+    fig.update_layout(
+        title=dict(text=f'<b>{name} Trading Dashboard</b>', x=0.5, font=dict(size=24)),
+        template=template,
+        height=1000,
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    # 그리드 색상 설정
+    grid_color = theme['grid_color']
+    fig.update_xaxes(gridcolor=grid_color)
+    fig.update_yaxes(gridcolor=grid_color, tickformat=',')
+    
+    return apply_render_mode(fig)
+
+
+def plot_seasonality_heatmap(df, name="Stock", template="plotly_white"):
+    """
+    월별 계절성 히트맵 (Seasonality Heatmap)
+    연도 × 월 수익률 + 월별 평균 행 - 여러 해 구간에서 특정 달의 강세/약세 패턴 확인
+    """
+    table = seasonality(df)
+    table.index = table.index.astype(str)
+    table.loc['평균'] = table.mean()
+    month_labels = [f"{m}월" for m in table.columns]
+
+    fig = go.Figure(go.Heatmap(
+        z=table.to_numpy(), x=month_labels, y=table.index,
+        colorscale=[[0, '#EF5350'], [0.5, '#FFFFFF'], [1, '#26A69A']], zmid=0,
+        texttemplate='%{z:.1f}', hovertemplate='%{y} %{x}: %{z:.2f}%<extra></extra>',
+        colorbar=dict(title='%')
+    ))
+
+    fig.update_layout(
+        title=dict(text=f"<b>{name} Monthly Seasonality (월별 계절성)</b>", x=0.5),
+        template=template,
+        height=max(300, 40 * len(table) + 160),
+        yaxis=dict(autorange='reversed', type='category'),
+        xaxis=dict(side='top')
+    )
+    return fig
+
+
+def plot_comparison(panel, result, labels=None, template="plotly_white"):
+    """
+    종목 비교 대시보드 (Comparison Dashboard)
+    정규화 누적 수익률 + 기준 종목 대비 이동 상관계수
+    result 는 comparison.compare(panel) 의 반환값
+    """
+    labels = labels or {}
+    names = [labels.get(t, t) for t in panel.tickers]
+    base = result["base"]
+
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+        row_heights=[0.65, 0.35],
+        subplot_titles=("Normalized Return (정규화 누적 수익률, %)",
+                        f"Rolling Correlation vs {names[base]} (이동 상관계수)")
+    )
+    for i, name in enumerate(names):
+        fig.add_trace(go.Scatter(
+            x=panel.dates, y=result["normalized"][i], name=name, legendgroup=name,
+            mode='lines', line=dict(width=1.5), connectgaps=True,
+            hovertemplate='%{y:+.1f}%'
+        ), row=1, col=1)
+    for i, name in enumerate(names):
+        if i == base:
+            continue
+        fig.add_trace(go.Scatter(
+            x=panel.dates, y=result["rolling_corr"][i], name=name, legendgroup=name,
+            mode='lines', line=dict(width=1), showlegend=False,
+            hovertemplate='%{y:.2f}'
+        ), row=2, col=1)
+
+    theme = theme_colors(template)
+    fig.update_layout(
+        title=dict(text=f"<b>Comparison ({len(names)} stocks)</b>", x=0.5),
+        template=template,
+        height=800,
+        hovermode='x unified',
+    )
+    fig.update_xaxes(gridcolor=theme['grid_color'])
+    fig.update_yaxes(gridcolor=theme['grid_color'])
+    fig.update_yaxes(range=[-1, 1], row=2, col=1)
+    return apply_render_mode(fig)
+
+
+def plot_correlation_heatmap(tickers, matrix, labels=None, title="Correlation (상관계수)",
+                             template="plotly_white", zmax=1.0):
+    """
+    상관/공분산 행렬 히트맵 - 종목이 많으면 셀 숫자는 생략
+    zmax=None 이면 색 범위를 값에 맞춤 (공분산)
+    """
+    labels = labels or {}
+    names = [labels.get(t, t) for t in tickers]
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix, x=names, y=names,
+        colorscale='RdBu_r', zmid=0,
+        zmin=-zmax if zmax is not None else None, zmax=zmax,
+        texttemplate='%{z:.2f}' if len(names) <= 15 else None,
+        hovertemplate='%{y} / %{x}: %{z:.3f}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=dict(text=f"<b>{title}</b>", x=0.5),
+        template=template,
+        height=max(450, 18 * len(names) + 200),
+        yaxis=dict(autorange='reversed')
+    )
+    return fig
+
+
+def plot_benchmark_report(result, ticker, name, template="plotly_white", benchmarks=None):
+    """
+    시장 지수 대비 차트 (Benchmark Report)
+    상대강도(RS) / 이동 베타 / 이동 알파(연율화 %) / 이동 상관계수 - 지수별 선
+    result 는 benchmark.analyze(panel) 의 반환값
+    """
+    benchmarks = benchmarks or {}
+    i = result["tickers"].index(ticker)
+    dates = result["dates"]
+
+    fig = make_subplots(
+        rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.05,
+        row_heights=[0.34, 0.22, 0.22, 0.22],
+        subplot_titles=("Relative Strength (상대강도, 시작=100)", "Rolling Beta (베타)",
+                        "Rolling Alpha (알파, 연율화 %)", "Rolling Correlation (상관계수)")
+    )
+    colors = ['#2196f3', '#ff9800', '#9c27b0', '#4caf50']
+    for b, code in enumerate(result["benchmarks"]):
+        market = benchmarks.get(code, code)
+        color = colors[b % len(colors)]
+        for row, key, fmt in ((1, "rs", '%{y:.1f}'), (2, "beta", '%{y:.2f}'),
+                              (3, "alpha", '%{y:+.1f}%'), (4, "corr", '%{y:.2f}')):
+            fig.add_trace(go.Scatter(
+                x=dates, y=result[key][b, i], name=f"vs {market}", legendgroup=code,
+                showlegend=(row == 1), mode='lines', line=dict(color=color, width=1.5),
+                hovertemplate=fmt
+            ), row=row, col=1)
+
+    fig.add_hline(y=100, line_dash="dash", line_color="gray", row=1, col=1)
+    fig.add_hline(y=1, line_dash="dash", line_color="gray", row=2, col=1)
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", row=3, col=1)
+
+    theme = theme_colors(template)
+    fig.update_layout(
+        title=dict(text=f"<b>{name} vs Market (시장 대비)</b>", x=0.5),
+        template=template,
+        height=900,
+        hovermode='x unified',
+    )
+    fig.update_xaxes(gridcolor=theme['grid_color'])
+    fig.update_yaxes(gridcolor=theme['grid_color'])
+    fig.update_yaxes(range=[-1, 1], row=4, col=1)
+    return apply_render_mode(fig)
+
+
+def plot_backtest(result, name, template="plotly_white"):
+    """
+    백테스트 결과 (Backtest Report)
+    전략 자산 곡선 vs 단순 보유(Buy & Hold) + 매수/매도 지점 / 전략 낙폭
+    result 는 backtest.backtest(df, ...) 의 반환값
+    """
+    equity = (result["equity"] - 1) * 100
+    buy_hold = (result["benchmark"] - 1) * 100
+    drawdown = (result["equity"] / result["equity"].cummax() - 1) * 100
+    trades = result["trades"]
+
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+        row_heights=[0.7, 0.3],
+        subplot_titles=("Cumulative Return (누적 수익률, %)", "Strategy Drawdown (전략 낙폭, %)")
+    )
+    fig.add_trace(go.Scatter(
+        x=buy_hold.index, y=buy_hold, name='Buy & Hold',
+        line=dict(color='gray', width=1, dash='dot')
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=equity.index, y=equity, name='Strategy',
+        line=dict(color='#2196f3', width=2)
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=trades['Entry_Date'], y=equity.reindex(trades['Entry_Date']), mode='markers', name='Buy',
+        marker=dict(symbol='triangle-up', size=9, color='#ef5350')
+    ), row=1, col=1)
+    closed = trades[~trades['Open'].astype(bool)]
+    fig.add_trace(go.Scatter(
+        x=closed['Exit_Date'], y=equity.reindex(closed['Exit_Date']), mode='markers', name='Sell',
+        marker=dict(symbol='triangle-down', size=9, color='#26a69a')
+    ), row=1, col=1)
+    fig.add_trace(go.Scatter(
+        x=drawdown.index, y=drawdown, name='Drawdown', fill='tozeroy',
+        line=dict(color='#ef5350', width=1), showlegend=False
+    ), row=2, col=1)
+
+    theme = theme_colors(template)
+    fig.update_layout(
+        title=dict(text=f"<b>{name} Backtest (백테스트)</b>", x=0.5),
+        template=template,
+        height=650,
+        hovermode='x unified',
+    )
+    fig.update_xaxes(gridcolor=theme['grid_color'])
+    fig.update_yaxes(gridcolor=theme['grid_color'])
+    return apply_render_mode(fig)
@@ -0,0 +1,107 @@
+"""
+종목 비교 계산 (Multi-Ticker Comparison)
+패널의 (종목 × 날짜) 종가 배열에서 정규화 누적 수익률, 상관/공분산 행렬, 이동 상관계수를
+종목별 반복 없이 한 번에 계산합니다.
+
+- 상관/공분산은 pandas DataFrame.corr() 처럼 종목 쌍마다 두 종목 모두 값이 있는 날만 사용
+  (마스크 행렬 곱으로 모든 쌍을 동시에 계산)
+- 이동 상관계수는 날짜 방향 누적합으로 기준 종목 대비 모든 종목을 동시에 계산
+"""
+import numpy as np
+
+from signals import pct_change
+
+TRADING_DAYS = 252
+MIN_PERIODS = 20  # 상관계수 계산에 필요한 최소 공통 거래일 수
+
+
+def normalized_returns(close):
+    """종목별 첫 거래일 대비 누적 수익률 (%)"""
+    close = np.asarray(close, dtype=np.float64)
+    has_bar = ~np.isnan(close)
+    first = np.argmax(has_bar, axis=1)
+    base = close[np.arange(len(close)), first][:, None]
+    return (close / base - 1) * 100
+
+
+def _pairwise_sums(ret):
+    """쌍별 공통 유효일 기준 (개수, Σx, Σx², Σxy) - 모두 (종목 × 종목)"""
+    mask = (~np.isnan(ret)).astype(np.float64)
+    x = np.where(mask > 0, ret, 0.0)
+    n = mask @ mask.T
+    sx = x @ mask.T           # sx[i, j] = j 도 값이 있는 날의 Σ x_i
+    sxx = (x * x) @ mask.T
+    sxy = x @ x.T
+    return n, sx, sxx, sxy
+
+
+def covariance_matrix(ret, annualize=True, min_periods=MIN_PERIODS):
+    """
+    수익률 공분산 행렬 (표본, ddof=1) - 공통 거래일이 min_periods 미만인 쌍은 NaN
+    annualize=True 면 연율화 (× 252)
+    """
+    n, sx, sxx, sxy = _pairwise_sums(ret)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (sxy - sx * sx.T / n) / (n - 1)
+    cov[n < max(min_periods, 2)] = np.nan
+    return cov * TRADING_DAYS if annualize else cov
+
+
+def correlation_matrix(ret, min_periods=MIN_PERIODS):
+    """수익률 상관계수 행렬 (pandas DataFrame.corr 와 같은 쌍별 계산)"""
+    n, sx, sxx, sxy = _pairwise_sums(ret)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_i = sxx - sx * sx / n
+        var_j = var_i.T
+        corr = cov / np.sqrt(var_i * var_j)
+    corr[n < max(min_periods, 2)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def rolling_sum(values, window):
+    """날짜(마지막 축) 방향 이동 합계 (윈도우가 덜 찬 앞부분은 NaN)"""
+    cs = np.cumsum(values, axis=-1)
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        out[..., window - 1:] = cs[..., window - 1:]
+        out[..., window:] -= cs[..., :-window]
+    return out
+
+
+def rolling_correlation(ret, base, window=60):
+    """
+    기준 종목(base 행) 대비 모든 종목의 window 일 이동 상관계수 (종목 × 날짜)
+    윈도우 안에 어느 한쪽이라도 값이 없는 날이 있으면 NaN (pandas rolling 과 동일)
+    """
+    y = ret[base][None, :]
+    valid = ~np.isnan(ret) & ~np.isnan(y)
+    x = np.where(valid, ret, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    full = rolling_sum(valid.astype(np.float64), window) == window
+    sx, sy = rolling_sum(x, window), rolling_sum(y, window)
+    sxx, syy = rolling_sum(x * x, window), rolling_sum(y * y, window)
+    sxy = rolling_sum(x * y, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / window
+        corr = cov / np.sqrt((sxx - sx * sx / window) * (syy - sy * sy / window))
+    return np.where(full, np.clip(corr, -1.0, 1.0), np.nan)
+
+
+def compare(panel, base=None, window=60):
+    """
+    패널 전체 비교 지표
+    반환: dict(normalized, returns, corr, cov, rolling_corr, base)
+    """
+    close = np.asarray(panel["Close"], dtype=np.float64)
+    ret = pct_change(close)
+    base = 0 if base is None else panel.row(base)
+    return {
+        "normalized": normalized_returns(close),
+        "returns": ret,
+        "corr": correlation_matrix(ret),
+        "cov": covariance_matrix(ret),
+        "rolling_corr": rolling_correlation(ret, base, window),
+        "base": base,
+    }
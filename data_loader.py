@@ -0,0 +1,369 @@
+"""
+주가 데이터 로더 (Stock Data Loader)
+메모리 구간 캐시 → 로컬 저장소 → 네트워크 순서로 일봉을 조회합니다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from data_store import ONE_DAY, OHLCVStore, to_day
+from providers import get_provider
+from refresher import (BACKGROUND, FETCH_DEADLINE, FETCH_RETRIES, INTERACTIVE,
+                       BackgroundRefresher, FetchScheduler, FetchTimeout)
+from timing import timed
+from trading_calendar import CALENDAR_START, REFERENCE_TICKER, TradingCalendar
+
+logger = logging.getLogger(__name__)
+
+# 여러 종목 동시 조회 시 최대 스레드 수 (데이터 제공처 부하 제한)
+BATCH_MAX_WORKERS = 4
+
+
+class CacheStats:
+    """캐시 적중률 집계 (Cache Hit-Rate Counter)"""
+
+    def __init__(self):
+        self.lookups = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record_lookup(self):
+        with self._lock:
+            self.lookups += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hits(self):
+        return self.lookups - self.misses
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def __str__(self):
+        return f"적중률 {self.hit_rate:.1%} ({self.hits}/{self.lookups})"
+
+
+class _Span:
+    """캐시된 연속 구간 [start, end] 와 해당 일봉"""
+    __slots__ = ("start", "end", "df", "fetched_at")
+
+    def __init__(self, start, end, df, fetched_at):
+        self.start = start
+        self.end = end
+        self.df = df
+        self.fetched_at = fetched_at
+
+
+class RangeCache:
+    """
+    종목별 구간 캐시 (Range-Superset Cache)
+    요청 구간을 포함하는 캐시 구간이 있으면 재조회 없이 슬라이스로 반환합니다.
+    겹치거나 맞닿은 구간은 하나로 병합해 중복 보관하지 않습니다.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl  # 오늘을 포함하는 구간의 유효 시간 (초)
+        self._spans = {}  # ticker -> start 기준 정렬된 _Span 리스트
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def _is_settled(span):
+        # 수집한 날 이전에 끝나는 구간은 확정된 과거 일봉이므로 만료되지 않음
+        return span.end < pd.Timestamp.fromtimestamp(span.fetched_at).normalize()
+
+    def _is_fresh(self, span):
+        return self._is_settled(span) or (time.time() - span.fetched_at) <= self.ttl
+
+    def lookup(self, ticker, start, end):
+        """
+        [start, end] 를 포함하는 캐시 구간의 (슬라이스, 최신 여부) 반환
+        없으면 (None, False). 만료된 구간도 반환하므로 호출 측에서 갱신 여부를 결정합니다.
+        """
+        self.stats.record_lookup()
+        with self._lock:
+            for span in self._spans.get(ticker, []):
+                if span.start <= start and end <= span.end:
+                    # 정렬된 DatetimeIndex 라벨 슬라이스 - 데이터 복사 없음
+                    return span.df.loc[start:end], self._is_fresh(span)
+        self.stats.record_miss()
+        return None, False
+
+    def last_good(self, ticker, start, end):
+        """만료 여부와 관계없이 [start, end] 를 포함하는 캐시 (슬라이스, 수집 시각) - 장애 시 대체용"""
+        with self._lock:
+            for span in self._spans.get(ticker, []):
+                if span.start <= start and end <= span.end:
+                    return span.df.loc[start:end], pd.Timestamp.fromtimestamp(span.fetched_at)
+        return None, None
+
+    def live_spans(self):
+        """아직 확정되지 않은 (수집일 당일을 포함하는) 구간 목록 [(ticker, start, end)]"""
+        with self._lock:
+            return [
+                (ticker, span.start, span.end)
+                for ticker, spans in self._spans.items()
+                for span in spans
+                if not self._is_settled(span)
+            ]
+
+    def put(self, ticker, start, end, df):
+        """구간 저장 - 겹치거나 맞닿은 기존 구간과 병합"""
+        new = _Span(start, end, df, time.time())
+        with self._lock:
+            keep, merge = [], []
+            for span in self._spans.get(ticker, []):
+                if span.start <= end + ONE_DAY and span.end >= start - ONE_DAY:
+                    merge.append(span)
+                else:
+                    keep.append(span)
+
+            if merge:
+                # 새로 받은 데이터가 우선 (keep="last")
+                merged = pd.concat([span.df for span in merge] + [df])
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                merged.attrs = dict(df.attrs)
+                # 수집 시각은 가장 최근 날짜까지 담고 있는 구간 기준
+                latest = max(merge, key=lambda span: span.end)
+                new = _Span(
+                    min([start] + [span.start for span in merge]),
+                    max(end, latest.end),
+                    merged,
+                    new.fetched_at if end >= latest.end else latest.fetched_at,
+                )
+
+            keep.append(new)
+            keep.sort(key=lambda span: span.start)
+            self._spans[ticker] = keep
+
+    def clear(self, ticker=None):
+        with self._lock:
+            if ticker is None:
+                self._spans.clear()
+            else:
+                self._spans.pop(ticker, None)
+
+
+class _Call:
+    """진행 중인 조회 1건 (결과/예외를 대기자와 공유)"""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    동시 요청 병합 (Single-Flight Request Coalescing)
+    같은 키로 진행 중인 조회가 있으면 새로 실행하지 않고 그 결과를 기다립니다.
+    timeout 을 주면 대기자는 그 시간까지만 기다리고 FetchTimeout (조회 자체는 계속 진행)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0  # 병합된(대기만 한) 요청 수
+
+    def do(self, key, fn, *args, timeout=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.event.wait(timeout):
+                raise FetchTimeout(f"진행 중인 같은 조회가 제한 시간({timeout:g}초) 안에 끝나지 않음")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class StockDataLoader:
+    """
+    일봉 조회 진입점
+    1) 메모리 구간 캐시 (RangeCache)  2) 로컬 저장소 (OHLCVStore)  3) fetch (네트워크)
+    store 가 None 이면 fetch (오프라인 제공처) 를 바로 호출합니다.
+    calendar (TradingCalendar) 가 주어지면 조회 전에 구간을 거래일 경계로 정규화합니다.
+    같은 (ticker, 정규화 구간) 의 동시 캐시 미스는 한 번의 조회로 병합됩니다.
+    on_stale 이 주어지면 만료된 캐시를 즉시 반환하고 갱신은 on_stale 에 맡깁니다.
+    (Stale-While-Revalidate) 없으면 만료된 캐시는 미스로 처리해 다시 조회합니다.
+    조회가 실패하거나 제한 시간을 넘기면 마지막으로 받은 데이터를 대신 반환하고
+    df.attrs["stale_as_of"] 에 그 데이터의 수집 시각을 기록합니다.
+    반환되는 DataFrame 은 캐시와 메모리를 공유하는 슬라이스이므로 제자리 수정하지 마세요.
+    """
+
+    def __init__(self, store, fetch, ttl=3600, calendar=None, on_stale=None, background_fetch=None):
+        self.store = store
+        self.fetch = fetch
+        self.background_fetch = background_fetch or fetch  # 워밍업 등 급하지 않은 조회용
+        self.calendar = calendar
+        self.on_stale = on_stale  # on_stale(ticker, start, end) - 백그라운드 갱신 요청
+        self.scheduler = None  # FetchScheduler (create_data_loader 에서 설정)
+        self.provider = None   # DataProvider (create_data_loader 에서 설정)
+        self.cache = RangeCache(ttl=ttl)
+        self.inflight = SingleFlight()
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    @property
+    def coalesced(self):
+        """동시 캐시 미스 중 다른 세션의 조회 결과를 공유받은 요청 수"""
+        return self.inflight.coalesced
+
+    def normalize(self, start, end):
+        """캐시 키 정규화 - 주말/휴장일/미래 날짜 차이를 제거"""
+        if self.calendar is not None:
+            return self.calendar.snap(start, end)
+        return to_day(start), to_day(end)
+
+    def load(self, ticker, start, end, fetch=None):
+        start, end = self.normalize(start, end)
+
+        df, fresh = self.cache.lookup(ticker, start, end)
+        if df is not None:
+            if fresh:
+                return df
+            if self.on_stale is not None:
+                self.on_stale(ticker, start, end)
+                return df
+        try:
+            return self.revalidate(ticker, start, end, fetch)
+        except Exception:
+            df, as_of = self._last_good(ticker, start, end)
+            if df is None:
+                raise
+            logger.warning("fetch failed, serving data as of %s: %s", as_of, ticker, exc_info=True)
+            df = df.copy(deep=False)  # attrs 가 캐시 원본에 남지 않도록 분리
+            df.attrs["stale_as_of"] = as_of
+            return df
+
+    def _last_good(self, ticker, start, end):
+        """메모리 캐시 → 로컬 저장소(네트워크 없이) 순으로 마지막 정상 데이터 조회"""
+        df, as_of = self.cache.last_good(ticker, start, end)
+        if df is not None:
+            return df, as_of
+        if self.store is None:
+            return None, None
+        stored, _ = self.store.read(ticker)
+        if stored.empty:
+            return None, None
+        df = stored.loc[start:end]
+        if df.empty:
+            return None, None
+        return df, self.store.modified_at(ticker)
+
+    def revalidate(self, ticker, start, end, fetch=None):
+        """
+        동시 요청 병합(SingleFlight)을 거쳐 refresh - 같은 키의 조회가 진행 중이면 새로 수집하지 않고 결과를 공유
+        (사용자 캐시 미스와 백그라운드 갱신이 같은 구간을 동시에 제공처에 요청하지 않도록 둘 다 이 경로를 사용)
+        제한 시간이 없는 백그라운드 조회에 합류한 사용자 요청도 자신의 제한 시간까지만 기다립니다.
+        """
+        timeout = getattr(fetch or self.fetch, "deadline", None)
+        return self.inflight.do((ticker, start, end), self.refresh, ticker, start, end, fetch, timeout=timeout)
+
+    def refresh(self, ticker, start, end, fetch=None):
+        """캐시를 거치지 않고 저장소(+네트워크)에서 다시 읽어 캐시 갱신"""
+        fetch = fetch or self.fetch
+        if hasattr(fetch, "bounded"):
+            fetch = fetch.bounded()  # 저장소의 앞/뒤 구간 수집이 하나의 제한 시간을 함께 씀
+        # fetch 단계는 제공처 호출(대기열 포함)만 측정 - 저장소 읽기/병합은 data 단계에 포함
+        fetch = timed("fetch")(fetch)
+        if self.store is None:
+            df = fetch(ticker, start, end)
+        else:
+            df = self.store.get(ticker, start, end, fetch)
+        if not df.empty:
+            df.attrs["ticker"] = ticker  # 지표/차트 캐시 키로 사용
+            self.cache.put(ticker, start, end, df)
+        return df
+
+    def load_many(self, tickers, start, end, max_workers=BATCH_MAX_WORKERS, background=False):
+        """
+        여러 종목 동시 조회 (제한된 스레드 풀)
+        {ticker: DataFrame} 반환 - 실패한 종목은 빈 DataFrame
+        background=True 면 사용자 요청보다 낮은 우선순위로 수집합니다. (캐시 워밍업)
+        """
+        fetch = self.background_fetch if background else None
+        tickers = list(dict.fromkeys(tickers))  # 중복 제거 (순서 유지)
+        if not tickers:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)),
+                                thread_name_prefix="stock-batch") as pool:
+            futures = {ticker: pool.submit(self.load, ticker, start, end, fetch) for ticker in tickers}
+            for ticker, future in futures.items():
+                try:
+                    results[ticker] = future.result()
+                except Exception:
+                    logger.exception("batch load failed: %s", ticker)
+                    results[ticker] = pd.DataFrame()
+        return results
+
+
+def create_data_loader(provider=None, ttl=3600, store=None, refresh_minutes=10,
+                       deadline=FETCH_DEADLINE, retries=FETCH_RETRIES):
+    """
+    앱 공용 로더 구성 (서버 프로세스당 1개)
+    provider 를 생략하면 환경변수 STOCK_DATA_PROVIDER 의 제공처를 사용합니다.
+
+    네트워크 제공처 (live/record)
+    - 로컬 저장소를 거쳐 없는 구간만 수집
+    - 모든 fetch 호출은 FetchScheduler 를 거침 (사용자 요청 우선, 동시 실행/호출 수 제한)
+    - 사용자 요청은 deadline 초 안에 끝나지 않으면 마지막 정상 데이터로 대체
+    - 만료된 캐시는 즉시 반환하고 BackgroundRefresher 가 뒤에서 갱신
+    오프라인 제공처 (store/fixture)
+    - 저장소/스케줄러/백그라운드 갱신 없이 제공처를 직접 호출 (순수 디스크 + 계산 시간)
+    """
+    provider = provider or get_provider()
+    if provider.offline:
+        loader = StockDataLoader(None, provider, ttl=ttl)
+        loader.calendar = TradingCalendar.from_store(None, provider)
+        loader.provider = provider
+        return loader
+
+    store = store or OHLCVStore()
+    scheduler = FetchScheduler(provider)
+    interactive = scheduler.fetcher(INTERACTIVE, deadline=deadline, retries=retries)
+    background = scheduler.fetcher(BACKGROUND, retries=retries)
+
+    # 캘린더는 저장소의 기준 지수로 바로 만들고 (첫 화면에서 네트워크 대기 없음),
+    # 기준 지수 수집/갱신은 백그라운드 갱신에 맡겨 새 거래일이 생기면 캘린더가 따라감
+    loader = StockDataLoader(
+        store,
+        interactive,
+        ttl=ttl,
+        calendar=TradingCalendar.live(store),
+        background_fetch=background,
+    )
+    refresher = BackgroundRefresher(loader, background, interval_minutes=refresh_minutes).start()
+    refresher.request(REFERENCE_TICKER, to_day(CALENDAR_START), pd.Timestamp.today().normalize())
+    loader.on_stale = refresher.request
+    loader.scheduler = scheduler
+    loader.provider = provider
+    return loader
@@ -0,0 +1,158 @@
+"""
+로컬 OHLCV 저장소 (Local OHLCV Store)
+종목별 Parquet 파일에 지금까지 수집한 모든 일봉을 보관하고,
+요청 구간 중 저장소에 없는 앞/뒤 구간만 네트워크에서 받아옵니다.
+"""
+import json
+import os
+import threading
+
+import pandas as pd
+
+# 저장 위치 (환경변수 STOCK_STORE_DIR 로 변경 가능)
+STORE_DIR = os.environ.get(
+    "STOCK_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "ohlcv")
+)
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def to_day(value):
+    """문자열/date/datetime 을 자정 기준 Timestamp 로 변환"""
+    return pd.Timestamp(value).normalize()
+
+
+class OHLCVStore:
+    """
+    종목별 일봉 저장소
+    - {ticker}.parquet : 수집한 전체 일봉 (Date 인덱스)
+    - {ticker}.json    : 수집 완료 구간 (coverage) - 휴장일로 인해 데이터가 없는
+                         구간도 다시 요청하지 않도록 별도로 기록합니다.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 파일 입출력 (File I/O)
+    # -------------------------------------------------------------------------
+    def _paths(self, ticker):
+        base = os.path.join(self.root, ticker)
+        return base + ".parquet", base + ".json"
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def tickers(self):
+        """저장소에 있는 종목 코드 목록 (정렬)"""
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return []
+        return sorted(
+            name[:-len(".parquet")] for name in names
+            if name.endswith(".parquet") and name[:-len(".parquet")] + ".json" in names
+        )
+
+    def read(self, ticker, columns=None):
+        """
+        저장된 일봉과 수집 구간 (start, end) 반환. 없으면 (빈 DataFrame, None)
+        columns 를 지정하면 해당 컬럼만 읽습니다 (전 종목 스캔 등).
+        """
+        data_path, meta_path = self._paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return pd.DataFrame(), None
+        try:
+            df = pd.read_parquet(data_path, columns=columns)
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            coverage = (pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"]))
+        except (OSError, ValueError, KeyError):
+            # 손상된 파일은 없는 것으로 취급 (다음 수집 때 덮어씀)
+            return pd.DataFrame(), None
+        return df, coverage
+
+    def coverage(self, ticker):
+        """수집 구간 (start, end) 만 조회 (일봉 파일은 읽지 않음) - 없으면 None"""
+        data_path, meta_path = self._paths(ticker)
+        if not os.path.exists(data_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def modified_at(self, ticker):
+        """마지막 저장 시각 (없으면 None)"""
+        data_path, _ = self._paths(ticker)
+        try:
+            return pd.Timestamp.fromtimestamp(os.path.getmtime(data_path))
+        except OSError:
+            return None
+
+    def write(self, ticker, df, coverage):
+        """임시 파일에 쓴 뒤 교체 (쓰는 도중 다른 프로세스가 읽어도 안전)"""
+        data_path, meta_path = self._paths(ticker)
+        df.to_parquet(data_path + ".tmp")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"start": coverage[0].isoformat(), "end": coverage[1].isoformat()}, f)
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    # -------------------------------------------------------------------------
+    # 증분 조회 (Incremental Fetch)
+    # -------------------------------------------------------------------------
+    def get(self, ticker, start, end, fetch):
+        """
+        [start, end] 구간의 일봉 반환
+        저장소에 없는 앞/뒤 구간만 fetch(ticker, start, end) 로 받아와 병합 후 저장합니다.
+        빈 응답을 받은 구간은 수집 구간에 넣지 않으므로 다음 조회 때 다시 요청합니다.
+        오늘 일봉은 장중에 계속 바뀌므로 수집 완료 구간에 포함하지 않습니다.
+        """
+        start, end = to_day(start), to_day(end)
+        today = pd.Timestamp.today().normalize()
+        fetch_end = min(end, today)
+
+        with self._lock(ticker):
+            df, coverage = self.read(ticker)
+
+            # 1. 비어 있는 구간 계산 (수집 구간이 항상 연속이 되도록 앞/뒤로 확장)
+            if coverage is None:
+                missing = [(start, fetch_end)]
+            else:
+                missing = []
+                if start < coverage[0]:
+                    missing.append((start, coverage[0] - ONE_DAY))
+                if fetch_end > coverage[1]:
+                    missing.append((coverage[1] + ONE_DAY, fetch_end))
+            missing = [(s, e) for s, e in missing if s <= e]
+
+            # 2. 네트워크 수집 및 병합 - 구간별로 일봉을 받은 경우에만 그쪽 수집 구간을 넓히고 바로 저장
+            #    (일시적인 빈 응답을 수집 완료로 기록하지 않고, 뒤 구간 수집이 실패해도 앞 구간은 보존)
+            settled = today - ONE_DAY
+            for s, e in missing:
+                part = fetch(ticker, s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d"))
+                if part is None or part.empty:
+                    continue
+                df = part if df.empty else pd.concat([df, part])
+                df = df[~df.index.duplicated(keep="last")].sort_index()
+
+                if coverage is None:
+                    coverage = (s, min(e, settled))
+                elif s < coverage[0]:
+                    coverage = (s, coverage[1])
+                else:
+                    coverage = (coverage[0], max(coverage[1], min(e, settled)))
+                if coverage[0] <= coverage[1]:
+                    self.write(ticker, df, coverage)
+
+        if df.empty:
+            return df
+        return df.loc[start:end]
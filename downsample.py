@@ -0,0 +1,126 @@
+"""
+차트 다운샘플링 (Chart Downsampling)
+여러 해의 일봉을 그대로 브라우저로 보내면 figure 가 커지고 hover 가 멈추므로
+트레이스당 점 개수를 제한합니다.
+
+- 선(line) 트레이스 : LTTB (Largest-Triangle-Three-Buckets) - 모양을 유지하는 점만 선택
+- 캔들/거래량       : 표시 구간 길이에 따라 주봉/월봉 OHLCV 로 집계
+
+표시 구간이 점 예산 이하이면 (날짜 범위를 좁히면) 원본 일봉을 그대로 사용합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# 트레이스당 최대 점 개수 (환경변수 STOCK_MAX_POINTS 로 변경 가능)
+MAX_POINTS = int(os.environ.get("STOCK_MAX_POINTS", 1500))
+
+# 집계 단위 (일봉 개수 기준 대략적인 기간당 거래일 수)
+RESAMPLE_RULES = [
+    ("W-FRI", 5),   # 주봉
+    ("ME", 21),     # 월봉
+    ("QE", 63),     # 분기봉
+]
+RULE_LABELS = {None: "일봉", "W-FRI": "주봉", "ME": "월봉", "QE": "분기봉"}
+
+LTTB_PASSES = 16  # LTTB 벡터화 반복 최대 횟수
+
+
+def _bucket_argmax(x, y, cand, valid, ax, ay, cx, cy):
+    """버킷별 (기준점 a, 다음 평균점 c) 와 만드는 삼각형 넓이가 최대인 후보 위치 - (버킷 × 후보) 배열 한 번에"""
+    area = np.abs((ax[:, None] - cx[:, None]) * (y[cand] - ay[:, None])
+                  - (ax[:, None] - x[cand]) * (cy[:, None] - ay[:, None]))
+    area[~valid] = -1.0  # 버킷 폭을 맞추려고 채운 자리
+    return cand[np.arange(len(cand)), np.argmax(area, axis=1)]
+
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB 로 선택한 위치(정수 배열) 반환 - 첫/마지막 점은 항상 포함
+    x, y 는 같은 길이의 실수 배열 (NaN 없음)
+
+    버킷을 (버킷 × 최대 폭) 배열로 펼쳐 모든 버킷을 한 번에 계산합니다.
+    각 버킷의 기준점(직전 버킷의 선택점)은 반복으로 맞춤 - 1회차는 직전 버킷 평균점, 이후는 직전 회차의 선택점.
+    선택이 더 바뀌지 않으면 순차 LTTB 와 같은 결과이고, LTTB_PASSES 회 안에 수렴하지 않으면
+    아직 바뀌는 버킷부터만 순차로 계산합니다.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 나머지를 (threshold - 2) 개의 버킷으로 분할
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    lo, hi = edges[:-1], edges[1:]
+    cand = lo[:, None] + np.arange(int((hi - lo).max()))[None, :]
+    valid = cand < hi[:, None]
+    cand = np.where(valid, cand, lo[:, None])
+
+    # 버킷 평균점 (누적합) - 다음 버킷 평균점 c, 마지막 버킷은 끝점
+    sx, sy = np.r_[0.0, np.cumsum(x)], np.r_[0.0, np.cumsum(y)]
+    mx, my = (sx[hi] - sx[lo]) / (hi - lo), (sy[hi] - sy[lo]) / (hi - lo)
+    cx, cy = np.r_[mx[1:], x[-1]], np.r_[my[1:], y[-1]]
+
+    picked = _bucket_argmax(x, y, cand, valid, np.r_[x[0], mx[:-1]], np.r_[y[0], my[:-1]], cx, cy)
+    for _ in range(LTTB_PASSES):
+        prev = np.r_[0, picked[:-1]]
+        updated = _bucket_argmax(x, y, cand, valid, x[prev], y[prev], cx, cy)
+        changed = np.flatnonzero(updated != picked)
+        picked = updated
+        if len(changed) == 0:
+            break
+    else:
+        # 첫 변경 버킷 이전은 이미 확정 - 나머지만 순차 계산
+        a = picked[changed[0] - 1] if changed[0] > 0 else 0
+        for i in range(changed[0], len(picked)):
+            c = cand[i, valid[i]]
+            area = np.abs((x[a] - cx[i]) * (y[c] - y[a]) - (x[a] - x[c]) * (cy[i] - y[a]))
+            a = picked[i] = c[np.argmax(area)]
+    return np.r_[0, picked, n - 1]
+
+
+def downsample_series(series, max_points=MAX_POINTS):
+    """DatetimeIndex 시계열을 max_points 개 이하로 축소 (NaN 구간은 제외)"""
+    if not max_points or len(series) <= max_points:
+        return series
+    valid = series.dropna()
+    if len(valid) <= max_points:
+        return valid
+    x = valid.index.asi8.astype(np.float64)
+    y = valid.to_numpy(dtype=np.float64)
+    return valid.iloc[lttb_indices(x, y, max_points)]
+
+
+def downsample_frame(df, column, max_points=MAX_POINTS):
+    """
+    여러 컬럼을 같은 위치로 축소 (볼린저 상/하단처럼 함께 그려야 하는 선)
+    위치는 column 기준 LTTB 로 선택합니다.
+    """
+    if not max_points or len(df) <= max_points:
+        return df
+    valid = df.dropna(subset=[column])
+    if len(valid) <= max_points:
+        return valid
+    x = valid.index.asi8.astype(np.float64)
+    y = valid[column].to_numpy(dtype=np.float64)
+    return valid.iloc[lttb_indices(x, y, max_points)]
+
+
+def choose_rule(n_bars, max_points=MAX_POINTS):
+    """일봉 개수에 맞는 캔들 집계 단위 (원본 그대로면 None)"""
+    if not max_points or n_bars <= max_points:
+        return None
+    for rule, days in RESAMPLE_RULES:
+        if n_bars / days <= max_points:
+            return rule
+    return RESAMPLE_RULES[-1][0]
+
+
+def resample_ohlcv(df, rule):
+    """일봉 → 주봉/월봉/분기봉 OHLCV (rule 이 None 이면 원본 반환)"""
+    if rule is None:
+        return df
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last"}
+    if "Volume" in df.columns:
+        agg["Volume"] = "sum"
+    return df[list(agg)].resample(rule).agg(agg).dropna(subset=["Close"])
@@ -0,0 +1,144 @@
+"""
+완성된 figure 캐시 (Built-Figure Cache)
+Streamlit 은 위젯 하나만 바뀌어도 스크립트 전체를 다시 실행하므로,
+같은 (리포트, 종목, 구간, 옵션, 데이터) 의 figure 는 다시 만들지 않고 재사용합니다.
+테마가 바뀌면 다른 테마로 캐시된 figure 의 템플릿/색상만 바꿔 파생합니다 (themes.py).
+
+- LRU + 메모리 상한 (직렬화 크기 기준, 환경변수 STOCK_FIGURE_CACHE_MB)
+- 적중률/제거 횟수 통계
+- 캐시된 figure 는 여러 세션이 공유하므로 제자리 수정하지 마세요.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from data_loader import CacheStats, SingleFlight
+from themes import THEMES, apply_theme
+from timing import span, timed
+
+FIGURE_CACHE_MB = float(os.environ.get("STOCK_FIGURE_CACHE_MB", 256))
+FIGURE_CACHE_ENTRIES = 128  # 메모리와 별개로 항목 수도 제한
+
+
+def data_signature(df):
+    """
+    데이터 버전 - 구간 경계, 일봉 개수, 마지막 일봉
+    장중 갱신으로 마지막 일봉이 바뀌면 다른 figure 로 취급합니다.
+    """
+    if df is None or df.empty:
+        return None
+    last = df.iloc[-1]
+    return (df.index[0], df.index[-1], len(df),
+            float(last["Close"]), float(last.get("Volume", 0)))
+
+
+def figure_key(report, df, **options):
+    """(리포트 종류, 종목, 데이터 버전, 옵션) 캐시 키 - 테마는 get_themed 에서 덧붙임"""
+    return (report, df.attrs.get("ticker"), data_signature(df),
+            tuple(sorted(options.items())))
+
+
+class FigureCache:
+    """
+    figure 객체 LRU 캐시
+    크기는 브라우저로 보내는 JSON 직렬화 길이로 계산합니다 (삽입 시 1회).
+    """
+
+    def __init__(self, max_mb=FIGURE_CACHE_MB, max_entries=FIGURE_CACHE_ENTRIES):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self.evictions = 0
+        self.derived = 0  # 재구성 없이 테마만 바꿔 만든 figure 수
+        self.bytes = 0
+        self._entries = OrderedDict()  # key → (figure, 크기)
+        self._lock = threading.Lock()
+        self.inflight = SingleFlight()  # 여러 세션이 같은 figure 를 동시에 만들지 않도록
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            self.stats.record_lookup()
+            if entry is None:
+                self.stats.record_miss()
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def peek(self, key):
+        """통계/LRU 순서에 영향 없이 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry
+
+    @staticmethod
+    @timed("build")
+    def _build(build, *args, **kwargs):
+        return build(*args, **kwargs)
+
+    def put(self, key, fig, size=None):
+        if size is None:
+            with span("serialize"):
+                size = len(pio.to_json(fig, validate=False))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (fig, size)
+            self.bytes += size
+            # 가장 오래 쓰지 않은 figure 부터 제거 (방금 넣은 figure 는 유지)
+            while len(self._entries) > 1 and (
+                self.bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return fig
+
+    def get_or_build(self, key, build, *args, **kwargs):
+        """캐시에 없으면 build(*args, **kwargs) 로 만들어 저장"""
+        if key is None or None in key[1:3]:  # 종목/데이터를 알 수 없으면 캐시하지 않음
+            return self._build(build, *args, **kwargs)
+        fig = self.get(key)
+        if fig is None:
+            fig = self.inflight.do(key, lambda: self.put(key, self._build(build, *args, **kwargs)))
+        return fig
+
+    def get_themed(self, key, template, build, *args, **kwargs):
+        """
+        template 테마의 figure
+        캐시에 없으면 다른 테마로 캐시된 같은 figure 에서 색만 바꿔 만들고,
+        그것도 없으면 build(*args, template=template, **kwargs) 로 새로 만듭니다.
+        """
+        if key is None or None in key[1:3]:
+            return self._build(build, *args, template=template, **kwargs)
+        themed_key = key + (template,)
+        fig = self.get(themed_key)
+        if fig is not None:
+            return fig
+
+        for source in THEMES:
+            entry = self.peek(key + (source,)) if source != template else None
+            if entry is not None:
+                self.derived += 1
+                with span("theme"):
+                    themed = apply_theme(entry[0], source, template)
+                return self.put(themed_key, themed, size=entry[1])
+        return self.inflight.do(
+            themed_key, lambda: self.put(themed_key, self._build(build, *args, template=template, **kwargs))
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __str__(self):
+        return (f"{self.stats} · {len(self._entries)}개 "
+                f"{self.bytes / 1024 / 1024:.1f}/{self.max_bytes / 1024 / 1024:.0f}MB · "
+                f"테마 파생 {self.derived}건 · 제거 {self.evictions}건")
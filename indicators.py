@@ -0,0 +1,438 @@
+"""
+지표 계산 엔진 (Indicator Engine)
+대시보드 빌더들이 공통으로 쓰는 지표를 한 번에(single pass) 계산합니다.
+- 이동평균/표준편차는 누적합(cumsum) 한 번으로 모든 윈도우를 계산
+- 윈도우 합/개수/평균/표준편차는 윈도우 길이별로 한 번만 계산 → MA20, STD20, BB20 이 spec 순서와 관계없이 공유
+- 결과는 (종목, 구간, spec) 단위로 메모이제이션 → 재실행/테마 변경 시 재계산 없음
+- 같은 종목의 구간이 뒤로 늘어나거나 마지막 일봉만 바뀌면 (장중 갱신)
+  IndicatorState 가 새 일봉만 O(1) 로 반영 → 전체 이력 재계산 없음
+
+spec 은 지표 이름의 목록입니다.
+    MA{n}   n일 이동평균                     → MA{n}
+    STD{n}  n일 종가 표준편차                 → STD{n}
+    BB{n}   n일 볼린저밴드 (±2σ)              → MA{n}, STD{n}, BB{n}_Upper, BB{n}_Lower
+    RET     일간 수익률 (소수)                → Return
+    VOL{n}  일간 수익률(%)의 n일 표준편차      → VOL{n}
+    DD      고점 대비 낙폭 (%)                → Cummax, Drawdown (최대 낙폭은 attrs['MDD'])
+    CUMRET  시작가 대비 누적 수익률 (%)        → Cum_Return
+"""
+import math
+import re
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+from timing import timed
+
+BB_K = 2  # 볼린저밴드 표준편차 배수
+MEMO_SIZE = 64  # 메모이제이션 최대 항목 수
+
+_SPEC_RE = re.compile(r"^(MA|STD|BB|VOL)(\d+)$|^(RET|DD|CUMRET)$")
+
+
+def normalize_spec(spec):
+    """spec 검증 및 정규화 (중복 제거, 정렬된 tuple)"""
+    names = {name.upper() for name in spec}
+    for name in names:
+        if not _SPEC_RE.match(name):
+            raise ValueError(f"알 수 없는 지표: {name}")
+    return tuple(sorted(names))
+
+
+def _cumsum0(values):
+    """앞에 0 을 붙인 누적합 - 윈도우 합 = cs[i + 1] - cs[i + 1 - n]"""
+    out = np.empty(len(values) + 1)
+    out[0] = 0.0
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+class RollingKernel:
+    """
+    누적합 기반 이동 윈도우 계산기 (한 시계열당 1개, 누적합은 최초 1회만 계산)
+    NaN 이 포함된 윈도우는 pandas rolling 과 같이 NaN 으로 처리합니다.
+    윈도우 합과 평균/표준편차는 윈도우 길이별로 캐시 - 같은 n 을 여러 지표가 요청해도 한 번만 계산합니다.
+    """
+
+    def __init__(self, values):
+        x = np.asarray(values, dtype=np.float64)
+        self.valid = ~np.isnan(x)
+        # 수치 안정성을 위해 평균을 뺀 값으로 누적
+        self.shift = float(x[self.valid].mean()) if self.valid.any() else 0.0
+        self.z = np.where(self.valid, x - self.shift, 0.0)
+        self._count = _cumsum0(self.valid)
+        self._s1 = _cumsum0(self.z)
+        self._s2 = None  # 표준편차가 필요할 때만 계산
+        self._sums = {}  # n → (윈도우가 유효값으로 꽉 찼는지, 윈도우 합)
+        self._mean = {}
+        self._std = {}
+
+    def _window(self, cs, n):
+        out = np.full(len(cs) - 1, np.nan)
+        if n <= len(out):
+            out[n - 1:] = cs[n:] - cs[:-n]
+        return out
+
+    def _sum(self, n):
+        if n not in self._sums:
+            self._sums[n] = (self._window(self._count, n) == n, self._window(self._s1, n))
+        return self._sums[n]
+
+    def mean(self, n):
+        if n not in self._mean:
+            full, s1 = self._sum(n)
+            self._mean[n] = np.where(full, s1 / n + self.shift, np.nan)
+        return self._mean[n]
+
+    def std(self, n):
+        """표본 표준편차 (ddof=1, pandas rolling.std 와 동일)"""
+        if n < 2:
+            return np.full(len(self.z), np.nan)
+        if n not in self._std:
+            if self._s2 is None:
+                self._s2 = _cumsum0(self.z * self.z)
+            full, s1 = self._sum(n)
+            s2 = self._window(self._s2, n)
+            var = np.maximum((s2 - s1 * s1 / n) / (n - 1), 0.0)
+            self._std[n] = np.where(full, np.sqrt(var), np.nan)
+        return self._std[n]
+
+
+def _pct_change(x):
+    out = np.full(len(x), np.nan)
+    out[1:] = x[1:] / x[:-1] - 1
+    return out
+
+
+def _compute(close, spec):
+    """numpy 배열 → {컬럼명: 배열}"""
+    out = {}
+    price = RollingKernel(close)
+    ret = None
+    for name in spec:
+        kind, n = re.match(r"([A-Z]+)(\d*)$", name).groups()
+        n = int(n) if n else None
+
+        if kind == "MA":
+            out[name] = price.mean(n)
+        elif kind == "STD":
+            out[name] = price.std(n)
+        elif kind == "BB":
+            mid = out[f"MA{n}"] = price.mean(n)
+            std = out[f"STD{n}"] = price.std(n)
+            out[f"BB{n}_Upper"] = mid + BB_K * std
+            out[f"BB{n}_Lower"] = mid - BB_K * std
+        elif kind in ("RET", "VOL"):
+            if ret is None:
+                ret = _pct_change(close)
+                out["Return"] = ret
+            if kind == "VOL":
+                out[name] = RollingKernel(ret * 100).std(n)
+        elif kind == "DD":
+            cummax = np.fmax.accumulate(close)
+            out["Cummax"] = cummax
+            out["Drawdown"] = (close - cummax) / cummax * 100
+        elif kind == "CUMRET":
+            out["Cum_Return"] = (close / close[0] - 1) * 100
+
+    if "RET" not in spec:
+        out.pop("Return", None)
+    return out
+
+
+# -----------------------------------------------------------------------------
+# 증분 계산 (Incremental State)
+# -----------------------------------------------------------------------------
+class RollingStat:
+    """
+    n일 이동 평균/표준편차 상태 (Welford 방식, 일봉 추가/마지막 일봉 교체 O(1))
+    NaN 은 윈도우에 자리만 차지하고 통계에서는 제외 - 윈도우가 유효값으로 꽉 찼을 때만 값이 나옵니다.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.window = deque(maxlen=n)
+        self.count = 0   # 윈도우 안 유효값 개수
+        self.mean_ = 0.0
+        self.m2 = 0.0    # 편차 제곱합
+
+    def _add(self, x):
+        if math.isnan(x):
+            return
+        self.count += 1
+        delta = x - self.mean_
+        self.mean_ += delta / self.count
+        self.m2 += delta * (x - self.mean_)
+
+    def _remove(self, x):
+        if math.isnan(x):
+            return
+        if self.count <= 1:
+            self.count, self.mean_, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean_
+        self.count -= 1
+        self.mean_ = (old_mean * (self.count + 1) - x) / self.count
+        self.m2 = max(self.m2 - (x - old_mean) * (x - self.mean_), 0.0)
+
+    def append(self, x):
+        if len(self.window) == self.n:
+            self._remove(self.window[0])
+        self.window.append(x)
+        self._add(x)
+
+    def replace_last(self, x):
+        self._remove(self.window[-1])
+        self.window[-1] = x
+        self._add(x)
+
+    @property
+    def full(self):
+        return self.count == self.n
+
+    def mean(self):
+        return self.mean_ if self.full else np.nan
+
+    def std(self):
+        """표본 표준편차 (ddof=1)"""
+        if not self.full or self.n < 2:
+            return np.nan
+        return math.sqrt(self.m2 / (self.n - 1))
+
+
+class RunningDrawdown:
+    """고점(running max)과 최대 낙폭(MDD) 상태 - 마지막 일봉 교체를 위해 직전 값을 보관"""
+
+    def __init__(self):
+        self.cummax = np.nan
+        self.drawdown = np.nan
+        self.mdd = np.nan
+        self._prev = (np.nan, np.nan)
+
+    def append(self, x):
+        self._prev = (self.cummax, self.mdd)
+        self._update(x)
+
+    def replace_last(self, x):
+        self.cummax, self.mdd = self._prev
+        self._update(x)
+
+    def _update(self, x):
+        self.cummax = np.fmax(self.cummax, x)
+        self.drawdown = (x - self.cummax) / self.cummax * 100
+        self.mdd = np.fmin(self.mdd, self.drawdown)
+
+
+class IndicatorState:
+    """
+    spec 전체의 증분 계산 상태 - _compute 와 같은 컬럼을 일봉 1개 단위로 계산합니다.
+    append(close) / replace_last(close) 는 새 행의 {컬럼명: 값} 을 반환합니다.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.first = np.nan      # 첫 종가 (누적 수익률 기준)
+        self.last = np.nan       # 마지막 종가
+        self._prev_close = np.nan  # 마지막 직전 종가 (수익률 계산용)
+        self.price = {}          # 윈도우 → 종가 RollingStat
+        self.vol = {}            # 윈도우 → 수익률(%) RollingStat
+        self.dd = None
+        for name in spec:
+            kind, n = re.match(r"([A-Z]+)(\d*)$", name).groups()
+            if kind in ("MA", "STD", "BB"):
+                self.price.setdefault(int(n), RollingStat(int(n)))
+            elif kind == "VOL":
+                self.vol.setdefault(int(n), RollingStat(int(n)))
+            elif kind == "DD":
+                self.dd = RunningDrawdown()
+
+    @classmethod
+    def from_history(cls, close, spec):
+        """
+        과거 종가로 상태 복원 - 이동 윈도우는 마지막 (가장 긴 윈도우 + 1)개만 흘려 넣고,
+        고점/MDD 는 전체 이력이 필요하므로 벡터 연산으로 한 번에 계산합니다.
+        """
+        state = cls(spec)
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) == 0:
+            return state
+        state.first = float(close[0])
+        start = max(len(close) - max([*state.price, *state.vol, 0]) - 1, 0)
+        if start > 0:
+            state.last = float(close[start - 1])
+        for x in close[start:]:
+            state._push(x)
+
+        if state.dd is not None:
+            cummax = np.fmax.accumulate(close)
+            drawdown = (close - cummax) / cummax * 100
+            state.dd.cummax, state.dd.drawdown = cummax[-1], drawdown[-1]
+            state.dd.mdd = np.fmin.reduce(drawdown)
+            if len(close) > 1:
+                state.dd._prev = (cummax[-2], np.fmin.reduce(drawdown[:-1]))
+        return state
+
+    def _push(self, close):
+        self._prev_close, self.last = self.last, close
+        ret = close / self._prev_close - 1
+        for stat in self.price.values():
+            stat.append(close)
+        for stat in self.vol.values():
+            stat.append(ret * 100)
+
+    def append(self, close):
+        close = float(close)
+        if math.isnan(self.first):
+            self.first = close
+        self._push(close)
+        if self.dd is not None:
+            self.dd.append(close)
+        return self.row()
+
+    def replace_last(self, close):
+        close = float(close)
+        self.last = close
+        ret = close / self._prev_close - 1
+        for stat in self.price.values():
+            stat.replace_last(close)
+        for stat in self.vol.values():
+            stat.replace_last(ret * 100)
+        if self.dd is not None:
+            self.dd.replace_last(close)
+        return self.row()
+
+    def row(self):
+        out = {}
+        for name in self.spec:
+            kind, n = re.match(r"([A-Z]+)(\d*)$", name).groups()
+            n = int(n) if n else None
+            if kind == "MA":
+                out[name] = self.price[n].mean()
+            elif kind == "STD":
+                out[name] = self.price[n].std()
+            elif kind == "BB":
+                mid, std = self.price[n].mean(), self.price[n].std()
+                out[f"MA{n}"], out[f"STD{n}"] = mid, std
+                out[f"BB{n}_Upper"] = mid + BB_K * std
+                out[f"BB{n}_Lower"] = mid - BB_K * std
+            elif kind == "RET":
+                out["Return"] = self.last / self._prev_close - 1
+            elif kind == "VOL":
+                out[name] = self.vol[n].std()
+            elif kind == "DD":
+                out["Cummax"] = self.dd.cummax
+                out["Drawdown"] = self.dd.drawdown
+            elif kind == "CUMRET":
+                out["Cum_Return"] = (self.last / self.first - 1) * 100
+        return out
+
+
+# -----------------------------------------------------------------------------
+# 메모이제이션 (Memoization)
+# -----------------------------------------------------------------------------
+INCREMENTAL_MAX = 32  # 이보다 많은 일봉이 새로 붙으면 증분 대신 전체를 벡터 연산으로 재계산
+
+_memo = OrderedDict()
+_tails = OrderedDict()  # (종목, 시작일, spec) → (가장 최근 결과, IndicatorState)
+_memo_lock = threading.Lock()
+
+
+def _memo_key(df, spec):
+    """
+    (종목, 구간, spec) 키 - 종목은 데이터 로더가 df.attrs['ticker'] 에 기록합니다.
+    장중 갱신으로 마지막 일봉이 바뀌면 키도 바뀌도록 마지막 종가/거래량을 포함합니다.
+    """
+    ticker = df.attrs.get("ticker")
+    if ticker is None or df.empty:
+        return None
+    last = df.iloc[-1]
+    return (ticker, df.index[0], df.index[-1], len(df),
+            float(last["Close"]), float(last.get("Volume", 0)), spec)
+
+
+def _same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def _extend(df, close, tail_key):
+    """
+    같은 (종목, 시작일, spec) 의 이전 결과에서 이어서 계산 (호출자가 _memo_lock 보유)
+    이전 결과의 마지막 일봉이 바뀌었으면 교체, 이후 일봉은 추가. 이어 붙일 수 없으면 None.
+    """
+    entry = _tails.get(tail_key)
+    if entry is None:
+        return None
+    result, state = entry
+    m = len(result)
+    if not (m <= len(df) <= m + INCREMENTAL_MAX) or df.index[m - 1] != result.index[-1]:
+        return None
+
+    rows = []
+    base = result
+    if not _same(close[m - 1], state.last):
+        # 장중 갱신 - 직전 일봉까지는 그대로여야 교체 가능
+        if m < 2 or not _same(close[m - 2], state._prev_close):
+            return None
+        rows.append(state.replace_last(close[m - 1]))
+        base = result.iloc[:-1]
+    for x in close[m:]:
+        rows.append(state.append(x))
+    if not rows:
+        return result
+
+    extended = pd.concat([base, pd.DataFrame(rows, index=df.index[len(base):], columns=result.columns)])
+    if state.dd is not None:
+        extended.attrs["MDD"] = float(state.dd.mdd)  # 증분 상태의 MDD - 이력 재탐색 없음
+    _tails[tail_key] = (extended, state)
+    return extended
+
+
+@timed("indicators")
+def compute_indicators(df, spec):
+    """
+    spec 에 선언된 지표를 한 번에 계산해 DataFrame(df 와 같은 인덱스)으로 반환
+    DD 가 있으면 최대 낙폭(%)을 attrs['MDD'] 에 기록합니다. (이어 붙인 결과는 증분 상태에서 O(1))
+    결과는 메모이제이션되어 여러 호출이 공유하므로 제자리 수정하지 마세요.
+    """
+    spec = normalize_spec(spec)
+    key = _memo_key(df, spec)
+    if key is None:
+        result = pd.DataFrame(_compute(df["Close"].to_numpy(dtype=np.float64), spec), index=df.index)
+        if "DD" in spec:
+            result.attrs["MDD"] = float(np.fmin.reduce(result["Drawdown"].to_numpy()))
+        return result
+
+    close = df["Close"].to_numpy(dtype=np.float64)
+    tail_key = (key[0], key[1], spec)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+        result = _extend(df, close, tail_key)
+
+    if result is None:
+        result = pd.DataFrame(_compute(close, spec), index=df.index)
+        state = IndicatorState.from_history(close, spec)
+        if state.dd is not None:
+            result.attrs["MDD"] = float(state.dd.mdd)
+        with _memo_lock:
+            previous = _tails.get(tail_key)
+            if previous is None or previous[0].index[-1] <= result.index[-1]:
+                _tails[tail_key] = (result, state)
+                _tails.move_to_end(tail_key)
+
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+        while len(_tails) > MEMO_SIZE:
+            _tails.popitem(last=False)
+    return result
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+        _tails.clear()
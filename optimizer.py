@@ -0,0 +1,209 @@
+"""
+파라미터 스윕 최적화 (Parameter Sweep Optimizer)
+시그널 분위수 임계값과 이동평균 기간 조합을 관심 종목 전체에 백테스트하고 지표 순으로 정렬합니다.
+
+- 한 종목의 파라미터 격자 전체를 (조합 × 날짜) 배열 하나로 만들어 backtest.simulate/summarize 로 한 번에 계산
+  (이동평균/분위수는 기간·분위수별로 한 번만 계산해 조합끼리 공유)
+- 종목은 프로세스 풀에 나눠 병렬 처리 (scanner.py 와 같은 spawn 컨텍스트)
+- 격자가 크면 GRID_BLOCK 개씩 나눠 계산해 메모리 사용량을 제한
+
+실행 예) python optimizer.py --strategy ma_cross --top 20
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from backtest import FEE, SLIPPAGE, STRATEGIES, TAX, positions, simulate, summarize
+from data_store import STORE_DIR, OHLCVStore
+from panel import Panel
+from scanner import EXCLUDE
+from signals import pct_change
+
+GRID_BLOCK = 250  # 한 번에 계산하는 조합 수 (조합 × 날짜 배열 크기 제한)
+
+# 기본 격자 - ma_cross 는 fast < slow 인 조합만 사용 (약 1,000개)
+DEFAULT_GRIDS = {
+    "ma_cross": {"fast": list(range(3, 43)), "slow": list(range(20, 270, 10))},
+    "supply": {"q_ret": [round(0.80 + 0.01 * i, 2) for i in range(20)],
+               "q_vol": [round(0.50 + 0.05 * i, 2) for i in range(10)]},
+}
+DEFAULT_GRIDS["large_move"] = DEFAULT_GRIDS["supply"]
+
+# 종목 간 집계 방법 (지표 → 집계 함수)
+AGGREGATE = {
+    "Sharpe Ratio": "mean",
+    "Total Return": "median",
+    "Ann Return": "mean",
+    "Max Drawdown": "mean",
+    "Win Rate": "mean",
+    "P/L Ratio": "mean",
+    "Trades": "mean",
+}
+
+
+def param_grid(strategy, grid=None):
+    """격자 정의 → 조합 DataFrame (행 = 조합)"""
+    grid = grid or DEFAULT_GRIDS[strategy]
+    combos = pd.DataFrame(list(itertools.product(*grid.values())), columns=list(grid))
+    if strategy == "ma_cross":
+        combos = combos[combos["fast"] < combos["slow"]].reset_index(drop=True)
+    return combos
+
+
+# -----------------------------------------------------------------------------
+# 격자 상태 (Grid States) - 반환 shape (조합 × 날짜)
+# -----------------------------------------------------------------------------
+def _ma_states(close, combos):
+    """
+    모든 기간의 이동평균을 누적합 하나에서 한 번에 계산한 뒤 (fast, slow) 조합별 보유 상태
+    (윈도우 안에 빈 날이 있으면 NaN - backtest.moving_average 와 동일)
+    """
+    windows = np.unique(np.r_[combos["fast"], combos["slow"]])
+    valid = ~np.isnan(close)
+    total = np.r_[0.0, np.cumsum(np.where(valid, close, 0.0))]
+    count = np.r_[0, np.cumsum(valid)]
+    end = np.arange(1, len(close) + 1)[None, :]
+    start = end - windows[:, None]
+    full = start >= 0
+    start = np.maximum(start, 0)
+    with np.errstate(invalid="ignore"):
+        ma = np.where(full & (count[end] - count[start] == windows[:, None]),
+                      (total[end] - total[start]) / windows[:, None], np.nan)
+    row = {w: i for i, w in enumerate(windows)}
+    fast = ma[[row[w] for w in combos["fast"]]]
+    slow = ma[[row[w] for w in combos["slow"]]]
+    with np.errstate(invalid="ignore"):
+        return fast > slow
+
+
+def _signal_states(close, volume, combos, strategy):
+    """
+    분위수별 임계값을 한 번에 계산한 뒤 (q_ret, q_vol) 조합별 보유 상태
+    매수: 거래량 ≥ q_vol 분위수 & 수익률 ≥ q_ret 분위수 / 매도: 거래량 조건 & 수익률 ≤ (1 - q_ret) 분위수
+    수익률은 직전 일봉 대비 (signals.pct_change), large_move 는 수익률/거래량이 모두 있는 날만으로 분위수 계산
+    (q_ret == q_vol 이면 signals.detect_supply_signals / detect_large_moves 와 동일)
+    """
+    ret = pct_change(close)
+    if strategy == "large_move":
+        valid = ~np.isnan(ret) & ~np.isnan(volume)
+        ret_q, vol_q = np.where(valid, ret, np.nan), np.where(valid, volume, np.nan)
+    else:
+        ret_q, vol_q = ret, volume
+
+    q_ret = combos["q_ret"].to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN slice
+        up = np.nanquantile(ret_q, q_ret)[:, None]
+        down = np.nanquantile(ret_q, 1 - q_ret)[:, None]
+        vol_th = np.nanquantile(vol_q, combos["q_vol"].to_numpy())[:, None]
+    with np.errstate(invalid="ignore"):
+        heavy = volume[None, :] >= vol_th
+        return positions(heavy & (ret[None, :] >= up), heavy & (ret[None, :] <= down))
+
+
+def sweep_ticker(close, volume, strategy, combos, fee=FEE, slippage=SLIPPAGE, tax=TAX):
+    """
+    종목 1개에 대한 격자 전체 백테스트
+    반환: {지표: (조합,) 배열} - 상장 전/이후 빈 구간은 잘라내고 계산
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    has_bar = np.flatnonzero(~np.isnan(close))
+    if len(has_bar) < 2:
+        return None
+    close = close[has_bar[0]:has_bar[-1] + 1]
+    volume = volume[has_bar[0]:has_bar[-1] + 1]
+
+    parts = []
+    for lo in range(0, len(combos), GRID_BLOCK):
+        block = combos.iloc[lo:lo + GRID_BLOCK]
+        if strategy == "ma_cross":
+            state = _ma_states(close, block)
+        else:
+            state = _signal_states(close, volume, block, strategy)
+        parts.append(summarize(simulate(close, state, fee, slippage, tax), state))
+    return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+
+def _sweep_job(strategy, combos, item):
+    """프로세스 풀 작업 단위 (ticker, close, volume) → (ticker, 지표)"""
+    ticker, close, volume = item
+    return ticker, sweep_ticker(close, volume, strategy, combos)
+
+
+def rank_combos(combos, results, metric="Sharpe Ratio"):
+    """종목별 결과를 조합별로 집계 (AGGREGATE) 해 metric 내림차순 정렬"""
+    table = combos.copy()
+    for key, how in AGGREGATE.items():
+        values = np.vstack([r[key] for r in results.values()])  # (종목 × 조합)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # Mean of empty slice
+            table[key] = np.nanmedian(values, axis=0) if how == "median" else np.nanmean(values, axis=0)
+    table["Tickers"] = len(results)
+    return table.sort_values(metric, ascending=False).reset_index(drop=True)
+
+
+def optimize(panel, strategy="ma_cross", grid=None, metric="Sharpe Ratio", workers=None):
+    """
+    패널의 모든 종목에 대해 격자 탐색
+    반환: (조합별 순위표, {ticker: 종목별 지표}) - workers=1 이면 현재 프로세스에서 순차 실행
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"알 수 없는 전략: {strategy} (지원: {', '.join(STRATEGIES)})")
+    combos = param_grid(strategy, grid)
+    close = np.asarray(panel["Close"], dtype=np.float64)
+    volume = np.asarray(panel["Volume"], dtype=np.float64)
+    volume[np.isnan(close)] = np.nan  # 패널의 빈 날 거래량(0)은 분위수 계산에서 제외 (scanner 와 동일)
+    items = [(t, close[i], volume[i]) for i, t in enumerate(panel.tickers) if t not in EXCLUDE]
+    if not items:
+        return combos, {}
+
+    job = partial(_sweep_job, strategy, combos)
+    workers = workers or min(len(items), os.cpu_count() or 1)
+    if workers == 1:
+        pairs = [job(item) for item in items]
+    else:
+        # Streamlit 서버처럼 스레드가 있는 프로세스에서도 안전하도록 spawn 사용
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            pairs = list(pool.map(job, items))
+    results = {t: r for t, r in pairs if r is not None}
+    if not results:
+        return combos, {}
+    return rank_combos(combos, results, metric), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시그널 임계값/이동평균 기간 격자 탐색")
+    parser.add_argument("tickers", nargs="*", help="생략하면 저장소(또는 패널)의 모든 종목")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="ma_cross")
+    parser.add_argument("--metric", choices=list(AGGREGATE), default="Sharpe Ratio")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--panel", default=None, help="패널 경로 (python panel.py build 로 생성)")
+    args = parser.parse_args()
+
+    if args.panel:
+        panel = Panel.load(args.panel).select(args.tickers or None, args.start, args.end)
+    else:
+        panel = Panel.from_store(OHLCVStore(args.store), args.tickers or None, args.start, args.end)
+    table, results = optimize(panel, args.strategy, metric=args.metric, workers=args.workers)
+    if not results:
+        print("데이터가 있는 종목이 없습니다")
+        return
+    print(f"{len(table)}개 조합 × {len(results)}개 종목 ({args.strategy}, {args.metric} 순)")
+    print(table.head(args.top).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+다종목 패널 (Multi-Ticker Panel)
+여러 종목의 일봉을 공통 날짜 인덱스에 맞춘 (종목 × 날짜) 배열로 보관합니다.
+
+- 가격(Open/High/Low/Close) float32, 거래량 uint32 (범위를 넘으면 int64) → float64 DataFrame 대비 약 1/2
+- 디스크에는 필드별 .npy 로 저장하고 np.load(mmap_mode='r') 로 열어 필요한 부분만 페이지 단위로 읽음
+  (프로세스 풀의 작업자들이 같은 파일을 열면 OS 페이지 캐시를 공유)
+- frame(ticker) 는 일봉이 있는 날만 담은 DataFrame 을 반환 (빈 날이 없으면 복사 없이 배열의 한 행을 참조)
+  → 기존 차트 빌더에 그대로 전달
+
+실행 예) python panel.py build .data/panel --start 2015-01-01
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_store import STORE_DIR, OHLCVStore, to_day
+
+PRICE_FIELDS = ["Open", "High", "Low", "Close"]
+FIELDS = PRICE_FIELDS + ["Volume"]
+PANEL_DIR = os.path.join(os.path.dirname(STORE_DIR), "panel")
+
+
+class Panel:
+    """
+    (종목 × 날짜) 배열 묶음
+    values[field] 는 shape (len(tickers), len(dates)) 이며, 값이 없는 날은 가격 NaN / 거래량 0 입니다.
+    """
+
+    def __init__(self, tickers, dates, values):
+        self.tickers = list(tickers)
+        self.dates = pd.DatetimeIndex(dates)
+        self.values = values
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._rows
+
+    def __repr__(self):
+        return f"Panel({len(self.tickers)} tickers × {len(self.dates)} dates, {self.nbytes / 1024 / 1024:.1f}MB)"
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self.values.values())
+
+    def __getitem__(self, field):
+        return self.values[field]
+
+    # -------------------------------------------------------------------------
+    # 생성 (Build)
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_frames(cls, frames):
+        """{ticker: OHLCV DataFrame} → Panel (날짜는 합집합)"""
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        if not frames:
+            return cls([], pd.DatetimeIndex([]), {f: np.empty((0, 0), np.float32) for f in FIELDS})
+        dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+
+        values = {f: np.full((len(frames), len(dates)), np.nan, np.float32) for f in PRICE_FIELDS}
+        volume = np.zeros((len(frames), len(dates)), np.int64)
+        for i, df in enumerate(frames.values()):
+            pos = dates.get_indexer(df.index)
+            for f in PRICE_FIELDS:
+                values[f][i, pos] = df[f].to_numpy(dtype=np.float32)
+            volume[i, pos] = df["Volume"].fillna(0).to_numpy(dtype=np.int64)
+        values["Volume"] = volume.astype(np.uint32) if volume.max(initial=0) <= np.iinfo(np.uint32).max else volume
+        return cls(frames.keys(), dates, values)
+
+    @classmethod
+    def from_store(cls, store=None, tickers=None, start=None, end=None):
+        """로컬 저장소에서 패널 생성 (tickers 생략 시 저장소 전체)"""
+        store = store or OHLCVStore()
+        tickers = store.tickers() if tickers is None else tickers
+        frames = {}
+        for ticker in tickers:
+            df, _ = store.read(ticker, columns=FIELDS)
+            if df.empty:
+                continue
+            frames[ticker] = df.loc[to_day(start) if start else None:to_day(end) if end else None]
+        return cls.from_frames(frames)
+
+    # -------------------------------------------------------------------------
+    # 저장/열기 (Persist / Memory-Map)
+    # -------------------------------------------------------------------------
+    def save(self, path=PANEL_DIR):
+        """필드별 .npy + meta.json 으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(path, exist_ok=True)
+        for field, arr in self.values.items():
+            tmp = os.path.join(path, field + ".tmp.npy")
+            np.save(tmp, np.ascontiguousarray(arr))
+            os.replace(tmp, os.path.join(path, field + ".npy"))
+        np.save(os.path.join(path, "dates.npy"), self.dates.to_numpy(dtype="datetime64[ns]"))
+        with open(os.path.join(path, "meta.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump({"tickers": self.tickers, "fields": list(self.values)}, f)
+        os.replace(os.path.join(path, "meta.json.tmp"), os.path.join(path, "meta.json"))
+
+    @classmethod
+    def load(cls, path=PANEL_DIR, mmap=True):
+        """저장된 패널 열기 - mmap=True 면 읽기 전용 메모리 맵 (실제로 접근한 부분만 메모리에 올라감)"""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        values = {field: np.load(os.path.join(path, field + ".npy"), mmap_mode=mode)
+                  for field in meta["fields"]}
+        dates = pd.DatetimeIndex(np.load(os.path.join(path, "dates.npy")))
+        return cls(meta["tickers"], dates, values)
+
+    # -------------------------------------------------------------------------
+    # 조회 (Views)
+    # -------------------------------------------------------------------------
+    def row(self, ticker):
+        return self._rows[ticker]
+
+    def select(self, tickers=None, start=None, end=None):
+        """종목/기간 부분 패널 - 종목이 연속 구간이면 복사 없이 view"""
+        cols = slice(*self.dates.slice_locs(to_day(start) if start else None, to_day(end) if end else None))
+        if tickers is None:
+            rows = slice(None)
+            tickers = self.tickers
+        else:
+            rows = [self._rows[t] for t in tickers]
+            if not rows:
+                rows = slice(0, 0)
+            elif rows == list(range(rows[0], rows[-1] + 1)):
+                rows = slice(rows[0], rows[-1] + 1)
+        return Panel(tickers, self.dates[cols], {f: arr[rows, cols] for f, arr in self.values.items()})
+
+    def frame(self, ticker, start=None, end=None):
+        """
+        종목 1개의 OHLCV DataFrame - 일봉이 있는 날만 (중간에 빈 날이 없으면 복사 없이 패널 배열을 그대로 참조)
+        공통 날짜 중 해당 종목의 일봉이 없는 날(상장 전/이후, 거래정지 등)은 제외하며, attrs['ticker'] 를 기록합니다.
+        """
+        i = self._rows[ticker]
+        lo, hi = self.dates.slice_locs(to_day(start) if start else None, to_day(end) if end else None)
+        has_bar = ~np.isnan(self.values["Close"][i, lo:hi])
+        if has_bar.all():
+            cols = slice(lo, hi)
+        elif has_bar.any():
+            cols = lo + np.flatnonzero(has_bar)
+            if cols[-1] - cols[0] + 1 == len(cols):  # 앞뒤 구간만 비어 있으면 view
+                cols = slice(cols[0], cols[-1] + 1)
+        else:
+            cols = slice(lo, lo)
+        df = pd.DataFrame(
+            {f: self.values[f][i, cols] for f in FIELDS if f in self.values},
+            index=self.dates[cols], copy=False
+        )
+        df.index.name = "Date"
+        df.attrs["ticker"] = ticker
+        return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 저장소 → 다종목 패널 (.npy, 메모리 맵)")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("path", nargs="?", default=PANEL_DIR)
+    parser.add_argument("tickers", nargs="*", help="생략하면 저장소의 모든 종목")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        panel = Panel.from_store(OHLCVStore(args.store), args.tickers or None, args.start, args.end)
+        panel.save(args.path)
+    else:
+        panel = Panel.load(args.path)
+    print(f"{panel} -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+재실행 프로파일러 (Per-Rerun Profiler)
+요청한 세션의 재실행 한 번만 프로파일링해 내려받을 수 있는 결과로 만듭니다.
+
+- sampling : 별도 스레드가 SAMPLE_INTERVAL 마다 해당 세션 스크립트 스레드의 스택만 읽어 집계
+             → collapsed stack(.folded) 파일 (speedscope / flamegraph.pl 로 플레임 그래프)
+             다른 스레드에는 훅을 걸지 않으므로 다른 사용자의 실행 속도에 영향 없음
+- cprofile : cProfile 결정적 프로파일링 → .prof 파일 (snakeviz, pstats)
+             Python 3.12+ 의 cProfile 은 인터프리터 전체(sys.monitoring)에 걸리므로 3.11 이하에서만 사용
+
+기본값은 꺼짐 - 앱에서 사이드바 버튼이나 ?profile=1 로 요청한 재실행만 측정합니다.
+"""
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+SAMPLE_INTERVAL = 0.005   # 샘플링 간격 (초)
+MAX_SECONDS = 120         # 스크립트가 중간에 끝나 stop() 이 불리지 않아도 이 시간 후 샘플링 종료
+TOP_FUNCTIONS = 25
+
+# 세션별 격리가 보장되는 방식만 제공 (cProfile 은 스레드별 훅인 3.11 이하)
+MODES = {"sampling": "샘플링 (플레임 그래프 .folded)"}
+if sys.version_info < (3, 12):
+    MODES["cprofile"] = "cProfile (결정적, .prof)"
+
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """호출한 스레드의 스택을 주기적으로 샘플링 (collapsed stack 집계)"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, max_seconds=MAX_SECONDS):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.target = threading.get_ident()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        deadline = self.started + self.max_seconds
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.target)
+            if frame is None:  # 스크립트 스레드 종료
+                break
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def folded(self):
+        """collapsed stack 형식 ("a;b;c 샘플수" 줄) - speedscope, flamegraph.pl 입력"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def top(self, limit=TOP_FUNCTIONS):
+        """함수별 self/total 샘플 비율 (%) 상위 limit 개"""
+        self_counts, total_counts = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for name in set(frames):
+                total_counts[name] += count
+        table = pd.DataFrame({"self_%": pd.Series(self_counts), "total_%": pd.Series(total_counts)}).fillna(0)
+        table = table * 100 / max(self.samples, 1)
+        return table.sort_values(["self_%", "total_%"], ascending=False).head(limit)
+
+
+class DeterministicProfiler:
+    """cProfile 래퍼 - 호출한 스레드만 측정 (Python 3.11 이하)"""
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        return self
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self.started
+        self.stats = pstats.Stats(self.profile)
+        self.samples = self.stats.total_calls
+        return self
+
+    def dump(self):
+        """.prof 파일 내용 (pstats.Stats.dump_stats 와 같은 marshal 형식)"""
+        return marshal.dumps(self.stats.stats)
+
+    def top(self, limit=TOP_FUNCTIONS):
+        """함수별 호출 수 / 자체 시간 / 누적 시간 (ms) - 누적 시간 상위 limit 개"""
+        rows = {
+            f"{name} ({os.path.basename(path)}:{line})": {
+                "calls": nc, "self_ms": tt * 1000, "total_ms": ct * 1000,
+            }
+            for (path, line, name), (cc, nc, tt, ct, callers) in self.stats.stats.items()
+        }
+        table = pd.DataFrame.from_dict(rows, orient="index")
+        return table.sort_values("total_ms", ascending=False).head(limit)
+
+
+def start_profiler(mode="sampling"):
+    """현재 스레드(세션 스크립트) 프로파일링 시작 - stop() 후 결과 조회"""
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 프로파일러: {mode} (지원: {', '.join(MODES)})")
+    return (DeterministicProfiler() if mode == "cprofile" else StackSampler()).start()
+
+
+def export(profiler):
+    """(파일 이름, 내용, MIME) - 다운로드용"""
+    stamp = pd.Timestamp.now().strftime("%Y%m%d-%H%M%S")
+    if isinstance(profiler, DeterministicProfiler):
+        return f"rerun-{stamp}.prof", profiler.dump(), "application/octet-stream"
+    return f"rerun-{stamp}.folded", profiler.folded(), "text/plain"
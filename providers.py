@@ -0,0 +1,162 @@
+"""
+데이터 제공처 (Data Providers)
+get_stock_data / load_data 뒤에서 일봉을 가져오는 교체 가능한 백엔드입니다.
+
+- live    : FinanceDataReader 실시간 수집 (기본값)
+- store   : 로컬 저장소(.data/ohlcv)만 읽기 - 네트워크 없음
+- fixture : 녹화해 둔 OHLCV 파일 재생 - 네트워크 없이 디스크 속도로 로드 (프로파일링/부하 테스트용)
+- record  : live 로 수집하면서 결과를 fixture 파일로 녹화
+
+환경변수 STOCK_DATA_PROVIDER 로 선택합니다.
+녹화 예) python providers.py record 005930 000660 --start 2025-01-01 --end 2025-12-31
+"""
+import argparse
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from data_store import OHLCVStore, to_day
+
+FIXTURE_DIR = os.environ.get(
+    "STOCK_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+)
+
+
+class DataProvider(ABC):
+    """
+    제공처 인터페이스 - fetch(ticker, start, end) 는 Date 인덱스의 OHLCV DataFrame 반환
+    인스턴스 자체를 fetch 함수처럼 호출할 수 있습니다.
+    offline=True 인 제공처는 네트워크를 쓰지 않으므로 저장소/스케줄러를 거치지 않습니다.
+    fetch 를 구현하지 않은 제공처는 생성할 때 TypeError 가 발생합니다.
+    """
+    name = "base"
+    offline = False
+
+    @abstractmethod
+    def fetch(self, ticker, start, end):
+        """[start, end] 일봉 (Date 인덱스 OHLCV DataFrame)"""
+
+    def __call__(self, ticker, start, end):
+        return self.fetch(ticker, start, end)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+
+class LiveProvider(DataProvider):
+    """FinanceDataReader 실시간 수집"""
+    name = "live"
+
+    def fetch(self, ticker, start, end):
+        import FinanceDataReader as fdr  # 오프라인 제공처만 쓸 때는 설치/로드하지 않음
+        return fdr.DataReader(ticker, start, end)
+
+
+class StoreProvider(DataProvider):
+    """로컬 저장소에 이미 있는 일봉만 반환 (네트워크 없음)"""
+    name = "store"
+    offline = True
+
+    def __init__(self, store=None):
+        self.store = store or OHLCVStore()
+
+    def fetch(self, ticker, start, end):
+        df, _ = self.store.read(ticker)
+        if df.empty:
+            return df
+        return df.loc[to_day(start):to_day(end)]
+
+
+class FixtureProvider(DataProvider):
+    """녹화된 fixture 파일({ticker}.parquet 또는 {ticker}.csv) 재생"""
+    name = "fixture"
+    offline = True
+
+    def __init__(self, root=FIXTURE_DIR):
+        self.root = root
+        self._frames = {}  # 파일은 종목당 한 번만 읽음
+        self._lock = threading.Lock()
+
+    def path(self, ticker, ext=".csv"):
+        return os.path.join(self.root, ticker + ext)
+
+    def read(self, ticker):
+        with self._lock:
+            if ticker not in self._frames:
+                if os.path.exists(self.path(ticker, ".parquet")):
+                    df = pd.read_parquet(self.path(ticker, ".parquet"))
+                elif os.path.exists(self.path(ticker)):
+                    df = pd.read_csv(self.path(ticker), index_col="Date", parse_dates=["Date"])
+                else:
+                    raise FileNotFoundError(f"fixture 없음: {self.path(ticker)}")
+                self._frames[ticker] = df.sort_index()
+            return self._frames[ticker]
+
+    def fetch(self, ticker, start, end):
+        return self.read(ticker).loc[to_day(start):to_day(end)]
+
+
+class RecordingProvider(DataProvider):
+    """다른 제공처의 결과를 그대로 반환하면서 fixture CSV 에 병합 저장"""
+    name = "record"
+
+    def __init__(self, source=None, root=FIXTURE_DIR):
+        self.source = source or LiveProvider()
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def fetch(self, ticker, start, end):
+        df = self.source.fetch(ticker, start, end)
+        if df is not None and not df.empty:
+            self.save(ticker, df)
+        return df
+
+    def save(self, ticker, df):
+        path = os.path.join(self.root, ticker + ".csv")
+        with self._lock:
+            if os.path.exists(path):
+                old = pd.read_csv(path, index_col="Date", parse_dates=["Date"])
+                df = pd.concat([old, df])
+                df = df[~df.index.duplicated(keep="last")]
+            df = df.sort_index()
+            df.index.name = "Date"
+            df.to_csv(path)
+
+
+PROVIDERS = {
+    "live": LiveProvider,
+    "store": StoreProvider,
+    "fixture": FixtureProvider,
+    "record": RecordingProvider,
+}
+
+
+def get_provider(name=None):
+    """이름(또는 환경변수 STOCK_DATA_PROVIDER)으로 제공처 생성"""
+    name = (name or os.environ.get("STOCK_DATA_PROVIDER", "live")).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"알 수 없는 데이터 제공처: {name} (가능: {', '.join(PROVIDERS)})")
+    return PROVIDERS[name]()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일봉 fixture 녹화 (live 수집 결과를 fixtures/ 에 저장)")
+    parser.add_argument("command", choices=["record"])
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--start", default="2025-01-01")
+    parser.add_argument("--end", default="2025-12-31")
+    parser.add_argument("--root", default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    recorder = RecordingProvider(root=args.root)
+    for ticker in args.tickers:
+        df = recorder.fetch(ticker, args.start, args.end)
+        print(f"{ticker}: {len(df)} bars -> {os.path.join(args.root, ticker + '.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+데이터 수집 스케줄러 & 백그라운드 갱신 (Fetch Scheduler & Background Refresher)
+- FetchScheduler: 모든 fdr.DataReader 호출을 우선순위 큐로 처리
+  (사용자 요청이 백그라운드 갱신보다 먼저, 전역 동시 실행 수/초당 호출 수 제한)
+- BackgroundRefresher: 장중 N분마다, 장 마감 후 1회 캐시된 종목을 갱신
+  갱신 중에도 사용자는 기존(stale) 데이터를 즉시 받습니다.
+"""
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime
+from datetime import time as dtime
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (작을수록 먼저 실행)
+INTERACTIVE = 0   # 화면을 보고 있는 사용자의 요청
+BACKGROUND = 10   # 주기적 갱신, 캐시 워밍업
+
+# KRX 정규장 시간 (한국 시간)
+KST = ZoneInfo("Asia/Seoul")
+MARKET_OPEN = dtime(9, 0)
+MARKET_CLOSE = dtime(15, 30)
+CLOSE_REFRESH = dtime(16, 0)  # 장 마감 후 확정 일봉 갱신 시각
+
+# 사용자 요청 1건의 수집 제한 시간(초)과 재시도 횟수 (환경변수로 변경 가능)
+FETCH_DEADLINE = float(os.environ.get("STOCK_FETCH_DEADLINE", "8"))
+FETCH_RETRIES = int(os.environ.get("STOCK_FETCH_RETRIES", "2"))
+RETRY_BACKOFF = 0.5  # 첫 재시도 대기(초), 이후 2배씩 증가 (±50% 지터)
+
+
+class FetchTimeout(TimeoutError):
+    """제한 시간 안에 데이터 제공처가 응답하지 않음"""
+
+
+class RateLimiter:
+    """토큰 버킷 호출 제한 (초당 rate 회, 최대 burst 회 연속)"""
+
+    def __init__(self, rate=5.0, burst=5):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchScheduler:
+    """
+    데이터 수집 호출 스케줄러
+    max_concurrency 개의 워커가 우선순위 큐에서 작업을 꺼내 rate 제한 하에 fetch 를 호출합니다.
+    """
+
+    def __init__(self, fetch, max_concurrency=2, rate=5.0):
+        self._fetch = fetch
+        self._queue = []  # (priority, seq, future, args)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._limiter = RateLimiter(rate=rate, burst=max(1, int(rate)))
+        self.max_concurrency = max_concurrency
+        self.abandoned = 0  # 제한 시간을 넘겨 결과를 버렸지만 아직 실행 중인 호출 수
+        for i in range(max_concurrency):
+            threading.Thread(target=self._worker, name=f"fetch-worker-{i}", daemon=True).start()
+
+    def submit(self, priority, *args):
+        """fetch(*args) 예약 - Future 반환"""
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._queue, (priority, next(self._seq), future, args))
+            self._cond.notify()
+        return future
+
+    def fetcher(self, priority, deadline=None, retries=0, backoff=RETRY_BACKOFF):
+        """
+        fetch 와 같은 시그니처의 호출 가능 객체 반환 (주어진 우선순위로 예약 후 결과 대기)
+        - deadline: 대기열 + 재시도를 포함한 전체 제한 시간(초), 초과 시 FetchTimeout
+          (.bounded() 로 받은 fetch 는 여러 번 호출해도 하나의 제한 시간을 함께 씀)
+        - retries: 실패 시 재시도 횟수 (지터를 넣은 지수 백오프)
+        """
+        return _Fetcher(self, priority, deadline, retries, backoff)
+
+    def _abandon(self, future):
+        """
+        제한 시간을 넘겼지만 이미 실행 중인 호출 - 취소할 수 없어 워커에서 끝까지 실행되고 결과는 버려집니다.
+        끝날 때까지 abandoned 로 집계해, 모든 워커가 버려진 호출에 묶여 있으면 새 요청은 기다리지 않고 바로 실패시킵니다.
+        """
+        if future.cancel():  # 아직 대기열에 있으면 실행하지 않음
+            return
+        with self._cond:
+            self.abandoned += 1
+
+        def release(_):
+            with self._cond:
+                self.abandoned -= 1
+        future.add_done_callback(release)
+
+    def saturated(self):
+        """모든 워커가 제한 시간을 넘겨 버려진 호출을 실행 중인지"""
+        with self._cond:
+            return self.abandoned >= self.max_concurrency
+
+    def pending(self):
+        with self._cond:
+            return len(self._queue)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, future, args = heapq.heappop(self._queue)
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._limiter.acquire()
+            try:
+                future.set_result(self._fetch(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class _Fetcher:
+    """FetchScheduler.fetcher() 가 돌려주는 fetch 함수 (우선순위 / 제한 시간 / 재시도 설정)"""
+
+    def __init__(self, scheduler, priority, deadline, retries, backoff):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+
+    def __call__(self, *args):
+        return self._fetch(args, None if self.deadline is None else time.monotonic() + self.deadline)
+
+    def bounded(self):
+        """
+        지금부터 deadline 초를 여러 번의 호출이 함께 쓰는 fetch
+        저장소가 앞/뒤 구간을 따로 수집해도 사용자 요청 1건은 deadline 안에 끝납니다.
+        """
+        if self.deadline is None:
+            return self
+        expires = time.monotonic() + self.deadline
+        return lambda *args: self._fetch(args, expires)
+
+    def _fetch(self, args, expires):
+        scheduler = self.scheduler
+        if expires is not None and scheduler.saturated():
+            raise FetchTimeout(f"데이터 제공처 응답 지연 (제한 시간을 넘긴 호출이 모든 워커를 점유): {args[0]}")
+        for attempt in range(self.retries + 1):
+            remaining = None if expires is None else expires - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            future = scheduler.submit(self.priority, *args)
+            try:
+                return future.result(timeout=remaining)
+            except FutureTimeout:
+                scheduler._abandon(future)
+                break
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                if expires is not None:
+                    delay = min(delay, max(0.0, expires - time.monotonic()))
+                time.sleep(delay)
+        raise FetchTimeout(f"데이터 수집 제한 시간({self.deadline:g}초) 초과: {args[0]}")
+
+
+class BackgroundRefresher:
+    """
+    캐시 갱신 스레드 (Stale-While-Revalidate)
+    - request(): 만료된 캐시를 반환한 직후 호출 → 중복 없이 갱신 예약
+    - 장중 interval_minutes 분마다, 장 마감 후(CLOSE_REFRESH) 1회 미확정 구간 전체 갱신
+    갱신용 fetch 는 BACKGROUND 우선순위로 스케줄러를 거칩니다.
+    """
+
+    def __init__(self, loader, fetch, interval_minutes=10):
+        self.loader = loader
+        self.fetch = fetch
+        self.interval = interval_minutes * 60
+        self._pending = {}  # (ticker, start, end) - 삽입 순서 유지
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_run = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def request(self, ticker, start, end):
+        with self._lock:
+            self._pending[(ticker, start, end)] = None
+        self._wakeup.set()
+
+    def is_due(self, now=None):
+        """정기 갱신 시점 여부 (장중 interval 경과 / 장 마감 후 당일 첫 실행)"""
+        now = now or datetime.now(KST)
+        if now.weekday() >= 5:
+            return False
+        last = self._last_run
+        if MARKET_OPEN <= now.time() <= MARKET_CLOSE:
+            return last is None or (now - last).total_seconds() >= self.interval
+        if now.time() >= CLOSE_REFRESH:
+            close_at = now.replace(hour=CLOSE_REFRESH.hour, minute=CLOSE_REFRESH.minute,
+                                   second=0, microsecond=0)
+            return last is None or last < close_at
+        return False
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=30)
+            self._wakeup.clear()
+
+            with self._lock:
+                jobs = list(self._pending)
+                self._pending.clear()
+
+            now = datetime.now(KST)
+            if self.is_due(now):
+                jobs.extend(self.loader.cache.live_spans())
+                self._last_run = now
+
+            for key in dict.fromkeys(jobs):
+                try:
+                    self.loader.revalidate(*key, fetch=self.fetch)
+                except Exception:
+                    logger.exception("background refresh failed: %s", key)
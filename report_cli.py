@@ -0,0 +1,190 @@
+"""
+배치 리포트 생성기 (Headless Batch Report CLI)
+Streamlit 없이 종목 × 기간별 종합 분석 리포트(plot_saltlux_report)를 정적 HTML / PNG 로 저장합니다.
+
+- 데이터는 로컬 저장소(.data/ohlcv)에서만 읽음 (네트워크 없음 - 수집은 python scanner.py --sync)
+- 종목 단위로 프로세스 풀에 분배: 작업자는 종목 일봉을 한 번 읽어 모든 기간의 리포트를 만들고,
+  끝나면 지표/집계 메모를 비워 종목 수와 관계없이 작업자 메모리가 일정하게 유지됨
+- 작업자는 MAX_TASKS_PER_CHILD 종목마다 새 프로세스로 교체 (plotly 객체 단편화로 인한 메모리 증가 방지)
+- HTML 은 plotly.js 를 출력 폴더에 한 번만 두고 참조 (파일당 약 3.5MB 절약)
+- PNG 는 kaleido 가 필요합니다 (pip install kaleido)
+
+실행 예) python report_cli.py 005930 000660 --range 2024-01-01:2024-12-31 --range 2025-01-01:2025-12-31 --png
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data_store import STORE_DIR, OHLCVStore, to_day
+from downsample import MAX_POINTS
+
+REPORT_DIR = "reports"
+MAX_TASKS_PER_CHILD = 50   # 작업자 1개가 처리한 뒤 교체되는 종목 수
+PNG_SIZE = (1600, 2400)    # PNG 너비, 높이 (px)
+
+
+def parse_range(value):
+    """"2024-01-01:2024-12-31" → (시작일, 종료일) - 한쪽을 비우면 저장소 처음/끝"""
+    start, sep, end = value.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"기간 형식은 시작일:종료일 입니다: {value}")
+    return (to_day(start) if start else None, to_day(end) if end else None)
+
+
+def _peak_rss_mb():
+    """
+    현재 프로세스 최대 RSS (MB) - Linux 는 KB, macOS 는 byte 단위
+    resource 모듈이 없는 Windows 에서는 psutil 의 peak_wset, psutil 도 없으면 None
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _range_label(start, end):
+    """요청한 기간 → 파일 이름 일부 (같은 일봉으로 좁혀지는 다른 기간이 서로 덮어쓰지 않도록 요청 기준)"""
+    return f"{f'{start:%Y%m%d}' if start is not None else 'first'}_{f'{end:%Y%m%d}' if end is not None else 'last'}"
+
+
+def render_ticker(ticker, ranges, out_dir, root=STORE_DIR, html=True, png=False,
+                  template="plotly_white", max_points=MAX_POINTS):
+    """
+    종목 1개의 모든 기간 리포트 저장 (프로세스 풀 작업 단위)
+    반환: 기간별 결과 dict 목록 (파일 경로, 일봉 수, 소요 시간, 작업자 최대 RSS)
+    """
+    from charts import plot_saltlux_report  # 작업자에서만 plotly/차트 모듈 로드
+    from indicators import clear_memo as clear_indicators
+    from rollups import clear_memo as clear_rollups
+
+    df, _ = OHLCVStore(root).read(ticker)
+    results = []
+    for start, end in ranges:
+        t0 = time.perf_counter()
+        part = df.loc[start:end]
+        row = {"ticker": ticker, "start": start, "end": end, "bars": len(part), "files": []}
+        if part.empty:
+            row["error"] = "저장소에 데이터 없음"
+        else:
+            part.attrs["ticker"] = ticker
+            fig = plot_saltlux_report(part, ticker, template=template, max_points=max_points)
+            stem = os.path.join(out_dir, f"{ticker}_{_range_label(start, end)}")
+            if html:
+                # plotly.js 는 출력 폴더의 plotly.min.js 하나를 공유
+                fig.write_html(stem + ".html", include_plotlyjs="directory", full_html=True)
+                row["files"].append(stem + ".html")
+            if png:
+                fig.write_image(stem + ".png", width=PNG_SIZE[0], height=PNG_SIZE[1])
+                row["files"].append(stem + ".png")
+            del fig
+        row["seconds"] = time.perf_counter() - t0
+        results.append(row)
+
+    # 다음 종목과 공유할 일이 없는 메모 정리 (작업자 메모리 일정 유지)
+    clear_indicators()
+    clear_rollups()
+    for row in results:
+        row["peak_rss_mb"] = _peak_rss_mb()
+    return results
+
+
+def generate(tickers, ranges, out_dir=REPORT_DIR, root=STORE_DIR, html=True, png=False,
+             template="plotly_white", max_points=MAX_POINTS, workers=None, progress=None):
+    """
+    종목 × 기간 리포트 일괄 생성
+    workers=1 이면 현재 프로세스에서 순차 실행, progress(row) 는 기간별 완료 콜백
+    반환: 결과 DataFrame
+    """
+    if png:
+        try:
+            import kaleido  # noqa: F401  PNG 내보내기에만 필요
+        except ImportError:
+            raise RuntimeError("PNG 저장에는 kaleido 가 필요합니다: pip install kaleido") from None
+    os.makedirs(out_dir, exist_ok=True)
+    tickers = list(dict.fromkeys(tickers))
+    ranges = list(dict.fromkeys(ranges))
+    options = dict(out_dir=out_dir, root=root, html=html, png=png, template=template, max_points=max_points)
+
+    rows = []
+
+    def collect(ticker, run):
+        try:
+            result = run()
+        except Exception as e:  # 한 종목 실패가 전체 배치를 멈추지 않도록
+            result = [{"ticker": ticker, "files": [], "error": repr(e)}]
+        for row in result:
+            rows.append(row)
+            if progress:
+                progress(row)
+
+    workers = workers or min(len(tickers), os.cpu_count() or 1)
+    if workers <= 1:
+        for ticker in tickers:
+            collect(ticker, lambda: render_ticker(ticker, ranges, **options))
+    else:
+        # Streamlit 서버처럼 스레드가 있는 프로세스에서도 안전하도록 spawn 사용
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 max_tasks_per_child=MAX_TASKS_PER_CHILD) as pool:
+            futures = {pool.submit(render_ticker, t, ranges, **options): t for t in tickers}
+            for future in as_completed(futures):
+                collect(futures[future], future.result)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 저장소 종목의 종합 분석 리포트를 HTML/PNG 로 일괄 저장")
+    parser.add_argument("tickers", nargs="*", help="생략하면 저장소의 모든 종목 (지수 제외)")
+    parser.add_argument("--range", dest="ranges", type=parse_range, action="append",
+                        help="시작일:종료일 (여러 번 지정 가능, 기본: 최근 1년)")
+    parser.add_argument("--out", default=REPORT_DIR)
+    parser.add_argument("--png", action="store_true", help="PNG 도 저장 (kaleido 필요)")
+    parser.add_argument("--no-html", action="store_true")
+    parser.add_argument("--dark", action="store_true", help="다크 테마")
+    parser.add_argument("--full-resolution", action="store_true", help="다운샘플링 없이 모든 일봉")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    from scanner import EXCLUDE
+    tickers = args.tickers or [t for t in OHLCVStore(args.store).tickers() if t not in EXCLUDE]
+    today = pd.Timestamp.today().normalize()
+    ranges = args.ranges or [(today - pd.DateOffset(years=1), today)]
+    if not tickers:
+        print("저장소에 종목이 없습니다 (수집: python scanner.py --sync)")
+        return
+
+    t0 = time.perf_counter()
+
+    def progress(row):
+        status = row.get("error") or ", ".join(os.path.basename(f) for f in row["files"])
+        print(f"[{row['ticker']}] {status}", flush=True)
+
+    report = generate(
+        tickers, ranges, out_dir=args.out, root=args.store, html=not args.no_html, png=args.png,
+        template="plotly_dark" if args.dark else "plotly_white",
+        max_points=None if args.full_resolution else MAX_POINTS,
+        workers=args.workers, progress=progress,
+    )
+    elapsed = time.perf_counter() - t0
+    done = report["files"].map(len).gt(0).sum()
+    peak = report.get("peak_rss_mb", pd.Series(dtype=float)).max()
+    memory = "알 수 없음 (pip install psutil)" if pd.isna(peak) else f"{peak:.0f}MB"
+    print(f"\n리포트 {done}/{len(report)}개 완료 - {elapsed:.1f}초 ({done / elapsed:.2f}개/초), "
+          f"작업자 최대 메모리 {memory} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
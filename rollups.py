@@ -0,0 +1,107 @@
+"""
+기간별 집계 엔진 (Calendar Rollups)
+일봉을 실제 달력 기간(주/월/분기/연) 단위로 집계합니다.
+df.index.month 로 묶으면 여러 해가 섞이므로 (2024-01 과 2025-01 이 합쳐짐) Period 로 구분합니다.
+
+- 집계 결과는 (종목, 시작일, 기간) 단위로 캐시
+- 같은 구간에 일봉이 추가되면 마지막(진행 중인) 기간부터만 다시 집계
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# 기간 이름 → pandas Period 빈도
+PERIODS = {
+    "week": "W-FRI",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+ROLLUP_MEMO_SIZE = 64
+
+
+def _aggregate(df, freq):
+    """
+    기간별 집계
+    First/Last   : 기간 첫/마지막 종가
+    Return       : 기간 내 수익률 (%) - (Last - First) / First
+    Trade_Value  : 일평균 거래대금 (종가 × 거래량)
+    Volume       : 거래량 합계
+    Bars         : 거래일 수
+    """
+    close = df["Close"]
+    volume = df["Volume"] if "Volume" in df.columns else pd.Series(0, index=df.index)
+    grouped = pd.DataFrame({
+        "Close": close, "Trade_Value": close * volume, "Volume": volume
+    }).groupby(df.index.to_period(freq))
+
+    out = pd.DataFrame({
+        "First": grouped["Close"].first(),
+        "Last": grouped["Close"].last(),
+        "Trade_Value": grouped["Trade_Value"].mean(),
+        "Volume": grouped["Volume"].sum(),
+        "Bars": grouped.size(),
+    })
+    out.insert(2, "Return", (out["Last"] - out["First"]) / out["First"] * 100)
+    return out
+
+
+# -----------------------------------------------------------------------------
+# 캐시 (Rollup Cache)
+# -----------------------------------------------------------------------------
+_memo = OrderedDict()  # (종목, 시작일, 빈도) → (결과, 일봉 개수, 마지막 일봉)
+_memo_lock = threading.Lock()
+
+
+def _last_bar(df):
+    last = df.iloc[-1]
+    return df.index[-1], float(last["Close"]), float(last.get("Volume", 0))
+
+
+def rollup(df, period="month"):
+    """
+    df 를 period(week/month/quarter/year) 단위로 집계한 DataFrame (PeriodIndex)
+    결과는 캐시되어 공유되므로 제자리 수정하지 마세요.
+    """
+    freq = PERIODS[period]
+    ticker = df.attrs.get("ticker")
+    if ticker is None or df.empty:
+        return _aggregate(df, freq)
+
+    key = (ticker, df.index[0], freq)
+    last = _last_bar(df)
+    with _memo_lock:
+        entry = _memo.get(key)
+
+    if entry is not None and entry[1] <= len(df) and df.index[entry[1] - 1] == entry[2][0]:
+        result, n, prev_last = entry
+        if n == len(df) and prev_last == last:
+            return result
+        # 이전 마지막 일봉이 속한 기간부터 다시 집계 (그 앞 기간은 이미 확정)
+        cut = prev_last[0].to_period(freq)
+        tail = df.loc[cut.start_time:]
+        result = pd.concat([result[result.index < cut], _aggregate(tail, freq)])
+    else:
+        result = _aggregate(df, freq)
+
+    with _memo_lock:
+        _memo[key] = (result, len(df), last)
+        _memo.move_to_end(key)
+        while len(_memo) > ROLLUP_MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
+
+
+def seasonality(df):
+    """연도 × 월(1~12) 월간 수익률(%) 표 - 계절성 히트맵용"""
+    monthly = rollup(df, "month")["Return"]
+    table = pd.DataFrame({
+        "Year": monthly.index.year, "Month": monthly.index.month, "Return": monthly.to_numpy()
+    }).pivot(index="Year", columns="Month", values="Return")
+    return table.reindex(columns=range(1, 13))
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
@@ -0,0 +1,216 @@
+"""
+전 종목 시그널 스캐너 (Market Signal Scanner)
+대시보드의 시그널 로직을 로컬 저장소의 모든 종목에 적용해 오늘 발생한 시그널을 순위표로 반환합니다.
+
+- LargeUp / LargeDown    : plot_kakao_dashboard 의 급등/급락 (수익률·거래량 상위 10%)
+- Signal_Buy / Signal_Sell : plot_mind_dashboard 의 수급 시그널 (거래량 상위 10% + 등락률 상/하위 10%)
+
+종목 × 날짜 2차원 배열로 한 번에 계산하며, 종목을 묶음(chunk) 단위로 나눠 프로세스 풀에서 병렬 처리합니다.
+종목별 Parquet 대신 panel.py 로 만든 패널을 주면 메모리 맵으로 읽어 로딩 시간을 줄입니다.
+실행 예) python scanner.py --lookback 250 --top 30
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from data_store import STORE_DIR, OHLCVStore, to_day
+from panel import Panel
+from signals import detect_large_moves, detect_supply_signals, pct_change
+
+LOOKBACK = 250     # 임계값 계산 구간 (거래일, 대시보드 기본 1년)
+CHUNK_SIZE = 200   # 프로세스 1개가 한 번에 처리하는 종목 수
+EXCLUDE = {"KS11", "KQ11"}  # 지수 (거래일 캘린더/벤치마크용)
+
+
+# -----------------------------------------------------------------------------
+# 배열 로드 (Aligned Arrays)
+# -----------------------------------------------------------------------------
+def load_arrays(store, tickers, start, end, lookback=LOOKBACK):
+    """
+    종목들의 종가/거래량을 날짜 합집합으로 정렬한 (종목 × 날짜) 배열
+    반환: (종목 목록, DatetimeIndex, close, volume) - 없는 날은 NaN
+    """
+    closes, volumes = {}, {}
+    for ticker in tickers:
+        df, _ = store.read(ticker, columns=["Close", "Volume"])
+        if df.empty:
+            continue
+        df = df.loc[start:end]
+        if not df.empty:
+            closes[ticker] = df["Close"]
+            volumes[ticker] = df["Volume"]
+    if not closes:
+        return [], pd.DatetimeIndex([]), np.empty((0, 0)), np.empty((0, 0))
+
+    close = pd.DataFrame(closes).sort_index().iloc[-(lookback + 1):]
+    volume = pd.DataFrame(volumes).reindex(close.index)
+    return (list(close.columns), close.index,
+            close.to_numpy(dtype=np.float64).T, volume.to_numpy(dtype=np.float64).T)
+
+
+# -----------------------------------------------------------------------------
+# 스캔 (Scan)
+# -----------------------------------------------------------------------------
+def scan_arrays(tickers, dates, close, volume):
+    """각 종목의 마지막 거래일에 발생한 시그널 목록 (DataFrame)"""
+    if len(tickers) == 0 or close.shape[1] == 0:
+        return pd.DataFrame()
+    ret = pct_change(close)
+    large_up, large_down = detect_large_moves(ret, volume)
+    signal_buy, signal_sell, vol_th = detect_supply_signals(ret, volume)
+
+    # 종목별 마지막 거래일 위치 (합집합 날짜 중 값이 있는 마지막 열)
+    has_bar = ~np.isnan(close)
+    last = close.shape[1] - 1 - np.argmax(has_bar[:, ::-1], axis=1)
+    rows = np.arange(len(tickers))
+
+    rows_out = []
+    for signal, mask in (("LargeUp", large_up), ("LargeDown", large_down),
+                         ("Signal_Buy", signal_buy), ("Signal_Sell", signal_sell)):
+        hit = mask[rows, last] & has_bar[rows, last]
+        for i in np.flatnonzero(hit):
+            j = last[i]
+            rows_out.append({
+                "Ticker": tickers[i],
+                "Date": dates[j],
+                "Signal": signal,
+                "Close": close[i, j],
+                "Return": ret[i, j] * 100,
+                "Volume": volume[i, j],
+                "Volume_Ratio": volume[i, j] / vol_th[i, 0],
+            })
+    return pd.DataFrame(rows_out)
+
+
+def _scan_chunk(root, tickers, start, end, lookback):
+    """프로세스 풀 작업 단위 (모듈 최상위 함수여야 pickle 가능)"""
+    store = OHLCVStore(root)
+    return scan_arrays(*load_arrays(store, tickers, start, end, lookback))
+
+
+def _scan_panel_chunk(path, tickers, start, end, lookback):
+    """패널 파일을 메모리 맵으로 열어 담당 종목 행만 스캔 (작업자 간 페이지 캐시 공유)"""
+    panel = Panel.load(path).select(tickers, start, end)
+    close = panel["Close"][:, -(lookback + 1):].astype(np.float64)
+    volume = panel["Volume"][:, -(lookback + 1):].astype(np.float64)
+    volume[np.isnan(close)] = np.nan  # 거래가 없는 날은 분위수 계산에서 제외
+    return scan_arrays(panel.tickers, panel.dates[-(lookback + 1):], close, volume)
+
+
+def rank_hits(hits):
+    """오늘(가장 최근 거래일) 시그널만 남기고 |등락률| × 거래량 배수 순으로 정렬"""
+    if hits.empty:
+        return hits
+    hits = hits[hits["Date"] == hits["Date"].max()].copy()
+    hits["Score"] = hits["Return"].abs() * hits["Volume_Ratio"]
+    return hits.sort_values("Score", ascending=False).reset_index(drop=True)
+
+
+def scan(tickers=None, root=STORE_DIR, as_of=None, lookback=LOOKBACK,
+         workers=None, chunk_size=CHUNK_SIZE, panel_path=None):
+    """
+    저장소 종목 전체(또는 tickers)를 스캔해 오늘의 시그널 순위표 반환
+    panel_path 를 주면 종목별 Parquet 대신 미리 만든 패널(panel.py)을 메모리 맵으로 읽습니다.
+    workers=1 이면 현재 프로세스에서 순차 실행합니다.
+    """
+    if panel_path is not None:
+        job = partial(_scan_panel_chunk, panel_path)
+        universe = Panel.load(panel_path).tickers
+    else:
+        job = partial(_scan_chunk, root)
+        universe = OHLCVStore(root).tickers()
+    if tickers is None:
+        tickers = [t for t in universe if t not in EXCLUDE]
+    end = to_day(as_of) if as_of is not None else pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=lookback * 7 // 5 + 30)  # 휴장일 여유분 포함
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    if not chunks:
+        return pd.DataFrame()
+
+    workers = workers or min(len(chunks), os.cpu_count() or 1)
+    if workers == 1:
+        parts = [job(chunk, start, end, lookback) for chunk in chunks]
+    else:
+        # Streamlit 서버처럼 스레드가 있는 프로세스에서도 안전하도록 spawn 사용
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            parts = list(pool.map(job, chunks, [start] * len(chunks), [end] * len(chunks),
+                                  [lookback] * len(chunks)))
+    parts = [p for p in parts if not p.empty]
+    return rank_hits(pd.concat(parts, ignore_index=True)) if parts else pd.DataFrame()
+
+
+def _is_synced(store, ticker, start, end, closed_at):
+    """
+    저장소에 [start, end] (거래일 기준) 가 이미 수집되어 있는지 - 일봉 파일은 읽지 않고 수집 구간/저장 시각만 확인
+    end 가 오늘이면 오늘 장 마감 후(closed_at 이후) 저장된 경우만 최신으로 봅니다.
+    """
+    coverage = store.coverage(ticker)
+    today = pd.Timestamp.today().normalize()
+    if coverage is None or coverage[0] > start or coverage[1] < min(end, today - pd.Timedelta(days=1)):
+        return False
+    if end < today:
+        return True
+    modified = store.modified_at(ticker)
+    return modified is not None and modified >= closed_at
+
+
+def sync_universe(start, end, market="KRX", force=False):
+    """
+    KRX 상장 종목 전체를 로컬 저장소로 수집 (네트워크 필요)
+    약 2,500종목이 FetchScheduler 의 초당 5회 제한을 거치므로 처음 수집은 최소 9분 정도 걸립니다.
+    이미 최신인 종목은 건너뛰므로 중단된 수집을 다시 실행하면 남은 종목만 받습니다. (force=True 면 전체)
+    반환: (전체 종목 수, 수집한 종목 수)
+    """
+    import FinanceDataReader as fdr
+    from data_loader import create_data_loader
+    from refresher import CLOSE_REFRESH, KST
+
+    codes = fdr.StockListing(market)["Code"].tolist()
+    loader = create_data_loader(ttl=3600)
+    todo = codes
+    if loader.store is not None and not force:
+        start, end = loader.normalize(start, end)
+        close_at = datetime.now(KST).replace(hour=CLOSE_REFRESH.hour, minute=CLOSE_REFRESH.minute,
+                                             second=0, microsecond=0)
+        closed_at = pd.Timestamp.fromtimestamp(close_at.timestamp())  # 저장 시각(로컬)과 같은 기준
+        todo = [t for t in codes if not _is_synced(loader.store, t, start, end, closed_at)]
+    loader.load_many(todo, start, end, background=True)
+    return len(codes), len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 저장소 전 종목 시그널 스캔")
+    parser.add_argument("tickers", nargs="*", help="생략하면 저장소의 모든 종목")
+    parser.add_argument("--as-of", default=None, help="기준일 (기본: 오늘)")
+    parser.add_argument("--lookback", type=int, default=LOOKBACK)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--sync", action="store_true",
+                        help="스캔 전에 KRX 전 종목을 저장소로 수집 (처음에는 약 10분, 이후에는 최신이 아닌 종목만)")
+    parser.add_argument("--force-sync", action="store_true", help="--sync 때 이미 최신인 종목도 다시 수집")
+    parser.add_argument("--panel", default=None, help="패널 경로 (python panel.py build 로 생성)")
+    args = parser.parse_args()
+
+    if args.sync:
+        end = args.as_of or pd.Timestamp.today().strftime("%Y-%m-%d")
+        start = (to_day(end) - pd.Timedelta(days=args.lookback * 7 // 5 + 30)).strftime("%Y-%m-%d")
+        total, fetched = sync_universe(start, end, force=args.force_sync)
+        print(f"KRX {total}개 종목 중 {fetched}개 수집 완료 ({total - fetched}개는 이미 최신)")
+
+    hits = scan(args.tickers or None, as_of=args.as_of, lookback=args.lookback, workers=args.workers,
+                panel_path=args.panel)
+    if hits.empty:
+        print("시그널 없음")
+    else:
+        print(hits.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
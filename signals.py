@@ -0,0 +1,59 @@
+"""
+벡터화 시그널 계산 (Vectorized Signal Kernels)
+대시보드의 급등/급락(LargeUp/LargeDown)과 수급 시그널(Signal_Buy/Signal_Sell)을
+날짜가 마지막 축인 배열((종목 × 날짜) 등)로 한 번에 계산합니다.
+
+스캐너, 종목 비교, 시장 대비 분석, 백테스트가 함께 쓰는 순수 numpy 함수만 둡니다.
+(프로세스 풀/저장소/패널을 쓰는 scanner.py 를 분석 모듈이 불러오지 않도록 분리)
+"""
+import warnings
+
+import numpy as np
+
+
+# -----------------------------------------------------------------------------
+# 시그널 감지 (Vectorized Detectors) - 모든 배열은 (종목 × 날짜)
+# -----------------------------------------------------------------------------
+def pct_change(close):
+    """
+    날짜 방향 수익률 (소수) - 종목별 직전 일봉 종가 대비 (대시보드의 종목별 pandas pct_change 와 동일)
+    거래정지 등으로 빈 날 다음의 일봉도 직전 일봉 대비로 계산하며, 첫 일봉과 빈 날은 NaN
+    """
+    pos = np.where(np.isnan(close), 0, np.arange(close.shape[-1]))
+    prev = np.take_along_axis(close, np.maximum.accumulate(pos, axis=-1), axis=-1)  # 직전 일봉 종가
+    ret = np.full_like(close, np.nan)
+    ret[..., 1:] = close[..., 1:] / prev[..., :-1] - 1
+    return ret
+
+
+def row_quantile(values, q):
+    """종목별 분위수 (pandas quantile/np.percentile 과 같은 선형 보간, 값이 없으면 NaN)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN slice
+        return np.nanquantile(values, q, axis=1, keepdims=True)
+
+
+def detect_large_moves(ret, volume, q=0.9):
+    """
+    plot_kakao_dashboard 급등/급락 - 수익률과 거래량이 모두 있는 날 기준 분위수
+    반환: (large_up, large_down) 불리언 배열
+    """
+    valid = ~np.isnan(ret) & ~np.isnan(volume)
+    r = np.where(valid, ret, np.nan)
+    v = np.where(valid, volume, np.nan)
+    ret_up, ret_down = row_quantile(r, q), row_quantile(r, 1 - q)
+    vol_th = row_quantile(v, q)
+    with np.errstate(invalid="ignore"):
+        return (ret >= ret_up) & (volume >= vol_th), (ret <= ret_down) & (volume >= vol_th)
+
+
+def detect_supply_signals(ret, volume, q=0.9):
+    """
+    plot_mind_dashboard 수급 시그널 - 거래량/등락률 각각의 분위수
+    반환: (signal_buy, signal_sell, 거래량 임계값)
+    """
+    vol_th = row_quantile(volume, q)
+    up, down = row_quantile(ret, q), row_quantile(ret, 1 - q)
+    with np.errstate(invalid="ignore"):
+        heavy = volume >= vol_th
+        return heavy & (ret >= up), heavy & (ret <= down), vol_th
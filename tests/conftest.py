@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 저장소 최상위 모듈 (flat layout) import 경로
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_ohlcv(bars, start="2020-01-01", seed=0):
+    """시드 고정 합성 일봉 (평일 인덱스)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=bars, name="Date")
+    close = 10000 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, bars)))
+    return pd.DataFrame({
+        "Open": close * np.exp(rng.normal(0, 0.01, bars)),
+        "High": close * 1.02,
+        "Low": close * 0.98,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, bars).astype(np.float64),
+    }, index=dates)
+
+
+@pytest.fixture
+def ohlcv():
+    return make_ohlcv(400)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest, positions, returns, simulate, summarize
+
+FEE, SLIPPAGE, TAX = 0.001, 0.0, 0.002
+
+
+def test_simulate_hand_computed_round_trip():
+    close = np.array([100.0, 110.0, 121.0, 110.0, 99.0])
+    state = np.array([True, True, False, False, False])  # 0일 종가 매수, 2일 종가 매도
+    ret = simulate(close, state, FEE, SLIPPAGE, TAX)
+
+    expected = [
+        0.999 - 1,           # 매수 비용
+        0.1,                 # 보유
+        1.1 * 0.997 - 1,     # 보유 수익 + 매도 비용(수수료 + 거래세)
+        0.0,
+        0.0,
+    ]
+    np.testing.assert_allclose(ret, expected)
+
+    stats = summarize(ret[None, :], state[None, :])
+    total = 0.999 * 1.1 * 1.1 * 0.997 - 1
+    assert stats["Total Return"][0] == pytest.approx(total * 100)
+    assert stats["Trades"][0] == 1
+    assert stats["Win Rate"][0] == 100
+    assert stats["Exposure"][0] == pytest.approx(40)
+
+
+def test_open_position_and_losing_trade():
+    close = np.array([100.0, 90.0, 90.0, 99.0, 108.9])
+    state = np.array([True, False, False, True, True])  # 손실 거래 후 미청산 포지션
+    ret = simulate(close, state, FEE, SLIPPAGE, TAX)
+    stats = summarize(ret[None, :], state[None, :])
+
+    loss = 0.999 * 0.9 * 0.997 - 1
+    gain = 0.999 * 1.1 - 1  # 마지막 종가로 평가 (매도 비용 없음)
+    assert stats["Trades"][0] == 2
+    assert stats["Win Rate"][0] == 50
+    assert stats["P/L Ratio"][0] == pytest.approx(gain / -loss)
+
+
+def test_positions_exit_wins_over_entry():
+    entries = np.array([True, False, True, False, True])
+    exits = np.array([False, True, True, False, False])
+    assert positions(entries, exits).tolist() == [True, False, False, False, True]
+
+
+def test_backtest_trade_list_matches_equity(ohlcv):
+    result = backtest(ohlcv, "ma_cross", fast=5, slow=20)
+    trades = result["trades"]
+    assert len(trades) == result["stats"]["Trades"]
+    growth = np.prod(1 + trades["Return"].to_numpy() / 100)
+    assert result["equity"].iloc[-1] == pytest.approx(growth)
+    assert isinstance(result["position"], pd.Series)
+
+
+@pytest.mark.parametrize("fast, slow", [(20, 20), (60, 20)])
+def test_ma_cross_rejects_fast_not_shorter_than_slow(ohlcv, fast, slow):
+    with pytest.raises(ValueError):
+        backtest(ohlcv, "ma_cross", fast=fast, slow=slow)
+
+
+def test_returns_span_gaps_from_previous_valid_close():
+    close = np.array([[np.nan, 100.0, 110.0, np.nan, np.nan, 121.0]])
+    np.testing.assert_allclose(returns(close), [[0.0, 0.0, 0.1, 0.0, 0.0, 0.1]])
+
+    state = np.array([False, True, True, True, True, True])  # 거래정지 동안에도 보유
+    ret = simulate(close[0], state, FEE, SLIPPAGE, TAX)
+    assert np.prod(1 + ret) == pytest.approx(0.999 * 1.1 * 1.1)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import analyze, relative_strength, rolling_regression, watchlist_table
+from conftest import make_ohlcv
+from panel import Panel
+from signals import pct_change
+
+WINDOW = 40
+
+
+@pytest.fixture
+def panel():
+    frames = {"KS11": make_ohlcv(300, seed=1), "KQ11": make_ohlcv(300, seed=2)}
+    for i, ticker in enumerate(["A", "B", "C"]):
+        df = make_ohlcv(300, seed=30 + i)
+        frames[ticker] = df.drop(df.index[50 + i::97])  # 거래정지 등 빈 날
+    frames["D"] = make_ohlcv(300, seed=40).iloc[120:]  # 늦게 상장
+    return Panel.from_frames(frames)
+
+
+def _series(panel, ticker):
+    close = np.asarray(panel.select([ticker])["Close"], dtype=np.float64)
+    return pd.Series(close[0]), pd.Series(pct_change(close)[0])
+
+
+def test_rolling_regression_matches_pandas(panel):
+    result = analyze(panel, window=WINDOW)
+    assert result["tickers"] == ["A", "B", "C", "D"] and result["benchmarks"] == ["KS11", "KQ11"]
+    for b, code in enumerate(result["benchmarks"]):
+        _, y = _series(panel, code)
+        for i, ticker in enumerate(result["tickers"]):
+            _, x = _series(panel, ticker)
+            both = x.notna() & y.notna()
+            x_, y_ = x.where(both), y.where(both)
+            beta = x_.rolling(WINDOW).cov(y_) / y_.rolling(WINDOW).var()
+            alpha = (x_.rolling(WINDOW).mean() - beta * y_.rolling(WINDOW).mean()) * 252 * 100
+            assert beta.notna().sum() > 50
+            np.testing.assert_allclose(result["beta"][b, i], beta, rtol=1e-6, atol=1e-9)
+            np.testing.assert_allclose(result["alpha"][b, i], alpha, rtol=1e-6, atol=1e-6)
+            np.testing.assert_allclose(result["corr"][b, i], x_.rolling(WINDOW).corr(y_), rtol=1e-6, atol=1e-9)
+
+
+def test_relative_strength_matches_pandas(panel):
+    result = analyze(panel, window=WINDOW)
+    for b, code in enumerate(result["benchmarks"]):
+        market, _ = _series(panel, code)
+        for i, ticker in enumerate(result["tickers"]):
+            stock, _ = _series(panel, ticker)
+            first = stock.first_valid_index()
+            expected = (stock / stock[first]) / (market / market[first]) * 100
+            np.testing.assert_allclose(result["rs"][b, i], expected, rtol=1e-6)
+
+
+def test_single_benchmark_broadcast():
+    ret = pct_change(np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, (3, 100)), axis=1))
+    beta, alpha, corr = rolling_regression(ret[1:], ret[:1], window=20)
+    assert beta.shape == alpha.shape == corr.shape == (1, 2, 100)
+    assert relative_strength(np.ones((2, 5)), np.ones((1, 5))).shape == (1, 2, 5)
+
+
+def test_watchlist_table_uses_latest_values(panel):
+    result = analyze(panel, window=WINDOW)
+    table = watchlist_table(result, labels={"A": "Alpha Corp"})
+    assert table.loc["A", "Name"] == "Alpha Corp"
+    beta = result["beta"][0, 0]
+    assert table.loc["A", "Beta (KOSPI)"] == pytest.approx(beta[~np.isnan(beta)][-1])
+    assert list(table.columns[:3]) == ["Name", "Beta (KOSPI)", "Alpha (KOSPI)"]
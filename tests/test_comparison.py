@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparison import (compare, correlation_matrix, covariance_matrix, normalized_returns,
+                        rolling_correlation)
+from conftest import make_ohlcv
+from panel import Panel
+from signals import pct_change
+
+
+@pytest.fixture
+def panel():
+    frames = {}
+    for i, ticker in enumerate(["A", "B", "C", "D"]):
+        df = make_ohlcv(300, seed=10 + i)
+        frames[ticker] = df.drop(df.index[i * 7::29])  # 종목마다 다른 빈 날
+    frames["E"] = make_ohlcv(300, seed=20).iloc[200:]  # 늦게 상장 - 공통 구간이 짧음
+    return Panel.from_frames(frames)
+
+
+def _returns_frame(panel):
+    close = np.asarray(panel["Close"], dtype=np.float64)
+    return close, pct_change(close), pd.DataFrame(pct_change(close).T, columns=panel.tickers)
+
+
+def test_normalized_returns_match_pandas(panel):
+    close, _, _ = _returns_frame(panel)
+    for i, ticker in enumerate(panel.tickers):
+        s = pd.Series(close[i]).dropna()
+        expected = (s / s.iloc[0] - 1) * 100
+        np.testing.assert_allclose(normalized_returns(close)[i][s.index], expected)
+
+
+def test_correlation_and_covariance_match_pandas(panel):
+    _, ret, frame = _returns_frame(panel)
+    np.testing.assert_allclose(correlation_matrix(ret), frame.corr(min_periods=20), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(covariance_matrix(ret, annualize=False), frame.cov(min_periods=20),
+                               rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(covariance_matrix(ret), frame.cov(min_periods=20) * 252, rtol=1e-9, atol=1e-15)
+    assert np.isnan(correlation_matrix(ret, min_periods=150)[0, 4])  # 공통 거래일 부족
+
+
+def test_rolling_correlation_matches_pandas(panel):
+    _, ret, frame = _returns_frame(panel)
+    rolling = rolling_correlation(ret, base=0, window=30)
+    for i, ticker in enumerate(panel.tickers):
+        expected = frame[ticker].rolling(30).corr(frame["A"])
+        np.testing.assert_allclose(rolling[i], expected, rtol=1e-7, atol=1e-9)
+
+
+def test_compare_uses_requested_base(panel):
+    result = compare(panel, base="C", window=30)
+    assert result["base"] == panel.row("C")
+    np.testing.assert_allclose(np.diag(result["corr"]), 1.0)
+    base_row = result["rolling_corr"][result["base"]]
+    np.testing.assert_allclose(base_row[~np.isnan(base_row)], 1.0)
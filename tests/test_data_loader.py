@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from data_loader import RangeCache, SingleFlight, StockDataLoader
+
+DAYS = pd.bdate_range("2024-01-01", "2024-12-31", name="Date")
+FULL = pd.DataFrame({"Close": range(len(DAYS))}, index=DAYS, dtype=float)
+
+
+def _put(cache, start, end, frame=FULL):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    cache.put("A", start, end, frame.loc[start:end])
+
+
+def _spans(cache):
+    return [(span.start, span.end) for span in cache._spans["A"]]
+
+
+def test_range_cache_serves_subranges():
+    cache = RangeCache()
+    _put(cache, "2024-01-01", "2024-06-28")
+    df, fresh = cache.lookup("A", pd.Timestamp("2024-02-01"), pd.Timestamp("2024-03-29"))
+    assert fresh
+    assert df.index.equals(FULL.loc["2024-02-01":"2024-03-29"].index)
+    assert cache.lookup("A", pd.Timestamp("2024-06-01"), pd.Timestamp("2024-07-31")) == (None, False)
+    assert cache.stats.lookups == 2 and cache.stats.misses == 1
+
+
+def test_range_cache_merges_overlapping_and_adjacent_spans():
+    cache = RangeCache()
+    _put(cache, "2024-01-01", "2024-01-31")
+    _put(cache, "2024-03-01", "2024-03-29")
+    assert len(_spans(cache)) == 2
+
+    _put(cache, "2024-02-01", "2024-02-29")  # 양쪽과 맞닿음 → 하나로 병합
+    assert _spans(cache) == [(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-29"))]
+    df, _ = cache.lookup("A", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-29"))
+    assert df.index.equals(FULL.loc["2024-01-01":"2024-03-29"].index)
+    assert df.index.is_unique
+
+
+def test_range_cache_prefers_newer_data_on_overlap():
+    cache = RangeCache()
+    _put(cache, "2024-01-01", "2024-02-29")
+    _put(cache, "2024-02-01", "2024-03-29", FULL + 1000)
+    df, _ = cache.lookup("A", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-29"))
+    assert df.loc["2024-01-31", "Close"] == FULL.loc["2024-01-31", "Close"]
+    assert df.loc["2024-02-01", "Close"] == FULL.loc["2024-02-01", "Close"] + 1000
+
+
+def test_single_flight_runs_concurrent_calls_once():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["result"] * 4
+    assert flight.coalesced == 3
+    assert flight.do("k", lambda: "again") == "again"  # 끝난 키는 다시 실행
+
+
+def test_single_flight_shares_errors_and_releases_key():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ConnectionError("down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except ConnectionError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert flight._calls == {}
+    with pytest.raises(ConnectionError):
+        flight.do("k", failing)
+
+
+def test_follower_waits_only_for_its_own_deadline():
+    today = pd.Timestamp.today().normalize()
+    start = today - pd.Timedelta(days=30)
+    cached = pd.DataFrame({"Close": 1.0}, index=pd.date_range(start, today, name="Date"))
+    loader = StockDataLoader(None, None, ttl=-1)  # 오늘을 포함하는 캐시는 항상 만료
+    loader.cache.put("A", start, today, cached)
+
+    release = threading.Event()
+
+    def background(ticker, s, e):  # 제한 시간 없는 백그라운드 갱신
+        release.wait(5)
+        return cached
+
+    class Interactive:
+        deadline = 0.2
+
+        def __call__(self, ticker, s, e):
+            raise AssertionError("진행 중인 조회에 합류해야 함")
+
+    leader = threading.Thread(target=loader.revalidate, args=("A", start, today, background))
+    leader.start()
+    while not loader.inflight._calls:
+        time.sleep(0.01)
+
+    t0 = time.perf_counter()
+    df = loader.load("A", start, today, fetch=Interactive())
+    elapsed = time.perf_counter() - t0
+    release.set()
+    leader.join()
+
+    assert elapsed < 1.0
+    assert df.attrs["stale_as_of"] is not None
+    assert len(df) == len(cached)
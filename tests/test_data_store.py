@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from data_store import OHLCVStore
+
+DAYS = pd.bdate_range("2024-01-01", "2024-06-28", name="Date")
+FULL = pd.DataFrame({"Close": range(len(DAYS))}, index=DAYS, dtype=float)
+
+
+class Recorder:
+    """호출 구간을 기록하는 fetch (fail_from 이후 구간은 예외, empty=True 면 빈 응답)"""
+
+    def __init__(self, empty=False, fail_from=None):
+        self.calls = []
+        self.empty = empty
+        self.fail_from = fail_from
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((start, end))
+        if self.fail_from is not None and start >= self.fail_from:
+            raise ConnectionError("upstream down")
+        return pd.DataFrame() if self.empty else FULL.loc[start:end]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path))
+
+
+def test_first_fetch_records_coverage(store):
+    fetch = Recorder()
+    df = store.get("A", "2024-02-01", "2024-02-29", fetch)
+    assert fetch.calls == [("2024-02-01", "2024-02-29")]
+    assert df.index.equals(FULL.loc["2024-02-01":"2024-02-29"].index)
+    assert store.coverage("A") == (pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-29"))
+
+
+def test_only_missing_edges_are_fetched(store):
+    store.get("A", "2024-02-01", "2024-02-29", Recorder())
+    fetch = Recorder()
+    df = store.get("A", "2024-01-15", "2024-03-15", fetch)
+    assert fetch.calls == [("2024-01-15", "2024-01-31"), ("2024-03-01", "2024-03-15")]
+    assert df.index.equals(FULL.loc["2024-01-15":"2024-03-15"].index)
+    assert store.coverage("A") == (pd.Timestamp("2024-01-15"), pd.Timestamp("2024-03-15"))
+
+    fetch = Recorder()
+    store.get("A", "2024-02-01", "2024-03-01", fetch)
+    assert fetch.calls == []
+
+
+def test_empty_response_does_not_extend_coverage(store):
+    store.get("A", "2024-02-01", "2024-02-29", Recorder())
+    store.get("A", "2024-01-01", "2024-03-29", Recorder(empty=True))
+    assert store.coverage("A") == (pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-29"))
+
+    fetch = Recorder()
+    store.get("A", "2024-01-01", "2024-03-29", fetch)
+    assert len(fetch.calls) == 2  # 빈 응답이었던 구간은 다시 요청
+
+
+def test_front_edge_is_kept_when_back_edge_fails(store):
+    store.get("A", "2024-02-01", "2024-02-29", Recorder())
+    with pytest.raises(ConnectionError):
+        store.get("A", "2024-01-01", "2024-03-29", Recorder(fail_from="2024-03-01"))
+    df, coverage = store.read("A")
+    assert coverage == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-29"))
+    assert df.index[0] == pd.Timestamp("2024-01-01")
+
+
+def test_empty_first_fetch_writes_nothing(store):
+    assert store.get("A", "2024-02-01", "2024-02-29", Recorder(empty=True)).empty
+    assert store.coverage("A") is None
+    assert store.tickers() == []
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import downsample
+from conftest import make_ohlcv
+from downsample import choose_rule, downsample_series, lttb_indices, resample_ohlcv
+
+
+def reference_lttb(x, y, threshold):
+    """버킷을 하나씩 순서대로 처리하는 교과서 LTTB"""
+    n = len(y)
+    picked = [0]
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            cx, cy = x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        picked.append(a)
+    return np.array(picked + [n - 1])
+
+
+def _series(bars, kind, seed):
+    close = make_ohlcv(bars, seed=seed)["Close"]
+    if kind == "drawdown":  # 평평한 구간 (동점) 이 많은 시계열
+        return (close - close.cummax()) / close.cummax() * 100
+    if kind == "return":    # 잡음이 큰 시계열
+        return close.pct_change().fillna(0)
+    return close
+
+
+@pytest.mark.parametrize("bars", [1501, 2500, 9000])
+@pytest.mark.parametrize("kind", ["close", "drawdown", "return"])
+def test_vectorized_lttb_matches_sequential(bars, kind):
+    s = _series(bars, kind, seed=bars)
+    x, y = s.index.asi8.astype(np.float64), s.to_numpy(np.float64)
+    np.testing.assert_array_equal(lttb_indices(x, y, 1500), reference_lttb(x, y, 1500))
+
+
+def test_sequential_fallback_when_not_converged(monkeypatch):
+    monkeypatch.setattr(downsample, "LTTB_PASSES", 1)
+    s = _series(9000, "return", seed=1)
+    x, y = s.index.asi8.astype(np.float64), s.to_numpy(np.float64)
+    np.testing.assert_array_equal(lttb_indices(x, y, 500), reference_lttb(x, y, 500))
+
+
+def test_downsample_series_budget_and_extremes():
+    s = _series(5000, "close", seed=2)
+    s.iloc[100:110] = np.nan
+    out = downsample_series(s, 1000)
+    assert len(out) == 1000
+    assert out.index.is_monotonic_increasing and not out.isna().any()
+    assert out.index[0] == s.index[0] and out.index[-1] == s.index[-1]
+    assert out.max() == s.max() and out.min() == s.min()
+    assert downsample_series(s, None) is s
+
+
+def test_resample_ohlcv_weekly():
+    df = make_ohlcv(50)
+    assert choose_rule(len(df), 60) is None
+    assert choose_rule(3000, 1500) == "W-FRI"
+    weekly = resample_ohlcv(df, "W-FRI")
+    first = df.loc[:weekly.index[0]]
+    assert weekly["Open"].iloc[0] == first["Open"].iloc[0]
+    assert weekly["High"].iloc[0] == first["High"].max()
+    assert weekly["Close"].iloc[0] == first["Close"].iloc[-1]
+    assert weekly["Volume"].sum() == pytest.approx(df["Volume"].sum())
+    assert isinstance(weekly.index, pd.DatetimeIndex)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts import calculate_stats
+from indicators import RollingKernel, _compute, clear_memo, compute_indicators, normalize_spec
+
+SPEC = ("MA5", "MA20", "BB20", "STD10", "RET", "VOL20", "DD", "CUMRET")
+
+
+@pytest.fixture(autouse=True)
+def _clear():
+    clear_memo()
+    yield
+    clear_memo()
+
+
+def _tagged(df, ticker="TEST"):
+    df = df.copy()
+    df.attrs["ticker"] = ticker
+    return df
+
+
+def _full(df):
+    """메모/증분 없이 전체 재계산 (ticker 가 없으면 메모를 거치지 않음)"""
+    df = df.copy()
+    df.attrs = {}
+    return compute_indicators(df, SPEC)
+
+
+def _assert_same(result, expected):
+    assert list(result.columns) == list(expected.columns)
+    assert result.index.equals(expected.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-7, atol=1e-7)
+    assert result.attrs["MDD"] == pytest.approx(expected.attrs["MDD"])
+
+
+def test_appended_bars_match_full_recompute(ohlcv):
+    compute_indicators(_tagged(ohlcv.iloc[:300]), SPEC)
+    for end in (301, 310, 330):
+        _assert_same(compute_indicators(_tagged(ohlcv.iloc[:end]), SPEC), _full(ohlcv.iloc[:end]))
+
+
+def test_replaced_last_bar_matches_full_recompute(ohlcv):
+    compute_indicators(_tagged(ohlcv.iloc[:300]), SPEC)
+    live = ohlcv.iloc[:300].copy()
+    for price in (live["Close"].iloc[-1] * 0.5, live["Close"].iloc[-1] * 1.3):
+        live.iloc[-1, live.columns.get_loc("Close")] = price
+        _assert_same(compute_indicators(_tagged(live), SPEC), _full(live))
+
+
+def test_matches_pandas_rolling(ohlcv):
+    ind = compute_indicators(_tagged(ohlcv), SPEC)
+    close = ohlcv["Close"]
+    np.testing.assert_allclose(ind["MA20"], close.rolling(20).mean(), rtol=1e-9)
+    np.testing.assert_allclose(ind["STD10"], close.rolling(10).std(), rtol=1e-7)
+    np.testing.assert_allclose(ind["VOL20"], (close.pct_change() * 100).rolling(20).std(), rtol=1e-7)
+    drawdown = (close - close.cummax()) / close.cummax() * 100
+    np.testing.assert_allclose(ind["Drawdown"], drawdown)
+
+
+def test_calculate_stats_mdd_tracks_incremental_state(ohlcv):
+    calculate_stats(_tagged(ohlcv.iloc[:300]))
+    live = ohlcv.iloc[:310].copy()
+    live.iloc[-1, live.columns.get_loc("Close")] = live["Close"].min() * 0.5  # 새 최대 낙폭
+    *_, drawdown, mdd = calculate_stats(_tagged(live))
+    close = live["Close"]
+    assert mdd == pytest.approx(((close - close.cummax()) / close.cummax() * 100).min())
+    assert mdd == pytest.approx(drawdown.min())
+
+
+def test_window_kernel_is_shared_per_length(ohlcv, monkeypatch):
+    windows = []
+    original = RollingKernel._window
+    monkeypatch.setattr(RollingKernel, "_window", lambda self, cs, n: windows.append(n) or original(self, cs, n))
+    out = _compute(ohlcv["Close"].to_numpy(np.float64), normalize_spec(("MA20", "BB20", "STD20")))
+    assert windows == [20, 20, 20]  # 개수, 합, 제곱합 - 지표마다 다시 계산하지 않음
+    assert set(out) == {"MA20", "STD20", "BB20_Upper", "BB20_Lower"}
+
+
+def test_unknown_indicator_is_rejected(ohlcv):
+    with pytest.raises(ValueError):
+        compute_indicators(ohlcv, ("MACD",))
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest, strategy_state
+from conftest import make_ohlcv
+from optimizer import _ma_states, _signal_states, optimize
+from panel import Panel
+
+
+@pytest.fixture
+def gappy():
+    df = make_ohlcv(300, seed=3)
+    close, volume = df["Close"].to_numpy(copy=True), df["Volume"].to_numpy(copy=True)
+    gaps = np.arange(5, 300, 7)  # 거래정지 등으로 빈 날 (패널의 날짜 합집합 정렬)
+    close[gaps] = volume[gaps] = np.nan
+    return close, volume
+
+
+@pytest.mark.parametrize("strategy", ["supply", "large_move"])
+def test_signal_states_match_backtest_on_gappy_data(gappy, strategy):
+    close, volume = gappy
+    combos = pd.DataFrame({"q_ret": [0.8, 0.9], "q_vol": [0.8, 0.9]})
+    states = _signal_states(close, volume, combos, strategy)
+    for i, q in enumerate(combos["q_ret"]):
+        np.testing.assert_array_equal(states[i], strategy_state(close, volume, strategy, q=q)[0])
+
+
+def test_ma_states_match_backtest_on_gappy_data(gappy):
+    close, volume = gappy
+    combos = pd.DataFrame({"fast": [5, 20], "slow": [20, 60]})
+    states = _ma_states(close, combos)
+    for i, (fast, slow) in enumerate(zip(combos["fast"], combos["slow"])):
+        np.testing.assert_array_equal(states[i], strategy_state(close, volume, "ma_cross", fast, slow)[0])
+
+
+def test_optimize_on_gappy_panel_matches_per_ticker_backtest():
+    frames = {}
+    for i, ticker in enumerate(["A", "B"]):
+        df = make_ohlcv(300, seed=70 + i)
+        frames[ticker] = df.drop(df.index[4 + i::11])
+    panel = Panel.from_frames(frames)
+    grid = {"q_ret": [0.9], "q_vol": [0.9]}
+    table, results = optimize(panel, "supply", grid=grid, workers=1)
+    for ticker in panel.tickers:
+        df = panel.frame(ticker).astype(np.float64)
+        expected = backtest(df, "supply", q=0.9)["stats"]
+        assert results[ticker]["Trades"][0] == expected["Trades"]
+        assert results[ticker]["Total Return"][0] == pytest.approx(expected["Total Return"])
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_ohlcv
+from panel import Panel
+
+
+def _panel():
+    a = make_ohlcv(10, seed=1)
+    b = a.drop(a.index[[0, 4, 5, 9]])  # 상장 전 / 거래정지 / 이후 빈 날
+    c = make_ohlcv(10, seed=2).iloc[2:]
+    return Panel.from_frames({"A": a, "B": b, "C": c}), a, b, c
+
+
+def test_select_tickers_and_dates():
+    panel, a, _, _ = _panel()
+    sub = panel.select(["B", "C"], start=a.index[2], end=a.index[7])
+    assert sub.tickers == ["B", "C"]
+    assert sub.dates.equals(a.index[2:8])
+    assert sub["Close"].shape == (2, 6)
+    assert np.shares_memory(sub["Close"], panel["Close"])  # 연속된 종목은 view
+
+
+def test_select_empty_ticker_list():
+    panel, a, _, _ = _panel()
+    sub = panel.select([])
+    assert len(sub) == 0
+    assert sub["Close"].shape == (0, len(a))
+
+
+def test_frame_drops_gap_days():
+    panel, _, b, _ = _panel()
+    frame = panel.frame("B")
+    assert frame.index.equals(b.index)
+    assert not frame["Close"].isna().any()
+    np.testing.assert_allclose(frame["Close"], b["Close"].astype(np.float32))
+    assert frame.attrs["ticker"] == "B"
+
+
+def test_frame_without_interior_gaps_is_a_view():
+    panel, _, _, c = _panel()
+    frame = panel.frame("C")
+    assert frame.index.equals(c.index)
+    assert np.shares_memory(frame["Close"].to_numpy(), panel["Close"])
+
+
+def test_frame_range_outside_listing_is_empty():
+    panel, a, _, _ = _panel()
+    assert panel.frame("C", end=a.index[1]).empty
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    panel, _, _, _ = _panel()
+    panel.save(str(tmp_path))
+    loaded = Panel.load(str(tmp_path))
+    assert loaded.tickers == panel.tickers
+    assert loaded.dates.equals(panel.dates)
+    pd.testing.assert_frame_equal(loaded.frame("B"), panel.frame("B"), check_index_type=False)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import rollups
+from rollups import PERIODS, clear_memo, rollup, seasonality
+
+
+@pytest.fixture(autouse=True)
+def _clear():
+    clear_memo()
+    yield
+    clear_memo()
+
+
+def _tagged(df):
+    df = df.copy()
+    df.attrs["ticker"] = "TEST"
+    return df
+
+
+@pytest.mark.parametrize("period", list(PERIODS))
+def test_incremental_rollup_matches_full(ohlcv, period, monkeypatch):
+    rollup(_tagged(ohlcv.iloc[:300]), period)
+    aggregated = []
+    original = rollups._aggregate
+    monkeypatch.setattr(rollups, "_aggregate", lambda df, freq: aggregated.append(len(df)) or original(df, freq))
+    for end in (301, 305, 340, 400):  # 진행 중인 기간에 추가 / 새 기간 시작
+        result = rollup(_tagged(ohlcv.iloc[:end]), period)
+        assert aggregated.pop() < end  # 마지막 기간부터만 다시 집계
+        pd.testing.assert_frame_equal(result, original(ohlcv.iloc[:end], PERIODS[period]))
+
+
+@pytest.mark.parametrize("period", list(PERIODS))
+def test_replaced_last_bar_reaggregates(ohlcv, period):
+    live = ohlcv.iloc[:300].copy()
+    rollup(_tagged(live), period)
+    live.iloc[-1, live.columns.get_loc("Close")] *= 1.5  # 장중 갱신
+    live.iloc[-1, live.columns.get_loc("Volume")] += 1000
+    pd.testing.assert_frame_equal(rollup(_tagged(live), period), rollup(live.copy(), period))
+
+
+def test_monthly_rollup_matches_pandas_resample(ohlcv):
+    monthly = rollup(ohlcv, "month")
+    close = ohlcv["Close"].resample("ME")
+    first, last = close.first().dropna(), close.last().dropna()
+    np.testing.assert_allclose(monthly["Return"], (last - first) / first * 100)
+    np.testing.assert_allclose(monthly["Volume"], ohlcv["Volume"].resample("ME").sum()[first.index])
+    trade_value = (ohlcv["Close"] * ohlcv["Volume"]).resample("ME").mean()[first.index]
+    np.testing.assert_allclose(monthly["Trade_Value"], trade_value)
+    assert monthly["Bars"].sum() == len(ohlcv)
+
+
+def test_seasonality_keeps_years_apart(ohlcv):
+    table = seasonality(ohlcv)
+    monthly = rollup(ohlcv, "month")["Return"]
+    assert list(table.columns) == list(range(1, 13))
+    assert list(table.index) == sorted(set(monthly.index.year))
+    period = monthly.index[0]
+    assert table.loc[period.year, period.month] == pytest.approx(monthly.iloc[0])
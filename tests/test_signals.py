@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_ohlcv
+from panel import Panel
+from scanner import scan
+from signals import detect_large_moves, detect_supply_signals, pct_change
+
+
+def kakao_signals(df):
+    """plot_kakao_dashboard 의 급등/급락 로직 (종목 1개, pandas)"""
+    ret = df["Close"].pct_change()
+    valid = pd.DataFrame({"Return": ret, "Volume": df["Volume"]}).dropna()
+    ret_up, ret_down = np.percentile(valid["Return"], 90), np.percentile(valid["Return"], 10)
+    vol_th = np.percentile(valid["Volume"], 90)
+    return (ret >= ret_up) & (df["Volume"] >= vol_th), (ret <= ret_down) & (df["Volume"] >= vol_th)
+
+
+def mind_signals(df):
+    """plot_mind_dashboard 의 수급 시그널 로직 (종목 1개, pandas)"""
+    pct_chg = df["Close"].pct_change() * 100
+    vol_cond = df["Volume"].quantile(0.9)
+    up_cond, down_cond = pct_chg.quantile(0.9), pct_chg.quantile(0.1)
+    heavy = df["Volume"] >= vol_cond
+    return heavy & (pct_chg >= up_cond), heavy & (pct_chg <= down_cond)
+
+
+@pytest.fixture
+def panel():
+    frames = {}
+    for i, ticker in enumerate(["A", "B", "C", "D"]):
+        df = make_ohlcv(260, seed=50 + i)
+        frames[ticker] = df.drop(df.index[3 + i::23])  # 종목마다 다른 거래정지일
+    frames["E"] = make_ohlcv(260, seed=60).iloc[100:]  # 늦게 상장
+    # 마지막 날 거래량이 터지며 급등 - 스캐너가 잡아야 하는 시그널
+    last = frames["A"].index[-1]
+    frames["A"].loc[last, "Close"] = frames["A"]["Close"].iloc[-2] * 1.2
+    frames["A"].loc[last, "Volume"] = frames["A"]["Volume"].max() * 2
+    return Panel.from_frames(frames)
+
+
+def _arrays(panel):
+    close = np.asarray(panel["Close"], dtype=np.float64)
+    volume = np.asarray(panel["Volume"], dtype=np.float64)
+    volume[np.isnan(close)] = np.nan  # 패널은 거래가 없는 날 거래량을 0 으로 저장
+    return close, volume
+
+
+def _on_bars(mask, panel, i):
+    """패널(날짜 합집합) 시그널 행을 종목의 실제 거래일로 줄임"""
+    return pd.Series(mask[i], index=panel.dates)[panel.frame(panel.tickers[i]).index]
+
+
+def test_pct_change_matches_per_ticker_pandas(panel):
+    close, _ = _arrays(panel)
+    ret = pct_change(close)
+    for i, ticker in enumerate(panel.tickers):
+        expected = panel.frame(ticker)["Close"].astype(np.float64).pct_change()
+        np.testing.assert_allclose(_on_bars(ret, panel, i), expected)
+
+
+def test_detectors_match_dashboards(panel):
+    close, volume = _arrays(panel)
+    ret = pct_change(close)
+    large_up, large_down = detect_large_moves(ret, volume)
+    buy, sell, _ = detect_supply_signals(ret, volume)
+    for i, ticker in enumerate(panel.tickers):
+        df = panel.frame(ticker).astype(np.float64)
+        up, down = kakao_signals(df)
+        pd.testing.assert_series_equal(_on_bars(large_up, panel, i), up, check_names=False)
+        pd.testing.assert_series_equal(_on_bars(large_down, panel, i), down, check_names=False)
+        mind_buy, mind_sell = mind_signals(df)
+        pd.testing.assert_series_equal(_on_bars(buy, panel, i), mind_buy, check_names=False)
+        pd.testing.assert_series_equal(_on_bars(sell, panel, i), mind_sell, check_names=False)
+
+
+def test_scanner_reports_dashboard_signals_on_last_bar(panel, tmp_path):
+    panel.save(str(tmp_path))
+    last_day = panel.dates[-1]
+    hits = scan(root=None, as_of=last_day, lookback=len(panel.dates), workers=1, panel_path=str(tmp_path))
+
+    expected = set()
+    for ticker in panel.tickers:
+        df = panel.frame(ticker).astype(np.float64)
+        if df.index[-1] != last_day:
+            continue
+        for name, mask in zip(("LargeUp", "LargeDown", "Signal_Buy", "Signal_Sell"),
+                              (*kakao_signals(df), *mind_signals(df))):
+            if mask.iloc[-1]:
+                expected.add((ticker, name))
+    assert ("A", "LargeUp") in expected
+    assert set(zip(hits["Ticker"], hits["Signal"])) == expected
+    assert (hits["Date"] == last_day).all()
+    assert hits["Score"].is_monotonic_decreasing
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from charts import plot_kakao_dashboard, plot_mind_dashboard, plot_saltlux_report, plot_standard_dashboard
+from conftest import make_ohlcv
+from themes import THEMES, apply_theme
+
+BUILDERS = {
+    "standard": lambda df, template: plot_standard_dashboard(df, "Test", "TEST", template),
+    "kakao": lambda df, template: plot_kakao_dashboard(df, "Test", template=template),
+    "saltlux": lambda df, template: plot_saltlux_report(df, "Test", template=template),
+    "mind": lambda df, template: plot_mind_dashboard(df, "Test", template=template),
+}
+
+
+@pytest.fixture(scope="module")
+def df():
+    df = make_ohlcv(300)
+    df.attrs["ticker"] = "TEST"
+    return df
+
+
+@pytest.mark.parametrize("source, target", [("plotly_white", "plotly_dark"), ("plotly_dark", "plotly_white")])
+@pytest.mark.parametrize("builder", list(BUILDERS))
+def test_derived_theme_matches_direct_build(df, builder, source, target):
+    build = BUILDERS[builder]
+    derived = apply_theme(build(df, source), source, target)
+    assert json.loads(derived.to_json()) == json.loads(build(df, target).to_json())
+
+
+def test_fixed_colors_equal_to_other_palette_entries_are_kept(df):
+    # 종합 리포트의 그리드는 라이트 셀 색과 같은 고정 색 - 테마 전환 시 바뀌면 안 됨
+    fig = apply_theme(plot_saltlux_report(df, "Test", template="plotly_white"), "plotly_white", "plotly_dark")
+    grids = {ax.gridcolor for ax in fig.select_xaxes()} | {ax.gridcolor for ax in fig.select_yaxes()}
+    assert THEMES["plotly_white"]["cell_color"] in grids
+    assert THEMES["plotly_dark"]["cell_color"] not in grids
@@ -0,0 +1,56 @@
+import json
+
+import plotly.graph_objects as go
+
+from charts import plot_standard_dashboard
+from conftest import make_ohlcv
+from webgl import PageWebGL, apply_render_mode, to_svg
+
+
+def _raw_figure(bars=400):
+    df = make_ohlcv(bars)
+    df.attrs["ticker"] = "TEST"
+    return apply_render_mode(plot_standard_dashboard(df, "Test", "TEST", "plotly_dark"), threshold=None)
+
+
+def _json(fig):
+    return json.loads(fig.to_json())
+
+
+def test_webgl_swap_matches_validated_rebuild():
+    fig = _raw_figure()
+    gl = apply_render_mode(fig, threshold=100)
+    assert [t.type for t in gl.data] == ["candlestick", "scattergl", "scattergl", "scattergl", "bar",
+                                         "scattergl", "table"]
+    expected = go.Figure(
+        data=[go.Scattergl(t.to_plotly_json(), skip_invalid=True) if t.type == "scatter" else t for t in fig.data],
+        layout=fig.layout,
+    )
+    expected.layout.meta = gl.layout.meta
+    assert _json(gl) == _json(expected)
+    assert gl.layout.meta["render"]["webgl"] is True
+    assert fig.data[1].type == "scatter"  # 원본 figure 는 그대로
+
+
+def test_scatter_only_options_are_dropped():
+    fig = go.Figure(go.Scatter(x=list(range(10)), y=list(range(10)), line=dict(shape="spline", color="red")))
+    gl = apply_render_mode(fig, threshold=5)
+    assert gl.data[0].type == "scattergl"
+    assert gl.data[0].line.color == "red"
+
+
+def test_below_threshold_stays_svg():
+    fig = apply_render_mode(_raw_figure(), threshold=10_000)
+    assert all(t.type != "scattergl" for t in fig.data)
+    assert fig.layout.meta["render"]["webgl"] is False
+
+
+def test_page_limit_downgrades_to_svg():
+    gl = apply_render_mode(_raw_figure(), threshold=100)
+    page = PageWebGL(limit=1)
+    assert page.admit(gl) is gl
+    svg = page.admit(gl)
+    assert page.downgraded == 1
+    assert [t.type for t in svg.data] == [t.type for t in _raw_figure().data]
+    assert svg.layout.meta["render"]["page_limited"] is True
+    assert _json(to_svg(gl))["data"] == _json(svg)["data"]
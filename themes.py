@@ -0,0 +1,56 @@
+"""
+차트 테마 (Chart Themes)
+테마별 색상을 한 곳에 모으고, 이미 만들어진 figure 의 템플릿/색상만 바꿔
+테마 전환 시 지표 계산이나 트레이스 재구성 없이 다시 그릴 수 있게 합니다.
+"""
+import plotly.graph_objects as go
+
+# Plotly 템플릿별 색상 (표 헤더/셀, 셀 글자, 그리드)
+THEMES = {
+    "plotly_dark": {
+        "header_color": "#263238",
+        "cell_color": "#37474f",
+        "font_color": "white",
+        "grid_color": "rgba(128, 128, 128, 0.2)",
+    },
+    "plotly_white": {
+        "header_color": "#B0BEC5",
+        "cell_color": "#ECEFF1",
+        "font_color": "black",
+        "grid_color": "rgba(128, 128, 128, 0.3)",
+    },
+}
+
+
+def theme_colors(template):
+    """템플릿의 색상 팔레트 (모르는 템플릿은 라이트 팔레트)"""
+    return THEMES.get(template, THEMES["plotly_white"])
+
+
+def _swap(value, source, target, name):
+    """
+    source 팔레트의 name 항목 색이면 target 팔레트의 같은 항목으로 교체 (고정 색은 그대로)
+    항목별로만 비교 - 다른 항목과 같은 고정 색 (예: 그리드에 쓴 셀 색 '#ECEFF1') 은 바꾸지 않음
+    """
+    return target[name] if value == source[name] else value
+
+
+def apply_theme(fig, source, template):
+    """
+    source 템플릿으로 만든 figure 를 template 테마로 바꾼 사본 반환
+    템플릿과 팔레트 색(표, 그리드)만 교체하고 트레이스 데이터는 그대로 재사용합니다.
+    """
+    src, dst = theme_colors(source), theme_colors(template)
+    themed = go.Figure(fig)
+    themed.layout.template = template
+
+    for trace in themed.data:
+        if trace.type != "table":
+            continue
+        trace.header.fill.color = _swap(trace.header.fill.color, src, dst, "header_color")
+        trace.cells.fill.color = _swap(trace.cells.fill.color, src, dst, "cell_color")
+        trace.cells.font.color = _swap(trace.cells.font.color, src, dst, "font_color")
+
+    themed.for_each_xaxis(lambda ax: ax.update(gridcolor=_swap(ax.gridcolor, src, dst, "grid_color")))
+    themed.for_each_yaxis(lambda ax: ax.update(gridcolor=_swap(ax.gridcolor, src, dst, "grid_color")))
+    return themed
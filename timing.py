@@ -0,0 +1,171 @@
+"""
+렌더링 단계별 시간 측정 (Render Timing Spans)
+Streamlit 재실행(rerun) 한 번을 Trace 로 보고, 그 안의 단계(데이터 수집, 지표 계산, 차트 생성,
+차트/표 전송 등)를 span 으로 잽니다.
+
+- Trace 가 없으면 span()/timed() 는 아무것도 하지 않는 공용 객체를 돌려주므로 측정 비용이 거의 없음
+  (사이드바 패널을 켜거나 STOCK_TIMING_LOG 를 설정했을 때만 Trace 시작)
+- 재실행이 끝나면 한 줄짜리 JSON 로그(JSON lines)를 남기고, 최근 HISTORY_SIZE 회의 기록으로 p50/p95 집계
+- 현재 Trace 는 contextvars 로 보관 → Streamlit 세션(스크립트 스레드)마다 독립
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# JSON lines 로그 파일 경로 (설정하면 사이드바 패널과 관계없이 항상 측정)
+TIMING_LOG = os.environ.get("STOCK_TIMING_LOG")
+HISTORY_SIZE = 200  # p50/p95 집계에 쓰는 최근 재실행 수 (서버 프로세스 전체)
+
+logger = logging.getLogger("timing")
+if TIMING_LOG:
+    _handler = logging.FileHandler(TIMING_LOG, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+_current = contextvars.ContextVar("timing_trace", default=None)
+_history = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+
+
+class _NullSpan:
+    """Trace 가 없을 때의 span (아무것도 하지 않음)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, trace, phase):
+        self.trace = trace
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.phase, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class Trace:
+    """재실행 1회의 단계별 시간 (ms) - 같은 단계가 여러 번이면 합산"""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.phases = {}
+        self.counts = {}
+        self.start = time.perf_counter()
+
+    def add(self, phase, ms):
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def span(self, phase):
+        return _Span(self, phase)
+
+
+# -----------------------------------------------------------------------------
+# 측정 API (Spans)
+# -----------------------------------------------------------------------------
+def start_trace(name, **fields):
+    """현재 세션(컨텍스트)의 Trace 시작 - 이후 span()/timed() 가 여기에 기록"""
+    trace = Trace(name, **fields)
+    _current.set(trace)
+    return trace
+
+
+def reset_trace():
+    """현재 세션의 Trace 를 기록 없이 버림 - 중단된 이전 재실행의 Trace 가 이어지지 않도록 재실행 시작 시 호출"""
+    _current.set(None)
+
+
+def span(phase):
+    """with span("data"): ... - Trace 가 없으면 NULL_SPAN"""
+    trace = _current.get()
+    return NULL_SPAN if trace is None else trace.span(phase)
+
+
+def timed(phase):
+    """함수 전체를 phase 로 측정하는 데코레이터 (Trace 가 없으면 바로 호출)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            with trace.span(phase):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def finish_trace():
+    """
+    현재 Trace 종료 - 기록(dict) 반환, 기록이 없으면 None
+    JSON lines 로그를 남기고 최근 기록(history)에 추가합니다.
+    """
+    trace = _current.get()
+    if trace is None:
+        return None
+    _current.set(None)
+    record = {
+        "ts": pd.Timestamp.now().isoformat(timespec="milliseconds"),
+        "name": trace.name,
+        **trace.fields,
+        "total_ms": round((time.perf_counter() - trace.start) * 1000, 3),
+        "phases": {phase: round(ms, 3) for phase, ms in trace.phases.items()},
+        "counts": trace.counts,
+    }
+    logger.info(json.dumps(record, ensure_ascii=False, default=str))
+    with _history_lock:
+        _history.append(record)
+    return record
+
+
+# -----------------------------------------------------------------------------
+# 집계 (Summary)
+# -----------------------------------------------------------------------------
+def history():
+    with _history_lock:
+        return list(_history)
+
+
+def summary(records=None):
+    """단계별 p50/p95 (ms) 표 - 최근 재실행 기록 기준, total 포함"""
+    records = history() if records is None else records
+    if not records:
+        return pd.DataFrame(columns=["runs", "p50_ms", "p95_ms", "last_ms"])
+    phases = list(dict.fromkeys(p for r in records for p in r["phases"])) + ["total"]
+    rows = {}
+    for phase in phases:
+        values = np.array([r["total_ms"] if phase == "total" else r["phases"][phase]
+                           for r in records if phase == "total" or phase in r["phases"]])
+        rows[phase] = {
+            "runs": len(values),
+            "p50_ms": np.percentile(values, 50),
+            "p95_ms": np.percentile(values, 95),
+            "last_ms": values[-1],
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def clear_history():
+    with _history_lock:
+        _history.clear()
@@ -0,0 +1,104 @@
+"""
+KRX 거래일 캘린더 (KRX Trading Calendar)
+요청 구간을 실제 거래일 경계로 맞춰 캐시 키를 정규화합니다.
+예) 토요일 시작 == 다음 월요일 시작, 미래 종료일 == 오늘 이전 마지막 거래일
+"""
+import pandas as pd
+
+from data_store import to_day
+
+# KOSPI 지수 - 모든 KRX 거래일에 값이 존재하므로 거래일 목록의 기준으로 사용
+REFERENCE_TICKER = "KS11"
+CALENDAR_START = "2000-01-01"
+
+_BDAY = pd.offsets.BDay()
+
+
+class TradingCalendar:
+    """
+    거래일 인덱스 (정렬된 DatetimeIndex)
+    기준 지수로 확인된 구간 밖(미래, 데이터 이전)은 평일을 거래일로 간주합니다.
+    평일은 실제 거래일의 상위집합이므로 정규화로 인해 거래일이 빠지는 일은 없습니다.
+    """
+
+    def __init__(self, sessions=()):
+        self.sessions = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+        self._store = None  # live() 로 만든 캘린더만 저장소를 따라 갱신
+        self._reference = None
+        self._seen = None
+
+    @classmethod
+    def live(cls, store, reference=REFERENCE_TICKER):
+        """
+        로컬 저장소의 기준 지수를 따라가는 캘린더 (네트워크 호출 없이 즉시 생성)
+        저장소의 기준 지수 파일이 바뀔 때마다 (백그라운드 갱신이 새 거래일을 받아오면) 다시 읽습니다.
+        기준 지수가 아직 없으면 평일 캘린더처럼 동작합니다.
+        """
+        calendar = cls()
+        calendar._store = store
+        calendar._reference = reference
+        calendar.sync()
+        return calendar
+
+    def sync(self):
+        """저장소의 기준 지수가 바뀌었으면 거래일 목록을 다시 읽음 (파일 수정 시각만 확인)"""
+        if self._store is None:
+            return
+        modified = self._store.modified_at(self._reference)
+        if modified is None or modified == self._seen:
+            return
+        df, _ = self._store.read(self._reference, columns=["Close"])
+        self._seen = modified
+        self.sessions = pd.DatetimeIndex(df.index).normalize().unique().sort_values()
+
+    @classmethod
+    def from_store(cls, store, fetch=None, reference=REFERENCE_TICKER, start=CALENDAR_START):
+        """
+        로컬 저장소의 기준 지수 일봉으로 캘린더 생성
+        fetch 가 주어지면 저장소에 없는 최근 구간을 먼저 받아옵니다. 실패 시 평일 캘린더로 대체.
+        store 가 None 이면 fetch (오프라인 제공처) 에서 바로 읽습니다.
+        """
+        try:
+            if store is None:
+                df = fetch(reference, start, pd.Timestamp.today())
+            elif fetch is not None:
+                df = store.get(reference, start, pd.Timestamp.today(), fetch)
+            else:
+                df, _ = store.read(reference)
+        except Exception:
+            df = pd.DataFrame()
+        return cls(df.index)
+
+    def _is_known(self, day):
+        return len(self.sessions) > 0 and self.sessions[0] <= day <= self.sessions[-1]
+
+    def next_session(self, day):
+        """day 이후(포함) 첫 거래일"""
+        day = to_day(day)
+        if not self._is_known(day):
+            day = _BDAY.rollforward(day)
+            if not self._is_known(day):
+                return day
+        return self.sessions[self.sessions.searchsorted(day, side="left")]
+
+    def prev_session(self, day):
+        """day 이전(포함) 마지막 거래일"""
+        day = to_day(day)
+        if not self._is_known(day):
+            day = _BDAY.rollback(day)
+            if not self._is_known(day):
+                return day
+        return self.sessions[self.sessions.searchsorted(day, side="right") - 1]
+
+    def snap(self, start, end):
+        """
+        [start, end] 를 거래일 경계로 정규화 (미래 종료일은 오늘로 제한)
+        구간 안에 거래일이 하나도 없으면 원래 구간을 그대로 반환합니다.
+        """
+        self.sync()
+        start = to_day(start)
+        end = min(to_day(end), pd.Timestamp.today().normalize())
+        first, last = self.next_session(start), self.prev_session(end)
+        if first > last:
+            return start, end
+        return first, last
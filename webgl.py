@@ -0,0 +1,115 @@
+"""
+WebGL 렌더링 모드 (WebGL Rendering Mode)
+선 트레이스의 점 합계가 기준을 넘으면 go.Scatter(SVG) 를 go.Scattergl(WebGL) 로 바꿔
+여러 해 구간에서도 hover/줌이 끊기지 않도록 합니다.
+
+WebGL 모드의 제약
+- 캔들스틱/막대(Bar)/히스토그램은 Plotly 에 WebGL 버전이 없어 SVG 로 남습니다.
+  (종합 리포트는 다운샘플링으로 캔들/막대 개수를 제한 - downsample.py)
+- Scattergl 은 line.shape='spline', 일부 hoveron 옵션 등을 지원하지 않아 변환 시 무시됩니다.
+- 브라우저마다 WebGL 컨텍스트 수가 제한되어 있어 (보통 8~16개, Scattergl 이 있는 figure 마다 1개 이상 사용)
+  한 페이지에 GL 차트를 여러 개 두면 오래된 차트가 빈 화면이 될 수 있습니다.
+  종목 페이지는 종합 리포트/시장 대비/백테스트 차트를, 비교 페이지는 여러 종목 차트를 함께 그리므로
+  figure 별 판단과 별개로 PageWebGL 이 재실행(페이지) 1회에 GL figure 를 MAX_GL_FIGURES 개까지만 허용하고
+  나머지는 SVG 로 되돌립니다.
+- figure 전체 점 개수가 FIGURE_POINT_BUDGET 을 넘으면 경고 로그를 남깁니다.
+"""
+import logging
+import os
+
+import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+# 선 트레이스 점 합계가 이 값을 넘으면 WebGL 사용 (환경변수 STOCK_WEBGL_THRESHOLD)
+WEBGL_THRESHOLD = int(os.environ.get("STOCK_WEBGL_THRESHOLD", 5000))
+# figure 하나가 브라우저로 보내는 점 개수 예산 (환경변수 STOCK_FIGURE_POINT_BUDGET)
+FIGURE_POINT_BUDGET = int(os.environ.get("STOCK_FIGURE_POINT_BUDGET", 60000))
+# 한 페이지에서 WebGL 로 그리는 figure 최대 개수 (환경변수 STOCK_MAX_GL_FIGURES)
+MAX_GL_FIGURES = int(os.environ.get("STOCK_MAX_GL_FIGURES", 4))
+
+
+def _swap_traces(fig, source, target):
+    """
+    source 타입 트레이스만 target 클래스로 바꾼 새 figure (트레이스 순서 유지)
+    바뀌는 트레이스만 검증하고 나머지 트레이스(캔들, 봉마다 색을 지정한 거래량 막대 등)와 레이아웃은
+    이미 검증된 값을 dict 그대로 옮김 - go.Figure(data=...) 로 전체를 다시 검증하면 25,000봉에서 0.6초 이상 걸림
+    """
+    data = [target(trace.to_plotly_json(), skip_invalid=True).to_plotly_json() if trace.type == source
+            else trace.to_plotly_json() for trace in fig.data]
+    return go.Figure(dict(data=data, layout=fig.layout.to_plotly_json()), _validate=False)
+
+
+def _points(trace):
+    for attr in ("x", "y", "open"):
+        values = getattr(trace, attr, None)
+        if values is not None:
+            return len(values)
+    return 0
+
+
+def count_points(fig):
+    """figure 의 (선 트레이스 점 합계, 전체 점 합계)"""
+    lines = total = 0
+    for trace in fig.data:
+        n = _points(trace)
+        total += n
+        if trace.type == "scatter":
+            lines += n
+    return lines, total
+
+
+def apply_render_mode(fig, threshold=WEBGL_THRESHOLD, budget=FIGURE_POINT_BUDGET):
+    """
+    점 개수에 따라 렌더링 방식 결정 (트레이스 순서는 유지 - updatemenus 인덱스 보존)
+    threshold 가 None 이면 항상 SVG. 결과는 fig.layout.meta['render'] 에 기록합니다.
+    """
+    lines, total = count_points(fig)
+    use_gl = threshold is not None and lines > threshold
+
+    if use_gl:
+        # fig.data 는 기존 트레이스의 재배열만 허용하므로 선 트레이스만 바꾼 새 figure 구성
+        fig = _swap_traces(fig, "scatter", go.Scattergl)
+    if budget and total > budget:
+        logger.warning("figure 점 개수 %d 가 예산 %d 을 초과했습니다 (%s)",
+                       total, budget, fig.layout.title.text)
+
+    meta = dict(fig.layout.meta or {})
+    meta["render"] = {"webgl": use_gl, "points": total, "budget": budget}
+    fig.layout.meta = meta
+    return fig
+
+
+def uses_webgl(fig):
+    return any(trace.type == "scattergl" for trace in fig.data)
+
+
+def to_svg(fig):
+    """Scattergl 트레이스를 Scatter 로 되돌린 새 figure (원본은 캐시와 공유될 수 있으므로 수정하지 않음)"""
+    fig = _swap_traces(fig, "scattergl", go.Scatter)
+    meta = dict(fig.layout.meta or {})
+    meta["render"] = {**meta.get("render", {}), "webgl": False, "page_limited": True}
+    fig.layout.meta = meta
+    return fig
+
+
+class PageWebGL:
+    """
+    페이지(재실행 1회) 단위 WebGL figure 수 제한
+    그리는 순서대로 admit(fig) 를 거치게 하면 먼저 그린 limit 개만 WebGL 로 두고 이후 GL figure 는 SVG 로 바꿉니다.
+    """
+
+    def __init__(self, limit=MAX_GL_FIGURES):
+        self.limit = limit
+        self.used = 0
+        self.downgraded = 0
+
+    def admit(self, fig):
+        if not uses_webgl(fig):
+            return fig
+        if self.used < self.limit:
+            self.used += 1
+            return fig
+        self.downgraded += 1
+        logger.info("페이지 WebGL figure 수 제한(%d)으로 SVG 로 그립니다 (%s)", self.limit, fig.layout.title.text)
+        return to_svg(fig)